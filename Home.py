@@ -1,4 +1,5 @@
 import streamlit as st
+import scoreboard_engine
 
 st.set_page_config(page_title="BigSnapshot", page_icon="📊", layout="wide")
 
@@ -31,6 +32,27 @@ with col4:
     if st.button("📊 Economics", use_container_width=True):
         st.switch_page("pages/9_Economics.py")
 
+st.markdown("### 📡 Today Across Leagues")
+
+@st.cache_data(ttl=30)
+def fetch_overview():
+    try:
+        result = scoreboard_engine.fetch_all_games()
+        return scoreboard_engine.summarize(result["games"]), result["wall"], result["serial"]
+    except:
+        return [], 0, 0
+
+overview, wall, serial = fetch_overview()
+active = [r for r in overview if r["live"] or r["upcoming"] or r["final"]]
+if active:
+    ov_cols = st.columns(4)
+    for i, r in enumerate(active):
+        with ov_cols[i % 4]:
+            st.metric(r["name"], f"{r['live']} live", f"{r['upcoming']} upcoming • {r['final']} final", delta_color="off")
+    st.caption(f"{len(overview)} boards loaded in {wall}s (one-by-one ≈ {serial}s)")
+else:
+    st.caption("No games found today.")
+
 st.markdown("### 🚧 Coming Soon")
 st.markdown("⚾ **MLB**")
 
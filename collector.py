@@ -0,0 +1,129 @@
+# FILE: collector.py
+# Background data collector for BigSnapshot
+# Polls ESPN scoreboards, game summaries and Kalshi market lists on a fixed
+# cadence and writes snapshots via snapshot_store, so upstream request volume
+# no longer scales with the number of open Streamlit sessions.
+#
+# Run next to the app:   python collector.py
+# Single pass (cron):    python collector.py --once
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import espn_summary
+import feeds
+import http_client
+import kalshi_catalog
+import nhl_data
+import snapshot_store
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+FETCH_WORKERS = 8
+STATS_INTERVAL = 300
+
+# Undated boards are read by the NFL page (playoffs) and MatchAnalyzer
+UNDATED_SCOREBOARDS = ["nfl", "nba", "ncaam", "ncaaw"]
+
+def log(msg):
+    print(datetime.now().strftime("%H:%M:%S") + " [collector] " + msg, flush=True)
+
+# ============================================================
+# JOBS
+# ============================================================
+def _store_all(urls):
+    ok = 0
+    def _one(url):
+        try:
+            snapshot_store.fetch_and_store(url)
+            return True
+        except Exception as e:
+            log("fetch failed " + url + " (" + str(e) + ")")
+            return False
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as pool:
+        for r in pool.map(_one, urls):
+            if r: ok += 1
+    return ok
+
+def collect_scoreboards():
+    today = feeds.date_str()
+    urls = [feeds.scoreboard_url(lg, today) for lg in feeds.LEAGUE_PATHS]
+    urls += [feeds.scoreboard_url(lg) for lg in UNDATED_SCOREBOARDS]
+    urls += [feeds.soccer_scoreboard_url(code) for code in feeds.SOCCER_CODES]
+    return _store_all(urls)
+
+def collect_results():
+    yesterday = feeds.date_str(-1)
+    return _store_all([feeds.scoreboard_url(lg, yesterday) for lg in feeds.LEAGUE_PATHS])
+
+def collect_summaries():
+    today = feeds.date_str()
+    fetched = 0
+    for lg in feeds.LEAGUE_PATHS:
+        board, _ = snapshot_store.read_snapshot(feeds.scoreboard_url(lg, today))
+        if not board:
+            continue
+        ids = []
+        for ev in board.get("events", []):
+            state = ev.get("status", {}).get("type", {}).get("state", "")
+            if state != "post":
+                ids.append(ev.get("id", ""))
+        # Refresh one cadence early so pages never see a summary past its freshness window
+        stats = espn_summary.prefetch_summaries(lg, ids, margin=feeds.SCOREBOARD_INTERVAL)
+        fetched += stats["fetched"]
+    return fetched
+
+def collect_kalshi():
+    catalog, failed = kalshi_catalog.refresh()
+    for series in failed:
+        log("kalshi series failed " + series + " (kept previous markets)")
+    return len(feeds.KALSHI_SERIES) - len(failed)
+
+def collect_nhl_special_teams():
+    # Skip the league-wide load when a page already refreshed the table today
+    age = nhl_data.special_teams_age()
+    if age is not None and age < nhl_data.SPECIAL_TEAMS_INTERVAL:
+        return 0
+    return len(nhl_data.load_special_teams())
+
+# ============================================================
+# SCHEDULER
+# ============================================================
+JOBS = [
+    {"name": "scoreboards", "interval": feeds.SCOREBOARD_INTERVAL, "fn": collect_scoreboards},
+    {"name": "summaries", "interval": feeds.SCOREBOARD_INTERVAL, "fn": collect_summaries},
+    {"name": "kalshi", "interval": feeds.KALSHI_INTERVAL, "fn": collect_kalshi},
+    {"name": "results", "interval": feeds.RESULTS_INTERVAL, "fn": collect_results},
+    {"name": "nhl_special_teams", "interval": feeds.RESULTS_INTERVAL, "fn": collect_nhl_special_teams},
+]
+
+def run(once=False):
+    next_run = {job["name"]: 0 for job in JOBS}
+    next_stats = time.time() + STATS_INTERVAL
+    log("writing snapshots to " + snapshot_store.SNAPSHOT_DIR)
+    while True:
+        for job in JOBS:
+            start = time.time()
+            if start < next_run[job["name"]]:
+                continue
+            try:
+                n = job["fn"]()
+                log(job["name"] + ": " + str(n) + " updated in " + str(round(time.time() - start, 2)) + "s")
+            except Exception as e:
+                log(job["name"] + " failed: " + str(e))
+            next_run[job["name"]] = start + job["interval"]
+        if once or time.time() >= next_stats:
+            log("http: " + http_client.format_stats())
+            next_stats = time.time() + STATS_INTERVAL
+        if once:
+            return
+        time.sleep(max(0.5, min(next_run.values()) - time.time()))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="BigSnapshot background data collector")
+    parser.add_argument("--once", action="store_true", help="run every job once and exit")
+    args = parser.parse_args()
+    run(once=args.once)
@@ -0,0 +1,97 @@
+# FILE: econ_calendar.py
+# Scheduled economic release calendar shared by the Economics page and fred_data.py
+# FRED caches stay warm between releases and only poll hard right after a scheduled print
+
+from datetime import datetime, timedelta
+import pytz
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+eastern = pytz.timezone('US/Eastern')
+
+FOMC_MEETINGS_2026 = [
+    {"dates": "January 27-28", "decision_date": datetime(2026, 1, 28, 14, 0), "has_projections": False},
+    {"dates": "March 17-18", "decision_date": datetime(2026, 3, 18, 14, 0), "has_projections": True},
+    {"dates": "May 5-6", "decision_date": datetime(2026, 5, 6, 14, 0), "has_projections": False},
+    {"dates": "June 16-17", "decision_date": datetime(2026, 6, 17, 14, 0), "has_projections": True},
+    {"dates": "July 28-29", "decision_date": datetime(2026, 7, 29, 14, 0), "has_projections": False},
+    {"dates": "September 15-16", "decision_date": datetime(2026, 9, 16, 14, 0), "has_projections": True},
+    {"dates": "October 27-28", "decision_date": datetime(2026, 10, 28, 14, 0), "has_projections": False},
+    {"dates": "December 8-9", "decision_date": datetime(2026, 12, 9, 14, 0), "has_projections": True},
+]
+
+CPI_RELEASES_2026 = [
+    {"month": "January", "release_date": datetime(2026, 1, 14, 8, 30), "for_month": "December 2025"},
+    {"month": "February", "release_date": datetime(2026, 2, 12, 8, 30), "for_month": "January 2026"},
+    {"month": "March", "release_date": datetime(2026, 3, 11, 8, 30), "for_month": "February 2026"},
+    {"month": "April", "release_date": datetime(2026, 4, 10, 8, 30), "for_month": "March 2026"},
+    {"month": "May", "release_date": datetime(2026, 5, 13, 8, 30), "for_month": "April 2026"},
+    {"month": "June", "release_date": datetime(2026, 6, 10, 8, 30), "for_month": "May 2026"},
+    {"month": "July", "release_date": datetime(2026, 7, 14, 8, 30), "for_month": "June 2026"},
+    {"month": "August", "release_date": datetime(2026, 8, 12, 8, 30), "for_month": "July 2026"},
+    {"month": "September", "release_date": datetime(2026, 9, 11, 8, 30), "for_month": "August 2026"},
+    {"month": "October", "release_date": datetime(2026, 10, 13, 8, 30), "for_month": "September 2026"},
+    {"month": "November", "release_date": datetime(2026, 11, 12, 8, 30), "for_month": "October 2026"},
+    {"month": "December", "release_date": datetime(2026, 12, 10, 8, 30), "for_month": "November 2026"},
+]
+
+# fred_data.SERIES key -> release schedule. Series without an entry (GDP, daily
+# treasuries, fed target range) keep a plain TTL.
+SERIES_RELEASES = {
+    "cpi": "cpi",
+    "core_cpi": "cpi",
+    "jobless_claims": "claims",
+    "unemployment": "jobs",
+}
+
+RELEASE_NAMES = {
+    "cpi": "CPI",
+    "claims": "Jobless Claims",
+    "jobs": "Jobs Report",
+}
+
+# Weekly claims: Thursday 8:30 ET. Jobs report: first Friday 8:30 ET (BLS occasionally shifts it).
+CLAIMS_WEEKDAY = 3
+JOBS_WEEKDAY = 4
+RELEASE_HOUR, RELEASE_MINUTE = 8, 30
+
+# ============================================================
+# SCHEDULE
+# ============================================================
+def _at_release_time(d):
+    return eastern.localize(datetime(d.year, d.month, d.day, RELEASE_HOUR, RELEASE_MINUTE))
+
+def _first_weekday(year, month, weekday):
+    d = datetime(year, month, 1)
+    return d + timedelta(days=(weekday - d.weekday()) % 7)
+
+def release_times(kind, start, end):
+    """Scheduled release datetimes (Eastern, tz-aware) for one schedule within [start, end]"""
+    if kind == "cpi":
+        times = [eastern.localize(r["release_date"]) for r in CPI_RELEASES_2026]
+    elif kind == "claims":
+        d = start - timedelta(days=(start.weekday() - CLAIMS_WEEKDAY) % 7)
+        times = []
+        while d <= end:
+            times.append(_at_release_time(d))
+            d += timedelta(days=7)
+    elif kind == "jobs":
+        times = []
+        year, month = start.year, start.month
+        while (year, month) <= (end.year, end.month):
+            times.append(_at_release_time(_first_weekday(year, month, JOBS_WEEKDAY)))
+            year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    else:
+        return []
+    return [t for t in times if start <= t <= end]
+
+def last_release(kind, now=None):
+    now = now or datetime.now(eastern)
+    past = release_times(kind, now - timedelta(days=40), now)
+    return past[-1] if past else None
+
+def next_release(kind, now=None):
+    now = now or datetime.now(eastern)
+    upcoming = [t for t in release_times(kind, now, now + timedelta(days=40)) if t > now]
+    return upcoming[0] if upcoming else None
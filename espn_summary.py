@@ -0,0 +1,175 @@
+# FILE: espn_summary.py
+# Shared ESPN game-summary store for BigSnapshot sports pages
+# One download per (league, event) serves summary, win prob, plays and tiebreaker views
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import snapshot_store
+from feeds import summary_url
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+# Seconds a summary stays fresh, by game state from the summary header
+FRESHNESS = {
+    "pre": 300,
+    "in": 20,
+    "post": 3600,
+}
+DEFAULT_FRESHNESS = 60
+
+# Bounded pool for slate-wide prefetch so a 100+ game NCAA slate doesn't flood ESPN
+PREFETCH_WORKERS = 8
+
+# Entries are dropped once this old (or once a finished game's copy goes stale); disk snapshots still back them
+STORE_MAX_AGE = 3 * 3600
+PRUNE_INTERVAL = 300
+
+_store = {}
+_store_lock = threading.Lock()
+_last_prune = [0.0]
+
+# ============================================================
+# STORE
+# ============================================================
+def _game_state(data):
+    try:
+        return data["header"]["competitions"][0]["status"]["type"]["state"]
+    except:
+        return ""
+
+def _download(league, event_id):
+    try:
+        return snapshot_store.fetch_and_store(summary_url(league, event_id))
+    except:
+        return None
+
+def _is_fresh(entry, now, margin=0):
+    return bool(entry) and now - entry["fetched_at"] < FRESHNESS.get(entry["state"], DEFAULT_FRESHNESS) - margin
+
+def _make_entry(data, fetched_at, latency=0.0):
+    return {"fetched_at": fetched_at, "latency": latency, "state": _game_state(data), "data": data, "plays": None}
+
+def _put(key, entry):
+    now = time.time()
+    with _store_lock:
+        _store[key] = entry
+        if now - _last_prune[0] < PRUNE_INTERVAL:
+            return
+        _last_prune[0] = now
+        for k, e in list(_store.items()):
+            if now - e["fetched_at"] > STORE_MAX_AGE or (e["state"] == "post" and not _is_fresh(e, now)):
+                del _store[k]
+
+def _get_entry(league, event_id, margin=0):
+    key = (league, str(event_id))
+    now = time.time()
+    with _store_lock:
+        entry = _store.get(key)
+    if _is_fresh(entry, now, margin):
+        return entry
+    # collector.py may have written a newer copy than this process holds
+    data, saved_at = snapshot_store.read_snapshot(summary_url(league, event_id))
+    if data is not None and (not entry or saved_at > entry["fetched_at"]):
+        snap_entry = _make_entry(data, saved_at)
+        if _is_fresh(snap_entry, now, margin):
+            _put(key, snap_entry)
+            return snap_entry
+    data = _download(league, event_id)
+    if data is None:
+        # Serve the stale copy rather than nothing if ESPN hiccups
+        return entry
+    entry = _make_entry(data, now, time.time() - now)
+    _put(key, entry)
+    return entry
+
+def get_summary(league, event_id):
+    entry = _get_entry(league, event_id)
+    return entry["data"] if entry else None
+
+def get_game_state(league, event_id):
+    entry = _get_entry(league, event_id)
+    return entry["state"] if entry else ""
+
+def prefetch_summaries(league, event_ids, max_workers=PREFETCH_WORKERS, margin=0):
+    ids = list(dict.fromkeys(str(e) for e in event_ids if e))
+    start = time.time()
+    with _store_lock:
+        stale = [e for e in ids if not _is_fresh(_store.get((league, e)), start, margin)]
+    serial = 0.0
+    if stale:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(stale))) as pool:
+            for entry in pool.map(lambda e: _get_entry(league, e, margin), stale):
+                if entry and entry["fetched_at"] >= start:
+                    serial += entry["latency"]
+    # "serial" is the sum of individual request times, i.e. what the old one-by-one loop would have waited
+    return {"games": len(ids), "fetched": len(stale), "wall": round(time.time() - start, 2), "serial": round(serial, 2)}
+
+def format_prefetch_stats(stats):
+    if not stats or not stats.get("fetched"):
+        return "Summaries: " + str(stats.get("games", 0) if stats else 0) + " games, all cached"
+    return "Summaries: " + str(stats["fetched"]) + "/" + str(stats["games"]) + " fetched in " + str(stats["wall"]) + "s (serial path ≈ " + str(stats["serial"]) + "s)"
+
+def clear_summaries():
+    with _store_lock:
+        _store.clear()
+
+# ============================================================
+# DERIVED VIEWS
+# ============================================================
+def play_key(play):
+    return str(play.get("id") or play.get("sequenceNumber") or "")
+
+def _entry_plays(entry):
+    if entry["plays"] is None:
+        plays_raw = []
+        for drive in entry["data"].get("plays", []):
+            if isinstance(drive, dict): plays_raw.append(drive)
+            elif isinstance(drive, list): plays_raw.extend(drive)
+        entry["plays"] = plays_raw
+    return entry["plays"]
+
+def get_flat_plays(league, event_id):
+    entry = _get_entry(league, event_id)
+    if not entry:
+        return []
+    return list(_entry_plays(entry))
+
+def get_plays_after(league, event_id, last_play_id=None):
+    """Plays after last_play_id as (new_plays, found); found is False if the cursor vanished from the feed"""
+    entry = _get_entry(league, event_id)
+    if not entry:
+        return [], True
+    plays = _entry_plays(entry)
+    if not last_play_id:
+        return list(plays), True
+    # Walk back from the end so a refresh costs O(new plays)
+    for i in range(len(plays) - 1, -1, -1):
+        if play_key(plays[i]) == last_play_id:
+            return plays[i + 1:], True
+    return list(plays), False
+
+def get_recent_plays(league, event_id, n=10):
+    result = []
+    for p in get_flat_plays(league, event_id)[-n:]:
+        period = p.get("period", {}).get("number", 0) if isinstance(p.get("period"), dict) else p.get("period", 0)
+        clock = p.get("clock", {}).get("displayValue", "") if isinstance(p.get("clock"), dict) else p.get("clock", "")
+        play_type = p.get("type", {}).get("text", "") if isinstance(p.get("type"), dict) else str(p.get("type", "") or "")
+        team_id = ""
+        if p.get("team"):
+            team_id = str(p["team"].get("id", "")) if isinstance(p["team"], dict) else str(p["team"])
+        result.append({"text": p.get("text", ""), "period": period, "clock": clock, "score_value": p.get("scoreValue", 0), "play_type": play_type, "team_id": team_id})
+    return result
+
+def get_win_prob(league, event_id):
+    data = get_summary(league, event_id)
+    if not data:
+        return None
+    try:
+        wp = data["winprobability"]
+        if wp: return wp[-1]["homeWinPercentage"] * 100
+    except: pass
+    try: return float(data["predictor"]["homeTeam"]["gameProjection"])
+    except: pass
+    return None
@@ -0,0 +1,92 @@
+# FILE: feeds.py
+# Upstream endpoint definitions shared by the pages and collector.py
+# Pages and the collector must build identical URLs so snapshots line up
+
+from datetime import datetime, timedelta
+import pytz
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+ESPN_SITE_BASE = "https://site.api.espn.com/apis/site/v2/sports/"
+KALSHI_MARKETS_URL = "https://api.elections.kalshi.com/trade-api/v2/markets"
+
+LEAGUE_PATHS = {
+    "nba": "basketball/nba",
+    "wnba": "basketball/wnba",
+    "ncaam": "basketball/mens-college-basketball",
+    "ncaaw": "basketball/womens-college-basketball",
+    "nfl": "football/nfl",
+    "nhl": "hockey/nhl",
+}
+
+# Extra scoreboard params; college boards need groups=50 to include every D1 game
+SCOREBOARD_PARAMS = {
+    "ncaam": "&limit=200&groups=50",
+    "ncaaw": "&limit=200&groups=50",
+}
+
+SOCCER_CODES = ["eng.1", "esp.1", "ger.1", "ita.1", "fra.1", "usa.1", "uefa.champions"]
+
+# Kalshi series held in the market catalog (kalshi_catalog.py)
+KALSHI_SERIES = [
+    "KXNBAGAME",
+    "KXNBASPREAD",
+    "KXWNBAGAME",
+    "KXWNBASPREAD",
+    "KXNCAAGAME",
+    "KXNCAASPREAD",
+    "KXNCAAMBGAME",
+    "KXNCAAWBGAME",
+    "KXNCAAWBSPREAD",
+]
+# Kalshi's per-request maximum; most series fit in one page
+KALSHI_PAGE_LIMIT = 1000
+
+# Collector cadence (seconds). Page max ages are double this so a running
+# collector always keeps pages off the upstream APIs.
+SCOREBOARD_INTERVAL = 15
+KALSHI_INTERVAL = 30
+SCOREBOARD_MAX_AGE = SCOREBOARD_INTERVAL * 2
+KALSHI_MAX_AGE = KALSHI_INTERVAL * 2
+# Yesterday's boards only feed back-to-back checks, so they refresh slowly
+RESULTS_INTERVAL = 1800
+RESULTS_MAX_AGE = RESULTS_INTERVAL * 2
+# Future schedules only change on flexes and postponements
+SCHEDULE_MAX_AGE = 6 * 3600
+# A date-range board can span a full week of college games
+SCHEDULE_LIMIT = 1000
+
+eastern = pytz.timezone("US/Eastern")
+
+# ============================================================
+# URL BUILDERS
+# ============================================================
+def date_str(days_offset=0):
+    return (datetime.now(eastern) + timedelta(days=days_offset)).strftime("%Y%m%d")
+
+def scoreboard_url(league, dates=None):
+    url = ESPN_SITE_BASE + LEAGUE_PATHS[league] + "/scoreboard"
+    if dates:
+        url += "?dates=" + dates + SCOREBOARD_PARAMS.get(league, "")
+    return url
+
+def schedule_url(league, start, end):
+    # ESPN accepts a YYYYMMDD-YYYYMMDD range in place of a single date
+    url = ESPN_SITE_BASE + LEAGUE_PATHS[league] + "/scoreboard?dates=" + start + "-" + end
+    params = SCOREBOARD_PARAMS.get(league, "")
+    if "limit=" not in params:
+        params += "&limit=" + str(SCHEDULE_LIMIT)
+    return url + params
+
+def soccer_scoreboard_url(code):
+    return ESPN_SITE_BASE + "soccer/" + code + "/scoreboard"
+
+def summary_url(league, event_id):
+    return ESPN_SITE_BASE + LEAGUE_PATHS[league] + "/summary?event=" + str(event_id)
+
+def kalshi_markets_url(series, limit=None, cursor=None):
+    url = KALSHI_MARKETS_URL + "?series_ticker=" + series + "&limit=" + str(limit or KALSHI_PAGE_LIMIT) + "&status=open"
+    if cursor:
+        url += "&cursor=" + cursor
+    return url
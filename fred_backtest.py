@@ -0,0 +1,229 @@
+# FILE: fred_backtest.py
+# Vectorized historical backtest of the fred_data edge-signal rules
+# Every rule is evaluated over the full local history (fred_db) in one NumPy pass,
+# producing a dated signal table and hit rates against the following prints.
+#
+# Summary:   python fred_backtest.py
+# Sweep:     python fred_backtest.py --sweep claims_elevated 240000 260000 280000
+#
+# Outcomes use FRED observation dates, not vintage release dates, so results
+# carry a small look-ahead (e.g. a claims week "knows" that month's UNRATE).
+
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+import fred_data
+import fred_db
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+# Series each rule reads (fred_data.SERIES keys)
+HISTORY_KEYS = ["jobless_claims", "cpi", "unemployment", "treasury_10y", "treasury_2y", "gdp_growth", "fed_rate_upper"]
+
+# Yield-curve signals are scored on whether the fed target is lower this far out
+CURVE_HORIZON_DAYS = 365
+
+STRENGTH_ORDER = {"STRONG": 0, "MODERATE": 1, "WATCH": 2}
+
+# ============================================================
+# HISTORY
+# ============================================================
+def load_history(keys=HISTORY_KEYS, path=None):
+    """{key: (dates datetime64[D], values float64)} ascending, missing prints dropped"""
+    out = {}
+    for key in keys:
+        dates, values = fred_db.read_series(fred_data.SERIES[key], path=path)
+        d = np.array(dates[::-1], dtype="datetime64[D]")
+        v = np.array([np.nan if x is None else x for x in values[::-1]], dtype=np.float64)
+        ok = ~np.isnan(v)
+        out[key] = (d[ok], v[ok])
+    return out
+
+def _windows(values, n):
+    # Row t holds the n observations ending at t+n-1, newest first (like the live rules)
+    return sliding_window_view(values, n)[:, ::-1]
+
+def _empty():
+    return {"date": np.array([], dtype="datetime64[D]"), "strength": np.array([], dtype=object),
+            "value": np.array([]), "hit": np.array([])}
+
+def _rows(dates, mask, strength, value, hit):
+    return {"date": dates[mask], "strength": np.asarray(strength, dtype=object)[mask],
+            "value": np.asarray(value, dtype=np.float64)[mask], "hit": np.asarray(hit, dtype=np.float64)[mask]}
+
+# ============================================================
+# OUTCOMES
+# ============================================================
+def _next_vs_current(sig_dates, t_dates, t_values):
+    """Target value at/before each signal date and the observation after it (NaN when unknown)"""
+    idx = np.searchsorted(t_dates, sig_dates, side="right") - 1
+    ok = (idx >= 0) & (idx + 1 < len(t_values))
+    cur = np.full(len(sig_dates), np.nan)
+    nxt = np.full(len(sig_dates), np.nan)
+    cur[ok] = t_values[idx[ok]]
+    nxt[ok] = t_values[idx[ok] + 1]
+    return cur, nxt
+
+def _value_at(t_dates, t_values, when):
+    idx = np.searchsorted(t_dates, when, side="right") - 1
+    ok = (idx >= 0) & (len(t_dates) > 0) & (when <= (t_dates[-1] if len(t_dates) else when))
+    out = np.full(len(when), np.nan)
+    out[ok] = t_values[idx[ok]]
+    return out
+
+def _hit(cond, *known):
+    valid = np.ones(len(cond), dtype=bool)
+    for k in known:
+        valid &= ~np.isnan(k)
+    return np.where(valid, cond.astype(np.float64), np.nan)
+
+# ============================================================
+# RULES
+# ============================================================
+def claims_rules(hist, th):
+    dates, values = hist["jobless_claims"]
+    if len(values) < 6:
+        return {"claims_rising": _empty(), "claims_falling": _empty()}
+    w = _windows(values, 6)
+    d = dates[5:]
+    ch = w[:, :-1] - w[:, 1:]
+    # Leading run of same-sign weekly changes, newest first
+    up = np.cumprod(ch > 0, axis=1).sum(axis=1)
+    down = np.cumprod(ch < 0, axis=1).sum(axis=1)
+    total = w[:, 0] - w[:, 5]
+    newest = w[:, 0]
+    sig = th["claims_weekly_change_significant"]
+    rising = (up >= 3) | ((up >= 2) & (total > sig * 2))
+    falling = ~rising & ((down >= 3) | ((down >= 2) & (total < -sig * 2)))
+    high = newest >= th["claims_elevated"]
+    low = newest < th["claims_normal"]
+    r_strength = np.select([(up >= 4) | ((up >= 3) & high), (up >= 3) | high], ["STRONG", "MODERATE"], "WATCH")
+    f_strength = np.select([(down >= 4) | ((down >= 3) & low), down >= 3], ["MODERATE", "WATCH"], "")
+    cur, nxt = _next_vs_current(d, *hist["unemployment"])
+    return {
+        "claims_rising": _rows(d, rising, r_strength, newest, _hit(nxt > cur, cur, nxt)),
+        "claims_falling": _rows(d, falling & (f_strength != ""), f_strength, newest, _hit(nxt < cur, cur, nxt)),
+    }
+
+def cpi_rules(hist, th):
+    dates, values = hist["cpi"]
+    if len(values) < 5:
+        return {"cpi_hot": _empty(), "cpi_cooling": _empty()}
+    mom = np.round((values[1:] - values[:-1]) / values[:-1] * 100, 3)
+    m = _windows(mom, 4)
+    d = dates[4:]
+    recent = (m[:, 0] + m[:, 1]) / 2
+    older = (m[:, 2] + m[:, 3]) / 2
+    accel = recent > older + 0.05
+    decel = ~accel & (recent < older - 0.05)
+    avg3 = m[:, :3].sum(axis=1) / 3
+    target = th["cpi_mom_target"]
+    # 3 HOT, 2 ABOVE_TARGET, 1 AT_TARGET, 0 COOL
+    level = np.select([avg3 > th["cpi_mom_hot"], avg3 > target + 0.05, avg3 > th["cpi_mom_cool"]], [3, 2, 1], 0)
+    above = (m > target).sum(axis=1)
+    consistent = (above >= 3) | (above <= 1)
+    # Next month's MoM print vs the 2% pace
+    nxt = np.full(len(d), np.nan)
+    nxt[:-1] = m[1:, 0]
+    return {
+        "cpi_hot": _rows(d, accel & (level >= 2), np.where(consistent, "STRONG", "MODERATE"), m[:, 0], _hit(nxt > target, nxt)),
+        "cpi_cooling": _rows(d, decel & (level <= 1), np.where(consistent, "MODERATE", "WATCH"), m[:, 0], _hit(nxt < target, nxt)),
+    }
+
+def unemployment_rules(hist, th):
+    dates, values = hist["unemployment"]
+    if len(values) < 4:
+        return {"unemployment_rising": _empty()}
+    u = _windows(values, 4)
+    d = dates[3:]
+    change = u[:, 0] - u[:, 3]
+    ups = ((u[:, :-1] - u[:, 1:]) > 0).sum(axis=1)
+    fast = (change > 0.4) | ((change > 0.2) & (ups >= 2))
+    rising = fast | (change > 0.2)
+    nxt = np.full(len(d), np.nan)
+    nxt[:-1] = values[4:]
+    return {"unemployment_rising": _rows(d, rising, np.where(fast, "STRONG", "MODERATE"), u[:, 0], _hit(nxt > u[:, 0], nxt))}
+
+def curve_rules(hist, th):
+    d10, v10 = hist["treasury_10y"]
+    d2, v2 = hist["treasury_2y"]
+    d, i10, i2 = np.intersect1d(d10, d2, return_indices=True)
+    if not len(d):
+        return {"yield_curve": _empty()}
+    spread = v10[i10] - v2[i2]
+    deep = spread < th["spread_inverted_deep"]
+    inverted = spread < th["spread_inverted"]
+    f_dates, f_values = hist["fed_rate_upper"]
+    now_rate = _value_at(f_dates, f_values, d)
+    later_rate = _value_at(f_dates, f_values, d + np.timedelta64(CURVE_HORIZON_DAYS, "D"))
+    return {"yield_curve": _rows(d, inverted, np.where(deep, "STRONG", "MODERATE"), spread,
+                                 _hit(later_rate < now_rate, now_rate, later_rate))}
+
+def gdp_rules(hist, th):
+    dates, values = hist["gdp_growth"]
+    if not len(values):
+        return {"gdp_weak": _empty(), "gdp_strong": _empty()}
+    nxt = np.full(len(values), np.nan)
+    nxt[:-1] = values[1:]
+    weak = values < th["gdp_weak"]
+    strong = values >= th["gdp_strong"]
+    return {
+        "gdp_weak": _rows(dates, weak, np.where(values < th["gdp_recession"], "STRONG", "MODERATE"), values,
+                          _hit(nxt < th["gdp_trend"], nxt)),
+        "gdp_strong": _rows(dates, strong, np.full(len(values), "WATCH", dtype=object), values,
+                            _hit(nxt >= th["gdp_trend"], nxt)),
+    }
+
+RULES = [claims_rules, cpi_rules, unemployment_rules, curve_rules, gdp_rules]
+
+# ============================================================
+# ENGINE
+# ============================================================
+def run(hist, thresholds=None):
+    """Dated signal table: one row per observation where a rule fires"""
+    th = dict(fred_data.THRESHOLDS)
+    th.update(thresholds or {})
+    frames = []
+    for rule in RULES:
+        for signal_id, rows in rule(hist, th).items():
+            if len(rows["date"]):
+                frames.append(pd.DataFrame({"date": rows["date"], "signal": signal_id, "strength": rows["strength"],
+                                            "value": rows["value"], "hit": rows["hit"]}))
+    if not frames:
+        return pd.DataFrame(columns=["date", "signal", "strength", "value", "hit"])
+    return pd.concat(frames, ignore_index=True).sort_values(["date", "signal"], ignore_index=True)
+
+def hit_rates(table):
+    """Fires, scored fires and hit rate per (signal, strength)"""
+    if table.empty:
+        return pd.DataFrame(columns=["signal", "strength", "fires", "scored", "hit_rate"])
+    g = table.groupby(["signal", "strength"])
+    out = pd.DataFrame({"fires": g.size(), "scored": g["hit"].count(), "hit_rate": g["hit"].mean().round(3)}).reset_index()
+    out["order"] = out["strength"].map(STRENGTH_ORDER)
+    return out.sort_values(["signal", "order"]).drop(columns="order").reset_index(drop=True)
+
+def sweep(hist, threshold, values):
+    """Hit-rate table per candidate value of one THRESHOLDS entry"""
+    frames = []
+    for v in values:
+        rates = hit_rates(run(hist, {threshold: v}))
+        rates.insert(0, threshold, v)
+        frames.append(rates)
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backtest fred_data edge-signal rules over local FRED history")
+    parser.add_argument("--sweep", nargs="+", metavar=("THRESHOLD", "VALUE"), help="threshold name followed by candidate values")
+    args = parser.parse_args()
+    hist = load_history()
+    start = time.perf_counter()
+    if args.sweep:
+        result = sweep(hist, args.sweep[0], [float(v) for v in args.sweep[1:]])
+    else:
+        result = hit_rates(run(hist))
+    elapsed = time.perf_counter() - start
+    print(result.to_string(index=False))
+    print("rows: " + ", ".join(k + "=" + str(len(v[1])) for k, v in hist.items()) + " | " + str(round(elapsed * 1000, 1)) + " ms")
@@ -1,15 +1,21 @@
 # FILE: fred_data.py
 # FRED API Integration for BigSnapshot Economics Page
 # v3.0 - Optimized signal generation logic
+# Full history per series lives in the local fred_db store and syncs incrementally;
+# latest-value and last-N views are slices of the parsed observations.
+# Cache lifetimes follow econ_calendar: long between releases, short polls right after one.
 
-import requests
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+import econ_calendar
+import fred_db
 import streamlit as st
 
 # ============================================================
 # CONFIGURATION
 # ============================================================
-FRED_BASE_URL = "https://api.stlouisfed.org/fred/series/observations"
-
 SERIES = {
     "fed_rate_upper": "DFEDTARU",
     "fed_rate_lower": "DFEDTARL",
@@ -22,6 +28,15 @@ SERIES = {
     "jobless_claims": "ICSA",
 }
 
+# Cache policy (seconds)
+DEFAULT_TTL = 3600          # series without a release schedule
+MAX_TTL = 12 * 3600         # between releases; still picks up revisions twice a day
+POLL_INTERVAL = 15          # right after a scheduled release until the print lands
+POLL_WINDOW = 3 * 3600      # give up fast polling this long after the scheduled time
+
+_series_cache = {}
+_series_lock = threading.Lock()
+
 FALLBACKS = {
     "fed_rate": "4.25%-4.50%",
     "unemployment": "4.2%",
@@ -72,95 +87,136 @@ def get_api_key():
     except:
         return "YOUR_KEY_HERE"
 
-@st.cache_data(ttl=3600)
-def fetch_fred_series(series_id, limit=1):
-    try:
-        params = {
-            "series_id": series_id,
-            "api_key": get_api_key(),
-            "file_type": "json",
-            "sort_order": "desc",
-            "limit": limit
-        }
-        response = requests.get(FRED_BASE_URL, params=params, timeout=10)
-        
-        if response.status_code == 200:
-            data = response.json()
-            if 'observations' in data and len(data['observations']) > 0:
-                obs = data['observations'][0]
-                value = obs.get('value', 'N/A')
-                if value == '.':
-                    return None
-                return {"value": value, "date": obs.get('date', 'N/A')}
+@dataclass(slots=True)
+class Series:
+    series_id: str
+    # Newest first; values are floats, None where FRED reports "."
+    dates: tuple = ()
+    values: tuple = ()
+
+    def __len__(self):
+        return len(self.dates)
+
+    def last(self, n):
+        return list(zip(self.dates[:n], self.values[:n]))
+
+    def latest(self):
+        """(date, value) of the newest non-missing observation, or None"""
+        for d, v in zip(self.dates, self.values):
+            if v is not None:
+                return d, v
         return None
+
+def fetch_series(series_id, max_age=DEFAULT_TTL):
+    # The local copy is served as-is while its last sync is younger than max_age; only a
+    # stale or missing copy goes over the wire (incrementally). Offline, serve what's on disk
+    try: synced = fred_db.last_synced(series_id)
+    except Exception: synced = None
+    if not synced or time.time() - synced >= max_age:
+        try:
+            fred_db.sync_series(series_id, get_api_key())
+        except Exception:
+            pass
+    try:
+        dates, values = fred_db.read_series(series_id)
     except Exception:
         return None
+    return Series(series_id, dates, values) if dates else None
 
-@st.cache_data(ttl=3600)
-def fetch_fred_series_multiple(series_id, limit=13):
-    try:
-        params = {
-            "series_id": series_id,
-            "api_key": get_api_key(),
-            "file_type": "json",
-            "sort_order": "desc",
-            "limit": limit
-        }
-        response = requests.get(FRED_BASE_URL, params=params, timeout=10)
-        
-        if response.status_code == 200:
-            data = response.json()
-            if 'observations' in data and len(data['observations']) > 0:
-                return data['observations']
+def awaiting_release(key, now=None):
+    """Scheduled release time if one passed within POLL_WINDOW and its print hasn't landed yet"""
+    kind = econ_calendar.SERIES_RELEASES.get(key)
+    if not kind:
         return None
-    except Exception:
+    now = now or datetime.now(econ_calendar.eastern)
+    last = econ_calendar.last_release(kind, now)
+    if not last or (now - last).total_seconds() >= POLL_WINDOW:
+        return None
+    try: changed = fred_db.last_changed(SERIES[key])
+    except Exception: changed = None
+    # A newer observation date showing up after the scheduled time means the print is in
+    if changed and changed >= last.timestamp():
         return None
+    return last
+
+def cache_ttl(key, now=None):
+    now = now or datetime.now(econ_calendar.eastern)
+    kind = econ_calendar.SERIES_RELEASES.get(key)
+    if not kind:
+        return DEFAULT_TTL
+    if awaiting_release(key, now):
+        return POLL_INTERVAL
+    nxt = econ_calendar.next_release(kind, now)
+    if not nxt:
+        return DEFAULT_TTL
+    return max(POLL_INTERVAL, min(MAX_TTL, (nxt - now).total_seconds()))
+
+def get_series(key):
+    """Full local history for one series; refreshed on the release-calendar TTL"""
+    now = time.time()
+    with _series_lock:
+        entry = _series_cache.get(key)
+    if entry and now < entry["expires_at"]:
+        return entry["series"]
+    ttl = cache_ttl(key)
+    series = fetch_series(SERIES[key], ttl)
+    if series is None and entry:
+        series = entry["series"]
+    with _series_lock:
+        _series_cache[key] = {"series": series, "expires_at": time.time() + ttl}
+    return series
+
+def polling_releases():
+    """Release names currently being polled for, e.g. ["CPI"] in the minutes after 8:30 ET"""
+    # Only series something has loaded: one nobody reads is never synced, so it would look
+    # like it is awaiting its print for the whole POLL_WINDOW
+    with _series_lock:
+        loaded = set(_series_cache)
+    names = []
+    for key, kind in econ_calendar.SERIES_RELEASES.items():
+        if key in loaded and awaiting_release(key) and econ_calendar.RELEASE_NAMES[kind] not in names:
+            names.append(econ_calendar.RELEASE_NAMES[kind])
+    return names
+
+def get_latest(key):
+    series = get_series(key)
+    return series.latest() if series else None
 
 # ============================================================
 # BASIC DATA GETTERS
 # ============================================================
 def get_fed_rate():
-    upper = fetch_fred_series(SERIES["fed_rate_upper"])
-    lower = fetch_fred_series(SERIES["fed_rate_lower"])
+    upper = get_latest("fed_rate_upper")
+    lower = get_latest("fed_rate_lower")
     
     if upper and lower:
-        try:
-            u = float(upper['value'])
-            l = float(lower['value'])
-            return {"value": f"{l:.2f}%-{u:.2f}%", "upper": u, "lower": l, "date": upper['date']}
-        except:
-            pass
+        u, l = upper[1], lower[1]
+        return {"value": f"{l:.2f}%-{u:.2f}%", "upper": u, "lower": l, "date": upper[0]}
     return {"value": FALLBACKS["fed_rate"], "upper": 4.50, "lower": 4.25, "date": "N/A"}
 
 def get_unemployment():
-    data = fetch_fred_series(SERIES["unemployment"])
+    data = get_latest("unemployment")
     if data:
-        try:
-            return {"value": f"{float(data['value']):.1f}%", "raw": float(data['value']), "date": data['date']}
-        except:
-            pass
+        return {"value": f"{data[1]:.1f}%", "raw": data[1], "date": data[0]}
     return {"value": FALLBACKS["unemployment"], "raw": 4.2, "date": "N/A"}
 
 def get_gdp_growth():
-    data = fetch_fred_series(SERIES["gdp_growth"])
+    data = get_latest("gdp_growth")
     if data:
-        try:
-            return {"value": f"{float(data['value']):.1f}%", "raw": float(data['value']), "date": data['date']}
-        except:
-            pass
+        return {"value": f"{data[1]:.1f}%", "raw": data[1], "date": data[0]}
     return {"value": FALLBACKS["gdp_growth"], "raw": 2.5, "date": "N/A"}
 
 def get_cpi_yoy():
-    observations = fetch_fred_series_multiple(SERIES["cpi"], limit=13)
-    if observations and len(observations) >= 13:
+    series = get_series("cpi")
+    if series and len(series) >= 13:
         try:
-            current = float(observations[0]['value'])
-            year_ago = float(observations[12]['value'])
+            current = series.values[0]
+            year_ago = series.values[12]
             yoy_change = ((current - year_ago) / year_ago) * 100
             return {
                 "value": f"{yoy_change:.1f}%",
                 "raw": yoy_change,
-                "date": observations[0]['date'],
+                "date": series.dates[0],
                 "current_cpi": current,
                 "year_ago_cpi": year_ago
             }
@@ -169,50 +225,39 @@ def get_cpi_yoy():
     return {"value": FALLBACKS["cpi_yoy"], "raw": 2.7, "date": "N/A"}
 
 def get_treasury_spread():
-    t10 = fetch_fred_series(SERIES["treasury_10y"])
-    t2 = fetch_fred_series(SERIES["treasury_2y"])
+    t10 = get_latest("treasury_10y")
+    t2 = get_latest("treasury_2y")
     
     if t10 and t2:
-        try:
-            t10_val = float(t10['value'])
-            t2_val = float(t2['value'])
-            spread = t10_val - t2_val
-            return {
-                "spread": f"{spread:.2f}%",
-                "raw": spread,
-                "inverted": spread < 0,
-                "t10": t10_val,
-                "t2": t2_val,
-                "date": t10['date']
-            }
-        except:
-            pass
+        t10_val, t2_val = t10[1], t2[1]
+        spread = t10_val - t2_val
+        return {
+            "spread": f"{spread:.2f}%",
+            "raw": spread,
+            "inverted": spread < 0,
+            "t10": t10_val,
+            "t2": t2_val,
+            "date": t10[0]
+        }
     return None
 
 def get_jobless_claims():
-    data = fetch_fred_series(SERIES["jobless_claims"])
+    data = get_latest("jobless_claims")
     if data:
-        try:
-            claims = int(float(data['value']))
-            return {"value": f"{claims:,}", "raw": claims, "date": data['date']}
-        except:
-            pass
+        claims = int(data[1])
+        return {"value": f"{claims:,}", "raw": claims, "date": data[0]}
     return None
 
 # ============================================================
 # TREND ANALYSIS FUNCTIONS
 # ============================================================
 def get_jobless_claims_trend():
-    observations = fetch_fred_series_multiple(SERIES["jobless_claims"], limit=7)
-    if not observations or len(observations) < 6:
+    series = get_series("jobless_claims")
+    if not series or len(series) < 6:
         return None
     
     try:
-        weeks = []
-        for i in range(min(6, len(observations))):
-            val = observations[i]['value']
-            if val != '.':
-                weeks.append({"value": int(float(val)), "date": observations[i]['date']})
+        weeks = [{"value": int(v), "date": d} for d, v in series.last(6) if v is not None]
         
         if len(weeks) < 5:
             return None
@@ -288,17 +333,17 @@ def get_jobless_claims_trend():
         return None
 
 def get_cpi_momentum():
-    observations = fetch_fred_series_multiple(SERIES["cpi"], limit=5)
-    if not observations or len(observations) < 5:
+    series = get_series("cpi")
+    if not series or len(series) < 5:
         return None
     
     try:
         mom_changes = []
         for i in range(4):
-            current = float(observations[i]['value'])
-            previous = float(observations[i+1]['value'])
+            current = series.values[i]
+            previous = series.values[i+1]
             mom_pct = ((current - previous) / previous) * 100
-            mom_changes.append({"value": round(mom_pct, 3), "date": observations[i]['date']})
+            mom_changes.append({"value": round(mom_pct, 3), "date": series.dates[i]})
         
         latest_mom = mom_changes[0]['value']
         prev_mom = mom_changes[1]['value']
@@ -351,16 +396,12 @@ def get_cpi_momentum():
         return None
 
 def get_unemployment_trend():
-    observations = fetch_fred_series_multiple(SERIES["unemployment"], limit=5)
-    if not observations or len(observations) < 4:
+    series = get_series("unemployment")
+    if not series or len(series) < 4:
         return None
     
     try:
-        months = []
-        for i in range(min(4, len(observations))):
-            val = observations[i]['value']
-            if val != '.':
-                months.append({"value": float(val), "date": observations[i]['date']})
+        months = [{"value": v, "date": d} for d, v in series.last(4) if v is not None]
         
         if len(months) < 3:
             return None
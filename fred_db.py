@@ -0,0 +1,138 @@
+# FILE: fred_db.py
+# Local SQLite time-series store for FRED series used by fred_data.py
+# Full history lives on disk; a sync only asks FRED for a revision window before
+# the last stored date onward, so startup reads are local and trend lookbacks are free
+#
+# Offline sync:   FRED_API_KEY=... python fred_db.py --sync
+
+import argparse
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from datetime import date, timedelta
+import http_client
+import snapshot_store
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+FRED_BASE_URL = "https://api.stlouisfed.org/fred/series/observations"
+DB_PATH = os.environ.get("BIGSNAPSHOT_FRED_DB", os.path.join(snapshot_store.SNAPSHOT_DIR, "fred.sqlite"))
+# FRED's per-request maximum; a first sync pulls the whole history in one call
+MAX_LIMIT = 100000
+# FRED revises recent prints (weekly claims revise the prior week, CPI/UNRATE get
+# periodic revisions); each sync re-reads this far back and upserts
+REVISION_WINDOW_DAYS = 90
+
+_init_lock = threading.Lock()
+_initialized = set()
+
+# ============================================================
+# DATABASE
+# ============================================================
+def _connect(path=None):
+    path = path or DB_PATH
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    conn = sqlite3.connect(path, timeout=10)
+    with _init_lock:
+        if path not in _initialized:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS observations (series_id TEXT NOT NULL, date TEXT NOT NULL, value REAL, PRIMARY KEY (series_id, date)) WITHOUT ROWID")
+            conn.execute("CREATE TABLE IF NOT EXISTS sync_state (series_id TEXT PRIMARY KEY, last_date TEXT, synced_at REAL, changed_at REAL)")
+            try:
+                # Stores created before changed_at existed
+                conn.execute("ALTER TABLE sync_state ADD COLUMN changed_at REAL")
+            except sqlite3.OperationalError:
+                pass
+            conn.commit()
+            _initialized.add(path)
+    return conn
+
+def last_date(series_id, path=None):
+    with closing(_connect(path)) as conn, conn:
+        row = conn.execute("SELECT MAX(date) FROM observations WHERE series_id = ?", (series_id,)).fetchone()
+    return row[0] if row else None
+
+def last_synced(series_id, path=None):
+    with closing(_connect(path)) as conn, conn:
+        row = conn.execute("SELECT synced_at FROM sync_state WHERE series_id = ?", (series_id,)).fetchone()
+    return row[0] if row else None
+
+def last_changed(series_id, path=None):
+    """When a sync last brought in a newer observation date (epoch seconds)"""
+    with closing(_connect(path)) as conn, conn:
+        row = conn.execute("SELECT changed_at FROM sync_state WHERE series_id = ?", (series_id,)).fetchone()
+    return row[0] if row else None
+
+def _parse_value(raw):
+    try:
+        return float(raw)
+    except (TypeError, ValueError):
+        return None
+
+def write_observations(series_id, observations, path=None):
+    rows = [(series_id, o["date"], _parse_value(o.get("value"))) for o in observations if o.get("date")]
+    now = time.time()
+    with closing(_connect(path)) as conn, conn:
+        prev = conn.execute("SELECT last_date, changed_at FROM sync_state WHERE series_id = ?", (series_id,)).fetchone()
+        conn.executemany("INSERT OR REPLACE INTO observations (series_id, date, value) VALUES (?, ?, ?)", rows)
+        latest = conn.execute("SELECT MAX(date) FROM observations WHERE series_id = ?", (series_id,)).fetchone()[0]
+        changed_at = now if not prev or latest != prev[0] else prev[1]
+        conn.execute("INSERT OR REPLACE INTO sync_state (series_id, last_date, synced_at, changed_at) VALUES (?, ?, ?, ?)", (series_id, latest, now, changed_at))
+    return len(rows)
+
+def read_series(series_id, n=None, path=None):
+    """(dates, values) newest first; values are floats or None for FRED's "." """
+    sql = "SELECT date, value FROM observations WHERE series_id = ? ORDER BY date DESC"
+    params = (series_id,)
+    if n:
+        sql += " LIMIT ?"
+        params = (series_id, int(n))
+    with closing(_connect(path)) as conn, conn:
+        rows = conn.execute(sql, params).fetchall()
+    return tuple(r[0] for r in rows), tuple(r[1] for r in rows)
+
+# ============================================================
+# SYNC
+# ============================================================
+def sync_series(series_id, api_key, path=None, timeout=10):
+    """Fetch observations from REVISION_WINDOW_DAYS before the last stored date
+    and upsert them, so revised earlier prints replace the stored values.
+    Returns rows written."""
+    params = {
+        "series_id": series_id,
+        "api_key": api_key,
+        "file_type": "json",
+        "sort_order": "asc",
+        "limit": MAX_LIMIT,
+    }
+    last = last_date(series_id, path)
+    if last:
+        start = date.fromisoformat(last) - timedelta(days=REVISION_WINDOW_DAYS)
+        params["observation_start"] = start.isoformat()
+    response = http_client.get(FRED_BASE_URL, params=params, timeout=timeout)
+    response.raise_for_status()
+    return write_observations(series_id, response.json().get("observations") or [], path)
+
+def sync_all(series_ids, api_key, path=None):
+    out = {}
+    for sid in series_ids:
+        try:
+            out[sid] = sync_series(sid, api_key, path)
+        except Exception as e:
+            out[sid] = "failed: " + str(e)
+    return out
+
+if __name__ == "__main__":
+    import fred_data
+    parser = argparse.ArgumentParser(description="Local FRED time-series store")
+    parser.add_argument("--sync", action="store_true", help="pull new observations for every series")
+    args = parser.parse_args()
+    if args.sync:
+        for sid, n in sync_all(fred_data.SERIES.values(), os.environ.get("FRED_API_KEY", "")).items():
+            print(sid + ": " + str(n))
+    for sid in fred_data.SERIES.values():
+        dates, _ = read_series(sid)
+        print(sid + ": " + str(len(dates)) + " rows" + (" (" + dates[-1] + " .. " + dates[0] + ")" if dates else ""))
@@ -0,0 +1,338 @@
+# FILE: games.py
+# Compact game record + shared ESPN scoreboard parser for BigSnapshot
+# Each board snapshot is parsed once per process and the Game list is shared by every session;
+# multi-day schedules come from one date-range board instead of a request per day
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+import feeds
+import snapshot_store
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+# (regulation periods, minutes per period, minutes per overtime)
+LEAGUE_CLOCK = {
+    "nba": (4, 12, 5),
+    "wnba": (4, 10, 5),
+    "ncaam": (2, 20, 5),
+    "ncaaw": (4, 10, 5),
+    "nfl": (4, 15, 10),
+    "nhl": (3, 20, 5),
+}
+DEFAULT_CLOCK = (2, 45, 15)
+
+# Per-day fallback when a date-range request fails
+SCHEDULE_WORKERS = 7
+
+# Page team codes fall back to the ESPN abbreviation for these leagues, else the full name
+ABBR_FALLBACK = {"nfl", "nhl"}
+
+# Parsed boards older than the longest board max_age are dropped (past dates, old schedule windows)
+PARSED_MAX_AGE = feeds.SCHEDULE_MAX_AGE
+PRUNE_INTERVAL = 300
+
+_parsed = {}
+_parsed_lock = threading.Lock()
+_last_prune = [0.0]
+
+# ============================================================
+# GAME
+# ============================================================
+@dataclass(slots=True, eq=False)
+class Game:
+    league: str = ""
+    game_id: str = ""
+    state: str = "pre"
+    status: str = "STATUS_SCHEDULED"
+    detail: str = ""
+    short_detail: str = ""
+    period: int = 0
+    clock: str = ""
+    start: datetime = None
+    short_name: str = ""
+    # Page team code (codes map applied), ESPN names and ids
+    away: str = ""
+    home: str = ""
+    away_full: str = ""
+    home_full: str = ""
+    away_short: str = ""
+    home_short: str = ""
+    away_abbr: str = ""
+    home_abbr: str = ""
+    away_id: str = ""
+    home_id: str = ""
+    away_score: int = 0
+    home_score: int = 0
+    away_record: str = "0-0"
+    home_record: str = "0-0"
+    away_rank: int = 99
+    home_rank: int = 99
+    away_color: str = "#555555"
+    home_color: str = "#555555"
+    away_logo: str = ""
+    home_logo: str = ""
+    away_linescores: tuple = ()
+    home_linescores: tuple = ()
+    # Odds (first provider)
+    has_odds: bool = False
+    odds_details: str = ""
+    spread: float = 0
+    over_under: float = 0
+    away_ml: int = 0
+    home_ml: int = 0
+    venue: str = ""
+    broadcast: str = ""
+    conference: str = ""
+    # Football situation
+    possession_id: str = ""
+    down: int = 0
+    distance: int = 0
+    yard_line: int = 50
+    yards_to_endzone: int = 50
+    is_red_zone: bool = False
+    poss_text: str = ""
+    last_play: dict = None
+
+    # Dict-style access so existing g.get("key") / g["key"] call sites keep working
+    def get(self, key, default=None):
+        return getattr(self, key, default)
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key)
+
+    @property
+    def total_score(self):
+        return self.home_score + self.away_score
+
+    @property
+    def minutes_played(self):
+        if self.state == "pre":
+            return 0
+        periods, length, ot_length = LEAGUE_CLOCK.get(self.league, DEFAULT_CLOCK)
+        if self.state == "post":
+            return periods * length
+        completed = 0
+        for p in range(1, max(0, self.period - 1) + 1):
+            completed += length if p <= periods else ot_length
+        try:
+            cparts = self.clock.replace(" ", "").split(":")
+            remaining = float(cparts[0]) + float(cparts[1]) / 60 if len(cparts) == 2 else float(cparts[0])
+        except: remaining = 0
+        current = length if self.period <= periods else ot_length
+        return max(0, completed + (current - remaining))
+
+    @property
+    def minutes_elapsed(self):
+        # Live-only variant: 0 for scheduled and final games
+        return self.minutes_played if self.state == "in" else 0
+
+    @property
+    def is_halftime(self):
+        return "halftime" in self.detail.lower() or (self.period == 2 and self.clock == "0:00")
+
+    @property
+    def game_time(self):
+        return self.start.strftime("%-I:%M %p ET") if self.start else ""
+
+    @property
+    def game_datetime(self):
+        return self.start.strftime("%Y-%m-%d %H:%M") if self.start else ""
+
+    @property
+    def vegas_odds(self):
+        if not self.has_odds:
+            return {}
+        return {"spread": self.odds_details, "overUnder": self.over_under, "homeML": self.home_ml, "awayML": self.away_ml}
+
+    @property
+    def is_home_possession(self):
+        if not self.possession_id:
+            return None
+        if self.possession_id == self.home_id:
+            return True
+        return False if self.possession_id == self.away_id else None
+
+    @property
+    def possession_team(self):
+        poss = self.is_home_possession
+        if poss is None:
+            return None
+        return self.home if poss else self.away
+
+# ============================================================
+# PARSER
+# ============================================================
+def _record(c):
+    records = c.get("records") or []
+    for rec in records:
+        if rec.get("type") == "total":
+            return rec.get("summary", "0-0")
+    return records[0].get("summary", "0-0") if records else "0-0"
+
+def _side(c, league, codes):
+    team = c.get("team", {})
+    full = team.get("displayName", "")
+    abbr = team.get("abbreviation", "")
+    code = full
+    if codes:
+        code = codes.get(full, abbr if league in ABBR_FALLBACK else codes.get(abbr, full))
+    elif league in ABBR_FALLBACK:
+        code = abbr
+    color = team.get("color") or "555555"
+    rank = c.get("curatedRank", {}).get("current", 99)
+    return {
+        "": code,
+        "_full": full,
+        "_short": team.get("shortDisplayName", full),
+        "_abbr": abbr,
+        "_id": str(team.get("id", "")),
+        "_score": int(c.get("score", 0) or 0),
+        "_record": _record(c),
+        "_rank": rank if rank < 99 else 99,
+        "_color": color if color.startswith("#") else "#" + color,
+        "_logo": team.get("logo", ""),
+        "_linescores": tuple(int(ls.get("value", 0) or 0) for ls in c.get("linescores", [])),
+    }
+
+def parse_event(league, event, codes=None):
+    comp = event.get("competitions", [{}])[0]
+    teams = comp.get("competitors", [])
+    if len(teams) < 2:
+        return None
+    home = next((c for c in teams if c.get("homeAway") == "home"), teams[0])
+    away = next((c for c in teams if c is not home), teams[1])
+    status_obj = event.get("status", {})
+    status_type = status_obj.get("type", {})
+    fields = {
+        "league": league,
+        "game_id": event.get("id", ""),
+        "state": status_type.get("state", "pre"),
+        "status": status_type.get("name", "STATUS_SCHEDULED"),
+        "detail": status_type.get("detail", ""),
+        "short_detail": status_type.get("shortDetail", ""),
+        "period": status_obj.get("period", 0) or 0,
+        "clock": status_obj.get("displayClock", "0:00"),
+        "short_name": event.get("shortName", ""),
+    }
+    for prefix, c in (("away", away), ("home", home)):
+        for suffix, val in _side(c, league, codes).items():
+            fields[prefix + suffix] = val
+    gd = event.get("date", "")
+    if gd:
+        try: fields["start"] = datetime.fromisoformat(gd.replace("Z", "+00:00")).astimezone(feeds.eastern)
+        except: pass
+    odds_list = comp.get("odds") or []
+    if odds_list:
+        o = odds_list[0]
+        fields["has_odds"] = True
+        fields["odds_details"] = o.get("details", "")
+        fields["spread"] = o.get("spread", 0) or 0
+        fields["over_under"] = o.get("overUnder", 0) or 0
+        fields["home_ml"] = o.get("homeTeamOdds", {}).get("moneyLine", 0) or 0
+        fields["away_ml"] = o.get("awayTeamOdds", {}).get("moneyLine", 0) or 0
+    notes = comp.get("notes") or []
+    if notes:
+        fields["conference"] = notes[0].get("headline", "")
+    fields["venue"] = comp.get("venue", {}).get("fullName", "")
+    fields["broadcast"] = ", ".join(b["names"][0] for b in comp.get("broadcasts", []) if b.get("names"))
+    situation = comp.get("situation")
+    if situation:
+        fields["possession_id"] = str(situation.get("possession", "") or "")
+        fields["down"] = situation.get("down", 0)
+        fields["distance"] = situation.get("distance", 0)
+        fields["yard_line"] = situation.get("yardLine", 50)
+        fields["yards_to_endzone"] = situation.get("yardsToEndzone", 50)
+        fields["is_red_zone"] = situation.get("isRedZone", False)
+        fields["poss_text"] = situation.get("possessionText", "")
+        fields["last_play"] = situation.get("lastPlay", {})
+    return Game(**fields)
+
+def parse_board(league, data, codes=None):
+    games = []
+    for event in (data or {}).get("events", []):
+        try:
+            g = parse_event(league, event, codes)
+            if g: games.append(g)
+        except:
+            continue
+    return games
+
+# ============================================================
+# STORE
+# ============================================================
+def get_games(league, dates=None, max_age=feeds.SCOREBOARD_MAX_AGE, codes=None, url=None, timeout=10):
+    url = url or feeds.scoreboard_url(league, dates)
+    key = (league, url, codes is not None)
+    now = time.time()
+    with _parsed_lock:
+        cached = _parsed.get(key)
+    if cached and now - cached[0] < max_age:
+        return list(cached[1])
+    data, saved_at = snapshot_store.read_snapshot(url)
+    if data is None or now - saved_at >= max_age:
+        try:
+            data, saved_at = snapshot_store.fetch_and_store(url, timeout=timeout), now
+        except Exception:
+            # Serve the last parse rather than nothing if ESPN hiccups
+            if cached:
+                return list(cached[1])
+            raise
+    games = parse_board(league, data, codes)
+    with _parsed_lock:
+        _parsed[key] = (saved_at, games)
+        if now - _last_prune[0] >= PRUNE_INTERVAL:
+            _last_prune[0] = now
+            for k, (ts, _) in list(_parsed.items()):
+                if now - ts > PARSED_MAX_AGE:
+                    del _parsed[k]
+    return list(games)
+
+def clear_games():
+    with _parsed_lock:
+        _parsed.clear()
+
+def get_games_multi(league, dates_list, max_age=feeds.SCOREBOARD_MAX_AGE, codes=None, timeout=10):
+    """Several boards fetched concurrently, de-duplicated by game id in list order.
+    Returns (games, errors) where errors holds one message per failed board."""
+    def _one(dates):
+        try:
+            return get_games(league, dates, max_age, codes, timeout=timeout), ""
+        except Exception as e:
+            return [], str(e)
+    with ThreadPoolExecutor(max_workers=max(1, len(dates_list))) as pool:
+        results = list(pool.map(_one, dates_list))
+    seen, games, errors = set(), [], []
+    for board, err in results:
+        if err:
+            errors.append(err)
+        for g in board:
+            if g.game_id not in seen:
+                seen.add(g.game_id)
+                games.append(g)
+    return games, errors
+
+def get_schedule(league, days=7, start_offset=1, max_age=feeds.SCHEDULE_MAX_AGE, codes=None, timeout=10):
+    """Games over a date window (default: the next week) from one date-range board,
+    falling back to concurrent per-day boards if the range request fails"""
+    start, end = feeds.date_str(start_offset), feeds.date_str(start_offset + days - 1)
+    try:
+        return get_games(league, max_age=max_age, codes=codes, url=feeds.schedule_url(league, start, end), timeout=timeout)
+    except Exception:
+        pass
+    games, _ = get_games_multi(league, [feeds.date_str(start_offset + i) for i in range(days)], max_age, codes, timeout)
+    return games
+
+def first_day(games):
+    """Games on the earliest (Eastern) date in a schedule"""
+    dated = [g for g in games if g.start]
+    if not dated:
+        return list(games)
+    day = min(g.start.date() for g in dated)
+    return [g for g in dated if g.start.date() == day]
@@ -0,0 +1,130 @@
+# FILE: http_client.py
+# Shared pooled HTTP client for BigSnapshot
+# One keep-alive session per host, bounded retries with backoff on 429/5xx,
+# per-host concurrency caps and error counters that survive bare excepts
+
+import threading
+import time
+from urllib.parse import urlparse
+import requests
+from requests.adapters import HTTPAdapter
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+MAX_RETRIES = 2
+BACKOFF_BASE = 0.5
+MAX_BACKOFF = 8
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Concurrent in-flight requests allowed per host
+HOST_LIMITS = {
+    # Covers the 13-board overview (scoreboard_engine) in one wave
+    "site.api.espn.com": 16,
+    "api.elections.kalshi.com": 4,
+    "api.stlouisfed.org": 4,
+    "api.weather.gov": 4,
+    # obhistory for every Temp board city (7) at once
+    "forecast.weather.gov": 8,
+}
+DEFAULT_HOST_LIMIT = 6
+
+_sessions = {}
+_semaphores = {}
+_stats = {}
+_lock = threading.Lock()
+
+# ============================================================
+# SESSIONS
+# ============================================================
+def _host_state(host):
+    with _lock:
+        if host not in _sessions:
+            limit = HOST_LIMITS.get(host, DEFAULT_HOST_LIMIT)
+            session = requests.Session()
+            # Retries are handled below so they can be counted; the adapter only pools
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=limit, max_retries=0)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _sessions[host] = session
+            _semaphores[host] = threading.BoundedSemaphore(limit)
+            _stats[host] = {"requests": 0, "retries": 0, "errors": 0, "timeouts": 0, "status": {}, "last_error": ""}
+        return _sessions[host], _semaphores[host], _stats[host]
+
+def _count(stats, key, n=1):
+    with _lock:
+        stats[key] += n
+
+def _record_status(stats, code):
+    with _lock:
+        stats["status"][code] = stats["status"].get(code, 0) + 1
+
+def _record_error(stats, err):
+    with _lock:
+        stats["errors"] += 1
+        stats["last_error"] = err
+
+def _backoff(attempt, resp=None):
+    if resp is not None:
+        try:
+            return min(MAX_BACKOFF, float(resp.headers.get("Retry-After", "")))
+        except:
+            pass
+    return min(MAX_BACKOFF, BACKOFF_BASE * (2 ** attempt))
+
+# ============================================================
+# REQUESTS
+# ============================================================
+def request(method, url, retries=MAX_RETRIES, timeout=10, **kwargs):
+    host = urlparse(url).netloc
+    session, sem, stats = _host_state(host)
+    attempt = 0
+    while True:
+        _count(stats, "requests")
+        resp = None
+        try:
+            with sem:
+                resp = session.request(method, url, timeout=timeout, **kwargs)
+            _record_status(stats, resp.status_code)
+            if resp.status_code not in RETRY_STATUSES or attempt >= retries:
+                if resp.status_code >= 400:
+                    _record_error(stats, "HTTP " + str(resp.status_code))
+                return resp
+        except requests.Timeout as e:
+            _count(stats, "timeouts")
+            _record_error(stats, str(e))
+            if attempt >= retries:
+                raise
+        except requests.ConnectionError as e:
+            _record_error(stats, str(e))
+            if attempt >= retries:
+                raise
+        _count(stats, "retries")
+        time.sleep(_backoff(attempt, resp))
+        attempt += 1
+
+def get(url, **kwargs):
+    return request("GET", url, **kwargs)
+
+def post(url, **kwargs):
+    # Orders are not idempotent, so POSTs are never retried unless asked
+    kwargs.setdefault("retries", 0)
+    return request("POST", url, **kwargs)
+
+def get_json(url, **kwargs):
+    resp = get(url, **kwargs)
+    resp.raise_for_status()
+    return resp.json()
+
+# ============================================================
+# STATS
+# ============================================================
+def get_stats():
+    with _lock:
+        return {h: dict(s, status=dict(s["status"])) for h, s in _stats.items()}
+
+def format_stats():
+    parts = []
+    for host, s in sorted(get_stats().items()):
+        parts.append(host + " " + str(s["requests"]) + " req / " + str(s["errors"]) + " err / " + str(s["retries"]) + " retry")
+    return " | ".join(parts) if parts else "No upstream requests yet"
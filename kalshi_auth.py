@@ -0,0 +1,104 @@
+# FILE: kalshi_auth.py
+# Kalshi request signing for BigSnapshot
+# The PEM private key is parsed once per process; every signature after that
+# is just the RSA-PSS sign over timestamp + method + path.
+#
+# Benchmark:   python kalshi_auth.py --n 200
+
+import argparse
+import base64
+import threading
+import time
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import padding, rsa
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+_PSS = padding.PSS(mgf=padding.MGF1(hashes.SHA256()), salt_length=padding.PSS.DIGEST_LENGTH)
+_HASH = hashes.SHA256()
+
+_signers = {}
+_signers_lock = threading.Lock()
+
+# ============================================================
+# SIGNER
+# ============================================================
+def load_private_key(pem):
+    return serialization.load_pem_private_key(pem.encode() if isinstance(pem, str) else pem, password=None)
+
+def sign_with_key(pk, timestamp, method, path):
+    sig = pk.sign((str(timestamp) + method + path).encode("utf-8"), _PSS, _HASH)
+    return base64.b64encode(sig).decode()
+
+class Signer:
+    """Holds one parsed private key and builds Kalshi auth headers from it."""
+
+    def __init__(self, api_key, pem):
+        self.api_key = api_key
+        self.pk = load_private_key(pem)
+
+    def sign(self, timestamp, method, path):
+        return sign_with_key(self.pk, timestamp, method, path)
+
+    def headers(self, method, path, timestamp=None):
+        ts = str(timestamp or int(time.time() * 1000))
+        return {
+            "KALSHI-ACCESS-KEY": self.api_key,
+            "KALSHI-ACCESS-SIGNATURE": self.sign(ts, method, path),
+            "KALSHI-ACCESS-TIMESTAMP": ts,
+            "Content-Type": "application/json",
+        }
+
+    def headers_batch(self, requests):
+        """Headers for several (method, path) pairs signed back to back under one timestamp"""
+        ts = str(int(time.time() * 1000))
+        return [self.headers(method, path, ts) for method, path in requests]
+
+def get_signer(api_key, pem):
+    """Process-wide signer per (api_key, pem); None when the key is missing or unparseable"""
+    if not api_key or not pem:
+        return None
+    key = (api_key, pem)
+    with _signers_lock:
+        signer = _signers.get(key)
+        if signer is None:
+            try:
+                signer = Signer(api_key, pem)
+            except Exception:
+                return None
+            _signers[key] = signer
+        return signer
+
+# ============================================================
+# BENCHMARK
+# ============================================================
+def benchmark(pem, n=200):
+    """Per-signature latency in ms: PEM parsed on every call vs the cached key"""
+    path = "/trade-api/v2/portfolio/balance"
+    start = time.perf_counter()
+    for _ in range(n):
+        sign_with_key(load_private_key(pem), 1, "GET", path)
+    uncached = (time.perf_counter() - start) / n * 1000
+    signer = Signer("bench", pem)
+    start = time.perf_counter()
+    for _ in range(n):
+        signer.sign(1, "GET", path)
+    cached = (time.perf_counter() - start) / n * 1000
+    start = time.perf_counter()
+    for _ in range(n // 4):
+        signer.headers_batch([("GET", path), ("GET", "/trade-api/v2/portfolio/positions"),
+                              ("POST", "/trade-api/v2/portfolio/orders"), ("POST", "/trade-api/v2/portfolio/orders")])
+    batch = (time.perf_counter() - start) / ((n // 4) * 4) * 1000
+    return {"uncached_ms": round(uncached, 3), "cached_ms": round(cached, 3), "batch_ms": round(batch, 3)}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Kalshi signing micro-benchmark (throwaway RSA-2048 key)")
+    parser.add_argument("--n", type=int, default=200, help="signatures per variant")
+    args = parser.parse_args()
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    pem = key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.TraditionalOpenSSL,
+                            serialization.NoEncryption()).decode()
+    res = benchmark(pem, args.n)
+    print("per signature: PEM each call %.3f ms | cached key %.3f ms | batched %.3f ms"
+          % (res["uncached_ms"], res["cached_ms"], res["batch_ms"]))
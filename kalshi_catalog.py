@@ -0,0 +1,138 @@
+# FILE: kalshi_catalog.py
+# One Kalshi market catalog for every series the pages trade
+# Series are fetched concurrently, each following its cursor to the last page,
+# and published together as one versioned snapshot (in memory and on disk), so
+# pages read their slice instead of paging the markets API themselves.
+#
+# One refresh:   python kalshi_catalog.py
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import feeds
+import http_client
+import snapshot_store
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+CATALOG_KEY = "bigsnapshot:kalshi/catalog"
+CATALOG_WORKERS = 4
+# Guard against a cursor that never ends
+MAX_PAGES = 25
+
+_catalog = None
+_catalog_lock = threading.Lock()
+_refresh_lock = threading.Lock()
+
+# ============================================================
+# CATALOG
+# ============================================================
+class Catalog:
+    """Immutable published snapshot: {series: [market, ...]} plus version and fetch time."""
+
+    def __init__(self, series, version, fetched_at):
+        self.series = series
+        self.version = version
+        self.fetched_at = fetched_at
+
+    def markets(self, series_ticker):
+        return self.series.get(series_ticker, [])
+
+    def age(self):
+        return time.time() - self.fetched_at
+
+    def to_dict(self):
+        return {"version": self.version, "fetched_at": self.fetched_at, "series": self.series}
+
+EMPTY = Catalog({}, 0, 0)
+
+def fetch_series(series_ticker, timeout=10):
+    """Every open market in a series, following the cursor page by page"""
+    markets, cursor = [], None
+    for _ in range(MAX_PAGES):
+        data = http_client.get_json(feeds.kalshi_markets_url(series_ticker, cursor=cursor), timeout=timeout)
+        page = data.get("markets", []) or []
+        markets.extend(page)
+        cursor = data.get("cursor")
+        if not cursor or not page:
+            break
+    return markets
+
+def load_catalog(series=None, workers=CATALOG_WORKERS, previous=None):
+    """Fetch every series concurrently; a series that fails keeps its previous markets"""
+    series = list(series or feeds.KALSHI_SERIES)
+    previous = previous or EMPTY
+    def _one(s):
+        try:
+            return fetch_series(s)
+        except:
+            return None
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(_one, series))
+    out = {}
+    failed = []
+    for s, markets in zip(series, results):
+        if markets is None:
+            failed.append(s)
+            markets = previous.markets(s)
+        out[s] = markets
+    return Catalog(out, previous.version + 1, time.time()), failed
+
+def _publish(catalog, persist=True):
+    global _catalog
+    with _catalog_lock:
+        if _catalog is not None and _catalog.version >= catalog.version and _catalog.fetched_at >= catalog.fetched_at:
+            return _catalog
+        _catalog = catalog
+    if persist:
+        snapshot_store.write_snapshot(CATALOG_KEY, catalog.to_dict())
+    return catalog
+
+def _from_disk():
+    data, _ = snapshot_store.read_snapshot(CATALOG_KEY)
+    if not data:
+        return None
+    return Catalog(data.get("series", {}), data.get("version", 0), data.get("fetched_at", 0))
+
+def refresh(max_age=None):
+    """Load and publish a new catalog version; returns (catalog, failed_series).
+    With max_age, a copy that became fresh while this call waited on the lock is returned as is."""
+    with _refresh_lock:
+        # Continue from whichever copy is newer so versions stay monotonic across processes
+        current = max([c for c in (_catalog, _from_disk()) if c is not None], key=lambda c: c.version, default=None)
+        if max_age is not None and current is not None and current.age() < max_age:
+            # Another thread (or the collector) just rebuilt it
+            return _publish(current, persist=False), []
+        catalog, failed = load_catalog(previous=current)
+        return _publish(catalog), failed
+
+def get_catalog(max_age=feeds.KALSHI_MAX_AGE):
+    """Latest catalog no older than max_age: memory, then the collector's disk copy, then a refresh.
+    While another thread refreshes, callers holding an older version get it back instead of waiting."""
+    current = _catalog
+    if current is not None and current.age() < max_age:
+        return current
+    disk = _from_disk()
+    if disk is not None and disk.age() < max_age:
+        return _publish(disk, persist=False)
+    if current is not None and _refresh_lock.locked():
+        return current
+    try:
+        return refresh(max_age)[0]
+    except:
+        return current or disk or EMPTY
+
+def get_markets(series_ticker, max_age=feeds.KALSHI_MAX_AGE):
+    """One series' slice of the current catalog"""
+    return get_catalog(max_age).markets(series_ticker)
+
+def version():
+    return (_catalog or EMPTY).version
+
+if __name__ == "__main__":
+    start = time.time()
+    catalog, failed = refresh()
+    for s in feeds.KALSHI_SERIES:
+        print(s + ": " + str(len(catalog.markets(s))) + " markets" + (" (failed, kept previous)" if s in failed else ""))
+    print("version " + str(catalog.version) + " in " + str(round(time.time() - start, 2)) + "s")
@@ -0,0 +1,98 @@
+# FILE: kalshi_depth.py
+# Order-book depth and fill-cost estimates for Kalshi brackets
+# Books are read from the live websocket feed when it has the ticker in sync,
+# otherwise from the REST orderbook with a short-lived cache. Callers fetch
+# only the handful of tickers that already passed their cheap price filters.
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import kalshi_stream
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+DEPTH_TTL = 3
+DEPTH_WORKERS = 4
+
+_books = {}
+_books_lock = threading.Lock()
+
+# ============================================================
+# BOOKS
+# ============================================================
+def _live_book(ticker):
+    feed = kalshi_stream.current_feed()
+    return feed.book(ticker) if feed is not None else None
+
+def get_book(ticker, max_age=DEPTH_TTL):
+    """OrderBook for one ticker: live copy, cached REST book, or a fresh REST fetch"""
+    book = _live_book(ticker)
+    if book is not None:
+        return book
+    with _books_lock:
+        hit = _books.get(ticker)
+    if hit and time.time() - hit[0] < max_age:
+        return hit[1]
+    book = kalshi_stream.rest_book(ticker)
+    now = time.time()
+    with _books_lock:
+        _books[ticker] = (now, book)
+        # Expired books are never served again (settled tickers stop being asked for)
+        for t, (ts, _) in list(_books.items()):
+            if now - ts >= max(max_age, DEPTH_TTL):
+                del _books[t]
+    return book
+
+def get_books(tickers, max_age=DEPTH_TTL, workers=DEPTH_WORKERS):
+    """{ticker: OrderBook} fetched concurrently; tickers that fail are left out"""
+    tickers = list(dict.fromkeys(t for t in tickers if t))
+    def _one(t):
+        try:
+            return get_book(t, max_age)
+        except:
+            return None
+    if not tickers:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(workers, len(tickers))) as pool:
+        return {t: b for t, b in zip(tickers, pool.map(_one, tickers)) if b is not None}
+
+# ============================================================
+# FILL COST
+# ============================================================
+def ask_ladder(book, side):
+    """[(price, contracts)] a buyer of side can lift, cheapest first.
+    Buying YES at 100-p matches a NO bid at p, and vice versa."""
+    bids = book.no if side == "yes" else book.yes
+    return [(100 - p, q) for p, q in sorted(bids.items(), reverse=True) if q > 0]
+
+def estimate_fill(book, side, count, limit_price=None):
+    """Walk the ask ladder for count contracts (optionally no worse than limit_price).
+    avg_price is the volume-weighted fill price in cents, None when nothing fills."""
+    filled, cost, levels, worst = 0, 0, 0, None
+    ladder = ask_ladder(book, side)
+    for price, qty in ladder:
+        if filled >= count or (limit_price is not None and price > limit_price):
+            break
+        take = min(qty, count - filled)
+        filled += take
+        cost += take * price
+        levels += 1
+        worst = price
+    return {
+        "side": side,
+        "requested": count,
+        "filled": filled,
+        "complete": filled >= count,
+        "avg_price": round(cost / filled, 2) if filled else None,
+        "worst_price": worst,
+        "best_price": ladder[0][0] if ladder else None,
+        "best_size": ladder[0][1] if ladder else 0,
+        "cost": round(cost / 100, 2),
+        "levels": levels,
+        "depth": sum(q for _, q in ladder),
+    }
+
+def estimate_fills(tickers, side, count, limit_price=None, max_age=DEPTH_TTL):
+    """{ticker: estimate_fill(...)} for several tickers, books fetched concurrently"""
+    return {t: estimate_fill(b, side, count, limit_price) for t, b in get_books(tickers, max_age).items()}
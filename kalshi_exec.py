@@ -0,0 +1,265 @@
+# FILE: kalshi_exec.py
+# Kalshi order execution with stage timing
+# Orders go out over their own keep-alive session and in-flight cap per trade host,
+# apart from http_client's catalog/depth traffic, kept warm with a cheap
+# authenticated GET on a background thread, and are signed with the cached key
+# from kalshi_auth. Every order records signal -> built -> signed -> sent ->
+# answered -> acked timings to a local JSONL latency log.
+#
+# Offline benchmark (mock exchange):   python kalshi_exec.py --bench 200
+# Latency summary:                     python kalshi_exec.py --summary
+
+import argparse
+import json
+import os
+import threading
+import time
+from urllib.parse import urlparse
+import requests
+from requests.adapters import HTTPAdapter
+import kalshi_auth
+import snapshot_store
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+TRADE_URL = os.environ.get("BIGSNAPSHOT_KALSHI_TRADE_URL", "https://api.elections.kalshi.com")
+ORDERS_PATH = "/trade-api/v2/portfolio/orders"
+BALANCE_PATH = "/trade-api/v2/portfolio/balance"
+LATENCY_LOG = os.environ.get("BIGSNAPSHOT_LATENCY_LOG", os.path.join(snapshot_store.SNAPSHOT_DIR, "latency.jsonl"))
+# Idle keep-alive connections are dropped server-side after about a minute
+WARM_IDLE = 30
+ORDER_TIMEOUT = 10
+# Concurrent order requests per trade host; matches kalshi_orders.MAX_IN_FLIGHT
+ORDER_SLOTS = 4
+# send: request out until the response head arrives (network + exchange); ack: response body read
+STAGES = ["build", "sign", "send", "ack", "total"]
+
+_log_lock = threading.Lock()
+_order_hosts = {}
+_order_hosts_lock = threading.Lock()
+
+def mark():
+    """Stage clock; pass mark() as signal_at when a signal is first seen"""
+    return time.perf_counter()
+
+# ============================================================
+# LATENCY LOG
+# ============================================================
+def write_latency(record, path=None):
+    path = path or LATENCY_LOG
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with _log_lock, open(path, "a") as f:
+            f.write(json.dumps(record) + "\n")
+    except:
+        pass
+
+def read_latency(path=None):
+    out = []
+    try:
+        with open(path or LATENCY_LOG) as f:
+            for line in f:
+                if line.strip():
+                    out.append(json.loads(line))
+    except:
+        pass
+    return out
+
+def _pct(values, p):
+    values = sorted(values)
+    if not values:
+        return None
+    return round(values[min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))], 3)
+
+def summarize(records):
+    """{stage: {"n", "p50", "p90", "p99", "max"}} in milliseconds"""
+    out = {}
+    for stage in STAGES:
+        vals = [r["ms"][stage] for r in records if r.get("ms", {}).get(stage) is not None]
+        out[stage] = {"n": len(vals), "p50": _pct(vals, 50), "p90": _pct(vals, 90), "p99": _pct(vals, 99),
+                      "max": round(max(vals), 3) if vals else None}
+    return out
+
+# ============================================================
+# ORDER SESSIONS
+# ============================================================
+def _order_host(base_url):
+    """(session, semaphore) reserved for order traffic to one trade host, shared process-wide"""
+    host = urlparse(base_url).netloc
+    with _order_hosts_lock:
+        if host not in _order_hosts:
+            session = requests.Session()
+            # Orders are never retried at the transport; kalshi_orders retries under the same client_order_id
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=ORDER_SLOTS, max_retries=0)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _order_hosts[host] = (session, threading.BoundedSemaphore(ORDER_SLOTS))
+        return _order_hosts[host]
+
+# ============================================================
+# EXECUTOR
+# ============================================================
+class Executor:
+    """Signs and submits orders over a warm pooled connection, timing each stage."""
+
+    def __init__(self, signer, base_url=None, log_path=None):
+        self.signer = signer
+        self.base_url = (base_url or TRADE_URL).rstrip("/")
+        self.log_path = log_path
+        self.session, self.slots = _order_host(self.base_url)
+        self.last_used = 0
+        self._warming = threading.Lock()
+
+    def warm(self, force=False):
+        """Open (or keep open) the order connection with an authenticated balance read.
+        Returns the round trip in ms, or None when the connection was already warm."""
+        if not force and time.time() - self.last_used < WARM_IDLE:
+            return None
+        start = time.perf_counter()
+        try:
+            self.session.get(self.base_url + BALANCE_PATH, headers=self.signer.headers("GET", BALANCE_PATH),
+                             timeout=ORDER_TIMEOUT).close()
+        except:
+            return None
+        self.last_used = time.time()
+        return round((time.perf_counter() - start) * 1000, 3)
+
+    def warm_async(self):
+        """warm() on a background thread so a page render never waits on it; at most one at a time"""
+        if time.time() - self.last_used < WARM_IDLE or not self._warming.acquire(blocking=False):
+            return
+        def _run():
+            try:
+                self.warm()
+            finally:
+                self._warming.release()
+        threading.Thread(target=_run, name="kalshi-warm", daemon=True).start()
+
+    def build_order(self, ticker, side, price_cents, count, action="buy", client_order_id=None):
+        body = {"ticker": ticker, "action": action, "side": side, "count": int(count), "type": "limit"}
+        body["yes_price" if side == "yes" else "no_price"] = int(price_cents)
+        if client_order_id:
+            body["client_order_id"] = client_order_id
+        return body
+
+    def submit(self, body, signal_at=None, meta=None):
+        """POST one built order. Returns (status_code or None, response json, timing record)"""
+        t_signal = signal_at if signal_at is not None else mark()
+        t_built = mark()
+        headers = self.signer.headers("POST", ORDERS_PATH)
+        t_signed = mark()
+        warm = time.time() - self.last_used < WARM_IDLE
+        status, data, error = None, {}, ""
+        with self.slots:
+            t_sent = mark()
+            t_answered = None
+            try:
+                # Streamed so the call returns at the response head; the body is read separately
+                r = self.session.post(self.base_url + ORDERS_PATH, headers=headers, json=body,
+                                      timeout=ORDER_TIMEOUT, stream=True)
+                t_answered = mark()
+                status = r.status_code
+                try:
+                    data = r.json()
+                except ValueError:
+                    data = {}
+                finally:
+                    r.close()
+            except Exception as e:
+                error = str(e)
+            t_acked = mark()
+        if t_answered is None:
+            t_answered = t_acked
+        self.last_used = time.time()
+        record = {
+            "ts": time.time(),
+            "ticker": body.get("ticker", ""),
+            "side": body.get("side", ""),
+            "count": body.get("count", 0),
+            "client_order_id": body.get("client_order_id", ""),
+            "status": status,
+            "ok": status in (200, 201),
+            "warm": warm,
+            "error": error,
+            "ms": {
+                "build": round((t_built - t_signal) * 1000, 3),
+                "sign": round((t_signed - t_built) * 1000, 3),
+                "send": round((t_answered - t_sent) * 1000, 3),
+                "ack": round((t_acked - t_answered) * 1000, 3),
+                "total": round((t_acked - t_signal) * 1000, 3),
+            },
+        }
+        if meta:
+            record.update(meta)
+        write_latency(record, self.log_path)
+        return status, data, record
+
+    def place_order(self, ticker, side, price_cents, count, signal_at=None, action="buy", client_order_id=None):
+        """(ok, message, order_id, timing record) for one limit order"""
+        t_signal = signal_at if signal_at is not None else mark()
+        body = self.build_order(ticker, side, price_cents, count, action, client_order_id)
+        status, data, record = self.submit(body, t_signal)
+        if record["ok"]:
+            oid = data.get("order", {}).get("order_id", data.get("order_id", ""))
+            return True, "Order placed", oid, record
+        if status is None:
+            return False, record["error"], "", record
+        err = data.get("error")
+        msg = (err.get("message") or err.get("code")) if isinstance(err, dict) else (err or data.get("message", ""))
+        return False, msg or "HTTP " + str(status), "", record
+
+def get_executor(api_key, pem, base_url=None):
+    """Executor over the process-wide cached signer; None without usable credentials"""
+    signer = kalshi_auth.get_signer(api_key, pem)
+    return Executor(signer, base_url) if signer else None
+
+# ============================================================
+# BENCHMARK
+# ============================================================
+def benchmark(n=200, delay_ms=0):
+    """Cold (fresh connection each order) vs warm (pooled) submit latency against the mock exchange"""
+    import requests
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import rsa
+    import kalshi_mock_exchange
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    pem = key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.TraditionalOpenSSL,
+                            serialization.NoEncryption()).decode()
+    url, _, server = kalshi_mock_exchange.start_in_thread(0, delay_ms)
+    log_path = os.path.join(snapshot_store.SNAPSHOT_DIR, "latency_bench.jsonl")
+    if os.path.exists(log_path):
+        os.remove(log_path)
+    ex = Executor(kalshi_auth.Signer("bench", pem), url, log_path)
+    cold = []
+    for i in range(n):
+        # The pre-change path: PEM parsed and a new connection opened per order
+        start = mark()
+        signer = kalshi_auth.Signer("bench", pem)
+        body = ex.build_order("KXBENCH-" + str(i), "yes", 50, 1)
+        requests.post(url + ORDERS_PATH, headers=signer.headers("POST", ORDERS_PATH), json=body, timeout=ORDER_TIMEOUT)
+        cold.append((mark() - start) * 1000)
+    ex.warm(force=True)
+    for i in range(n):
+        ex.place_order("KXBENCH-" + str(i), "yes", 50, 1, signal_at=mark())
+    server.shutdown()
+    warm = summarize(read_latency(log_path))
+    return {"cold": {"n": n, "p50": _pct(cold, 50), "p90": _pct(cold, 90), "p99": _pct(cold, 99)}, "warm": warm}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Kalshi execution path timing")
+    parser.add_argument("--bench", type=int, metavar="N", help="time N orders against a local mock exchange")
+    parser.add_argument("--delay-ms", type=float, default=0, help="mock exchange processing delay")
+    parser.add_argument("--summary", action="store_true", help="percentiles from the latency log")
+    args = parser.parse_args()
+    if args.bench:
+        res = benchmark(args.bench, args.delay_ms)
+        c = res["cold"]
+        print("cold  (new key + connection)  p50 %s ms | p90 %s ms | p99 %s ms" % (c["p50"], c["p90"], c["p99"]))
+        for stage, s in res["warm"].items():
+            print("warm  %-6s p50 %s ms | p90 %s ms | p99 %s ms" % (stage, s["p50"], s["p90"], s["p99"]))
+    if args.summary or not args.bench:
+        records = read_latency()
+        print(str(len(records)) + " orders in " + LATENCY_LOG)
+        for stage, s in summarize(records).items():
+            print("%-6s n=%s p50 %s ms | p90 %s ms | p99 %s ms | max %s ms" % (stage, s["n"], s["p50"], s["p90"], s["p99"], s["max"]))
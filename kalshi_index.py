@@ -0,0 +1,114 @@
+# FILE: kalshi_index.py
+# Per-fetch index over Kalshi ML / spread markets for the basketball pages
+# Titles and tickers are parsed once per market when the index is built; per-game
+# lookups then hit a dict keyed by the (away_code, home_code) pair in the ticker
+
+import re
+
+# ============================================================
+# PARSERS
+# ============================================================
+_SPREAD_BY_RE = re.compile(r'(?:over|more than|by)\s+([\d.]+)')
+_SPREAD_RANGE_RE = re.compile(r'(\d+\.?\d*)\s*[-\u2013to]+\s*(\d+\.?\d*)')
+_SPREAD_NUM_RE = re.compile(r'\b([1-9]\d?(?:\.\d+)?)\b')
+_TICKER_DATE_RE = re.compile(r'^\d{2}[A-Z]{3}\d{2}\d*')
+_TICKER_TEAM_RE = re.compile(r'^[A-Z]+')
+
+def parse_spread_value(title_lower):
+    """Margin in a spread market title: 'by 5.5', a '3-6' bracket midpoint, or a bare 1-50 number"""
+    m = _SPREAD_BY_RE.search(title_lower)
+    if m:
+        try: return float(m.group(1))
+        except ValueError: return None
+    m = _SPREAD_RANGE_RE.search(title_lower)
+    if m:
+        return (float(m.group(1)) + float(m.group(2))) / 2
+    m = _SPREAD_NUM_RE.search(title_lower)
+    if m:
+        v = float(m.group(1))
+        if 1 <= v <= 50: return v
+    return None
+
+def ticker_codes(ticker):
+    """KXNBAGAME-26OCT18ATLBOS-ATL -> ('ATLBOS', 'ATL'): game code letters and the yes-side team"""
+    parts = (ticker or "").upper().split("-")
+    game = _TICKER_DATE_RE.sub("", parts[1]) if len(parts) > 1 else ""
+    yes = ""
+    if len(parts) > 2:
+        m = _TICKER_TEAM_RE.match(parts[2])
+        if m: yes = m.group(0)
+    return game, yes
+
+# ============================================================
+# INDEX
+# ============================================================
+class MarketIndex:
+    def __init__(self, markets, spread_parser=None):
+        self.markets = []
+        self.spread_vals = {}
+        self.by_game = {}
+        self._rows = []
+        self._memo = {}
+        self._sorted = spread_parser is not None
+        for m in markets:
+            ticker = m.get("ticker", "") or ""
+            title = m.get("title", "") or ""
+            subtitle = m.get("subtitle", "") or ""
+            spread_val = spread_parser(title.lower()) if spread_parser else None
+            game, yes = ticker_codes(ticker)
+            self.markets.append(m)
+            self.spread_vals[ticker] = spread_val
+            self.by_game.setdefault(game, []).append(m)
+            self._rows.append((m, (ticker + " " + title + " " + subtitle).lower(), title.upper()))
+        if self._sorted:
+            for rows in self.by_game.values():
+                self._sort(rows)
+
+    def _sort(self, rows):
+        # Widest spread first, as the pages list brackets
+        rows.sort(key=lambda m: self.spread_vals.get(m.get("ticker", "")) or 0, reverse=True)
+
+    def __len__(self):
+        return len(self.markets)
+
+    def spread_val(self, market):
+        return self.spread_vals.get(market.get("ticker", ""))
+
+    def game(self, away_code, home_code):
+        return self.by_game.get((away_code + home_code).upper(), [])
+
+    def for_game(self, away_code, home_code, home_terms=(), away_terms=()):
+        """Markets for one game: ticker codes first, else a one-time text match (both sides) that is memoized"""
+        hit = self.game(away_code, home_code)
+        if hit:
+            return hit
+        return self._scan(("both", tuple(home_terms), tuple(away_terms)))
+
+    def mentioning(self, terms):
+        """Markets whose ticker/title/subtitle mention any term (memoized per term set)"""
+        return self._scan(("any", tuple(terms), ()))
+
+    def first_in_title(self, terms):
+        """First market whose title contains any term, case-insensitive (memoized per term set)"""
+        key = ("title", tuple(terms), ())
+        if key not in self._memo:
+            ups = [t.upper() for t in terms if t]
+            self._memo[key] = next((m for m, _, title_up in self._rows if any(t in title_up for t in ups)), None)
+        return self._memo[key]
+
+    def _scan(self, key):
+        if key not in self._memo:
+            mode, a_terms, b_terms = key
+            a = [t.lower() for t in a_terms if t]
+            b = [t.lower() for t in b_terms if t]
+            out = []
+            for m, text, _ in self._rows:
+                a_hit = any(t in text for t in a)
+                if mode == "any":
+                    if a_hit: out.append(m)
+                elif a_hit and any(t in text for t in b):
+                    out.append(m)
+            if self._sorted:
+                self._sort(out)
+            self._memo[key] = out
+        return self._memo[key]
@@ -0,0 +1,134 @@
+# FILE: kalshi_mock_exchange.py
+# Local stand-in for the Kalshi trade API (orders + balance) for offline runs
+# Checks that auth headers are present, answers over keep-alive HTTP/1.1 and
+# can add a fixed processing delay, so the execution path can be timed without
+# touching the real exchange. Orders are held in memory only.
+#
+# Run:   python kalshi_mock_exchange.py --port 8766 --delay-ms 5
+#        BIGSNAPSHOT_KALSHI_TRADE_URL=http://localhost:8766 streamlit run Home.py
+
+import argparse
+import json
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+DEFAULT_PORT = 8766
+ORDERS_PATH = "/trade-api/v2/portfolio/orders"
+BALANCE_PATH = "/trade-api/v2/portfolio/balance"
+AUTH_HEADERS = ("KALSHI-ACCESS-KEY", "KALSHI-ACCESS-SIGNATURE", "KALSHI-ACCESS-TIMESTAMP")
+START_BALANCE = 100000
+
+# ============================================================
+# EXCHANGE
+# ============================================================
+class MockExchange:
+    def __init__(self, delay_ms=0, reject_every=0):
+        self.delay_ms = delay_ms
+        self.reject_every = reject_every
+        self.orders = {}
+        self.by_client_id = {}
+        self.balance = START_BALANCE
+        self.received = 0
+        self.lock = threading.Lock()
+
+    def place(self, body):
+        """(status, payload) for one create-order request"""
+        with self.lock:
+            self.received += 1
+            n = self.received
+            coid = body.get("client_order_id")
+            if coid and coid in self.by_client_id:
+                return 409, {"error": {"code": "order_already_exists", "message": "duplicate client_order_id",
+                                       "order_id": self.by_client_id[coid]}}
+            if not body.get("ticker") or body.get("side") not in ("yes", "no") or int(body.get("count", 0) or 0) < 1:
+                return 400, {"error": {"code": "invalid_parameters", "message": "ticker, side and count are required"}}
+            if self.reject_every and n % self.reject_every == 0:
+                return 400, {"error": {"code": "insufficient_balance", "message": "mock reject"}}
+            price = body.get("yes_price") if body["side"] == "yes" else body.get("no_price")
+            order = {
+                "order_id": str(uuid.uuid4()),
+                "client_order_id": coid or "",
+                "ticker": body["ticker"],
+                "side": body["side"],
+                "action": body.get("action", "buy"),
+                "type": body.get("type", "limit"),
+                "count": int(body["count"]),
+                body["side"] + "_price": price,
+                "status": "resting",
+                "created_time": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            }
+            self.orders[order["order_id"]] = order
+            if coid:
+                self.by_client_id[coid] = order["order_id"]
+            return 201, {"order": order}
+
+def make_handler(exchange):
+    class Handler(BaseHTTPRequestHandler):
+        # Keep-alive, so a warm client connection is actually reused
+        protocol_version = "HTTP/1.1"
+        # Headers and body go out as separate writes; without this Nagle + delayed ACK adds ~40 ms
+        disable_nagle_algorithm = True
+
+        def log_message(self, *args):
+            pass
+
+        def _reply(self, status, payload):
+            raw = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(raw)))
+            self.end_headers()
+            self.wfile.write(raw)
+
+        def _authed(self):
+            return all(self.headers.get(h) for h in AUTH_HEADERS)
+
+        def do_GET(self):
+            if not self._authed():
+                return self._reply(401, {"error": {"code": "unauthorized"}})
+            if self.path.startswith(BALANCE_PATH):
+                return self._reply(200, {"balance": exchange.balance})
+            if self.path.startswith(ORDERS_PATH):
+                return self._reply(200, {"orders": list(exchange.orders.values())})
+            self._reply(404, {"error": {"code": "not_found"}})
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0) or 0)
+            raw = self.rfile.read(length) if length else b""
+            if not self._authed():
+                return self._reply(401, {"error": {"code": "unauthorized"}})
+            if not self.path.startswith(ORDERS_PATH):
+                return self._reply(404, {"error": {"code": "not_found"}})
+            if exchange.delay_ms:
+                time.sleep(exchange.delay_ms / 1000)
+            try:
+                body = json.loads(raw or b"{}")
+            except ValueError:
+                return self._reply(400, {"error": {"code": "invalid_json"}})
+            status, payload = exchange.place(body)
+            self._reply(status, payload)
+    return Handler
+
+def start_in_thread(port=DEFAULT_PORT, delay_ms=0, reject_every=0):
+    """Serve on a daemon thread; returns (base_url, exchange, server)"""
+    exchange = MockExchange(delay_ms, reject_every)
+    server = ThreadingHTTPServer(("localhost", port), make_handler(exchange))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return "http://localhost:" + str(server.server_address[1]), exchange, server
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mock Kalshi trade API for offline execution tests")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--delay-ms", type=float, default=0, help="processing delay added to every order")
+    parser.add_argument("--reject-every", type=int, default=0, help="reject every Nth order")
+    args = parser.parse_args()
+    exchange = MockExchange(args.delay_ms, args.reject_every)
+    server = ThreadingHTTPServer(("localhost", args.port), make_handler(exchange))
+    print("mock exchange on http://localhost:" + str(args.port))
+    server.serve_forever()
@@ -0,0 +1,244 @@
+# FILE: kalshi_orders.py
+# Background Kalshi order queue with a persistent order log
+# Pages enqueue order intents and return immediately; a worker submits them
+# concurrently (bounded in flight, token-bucket rate limit) through kalshi_exec.
+# Every intent carries a client_order_id generated before the first attempt, so
+# retries and repeated clicks cannot double-submit. Outcomes land in SQLite.
+#
+# Recent orders:   python kalshi_orders.py --tail 20
+
+import argparse
+import os
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+import kalshi_exec
+import snapshot_store
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+DB_PATH = os.environ.get("BIGSNAPSHOT_ORDERS_DB", os.path.join(snapshot_store.SNAPSHOT_DIR, "orders.sqlite"))
+# Kalshi's basic tier allows 10 writes per second
+RATE_PER_SEC = 10
+BURST = 10
+MAX_IN_FLIGHT = 4
+MAX_ATTEMPTS = 3
+RETRY_BASE = 0.5
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# A queued/submitting row untouched this long has no live worker (restart, dead dispatcher);
+# a live attempt updates it at least every ORDER_TIMEOUT plus backoff
+STALE_AFTER = 60
+
+QUEUED, SUBMITTING, PLACED, REJECTED, FAILED = "queued", "submitting", "placed", "rejected", "failed"
+TERMINAL = {PLACED, REJECTED, FAILED}
+# The exchange answered definitively; anything else (FAILED: timeouts, transport errors,
+# exhausted 5xx/429) may still have reached it, so a retry must reuse the same id
+SETTLED = {PLACED, REJECTED}
+
+COLUMNS = ["client_order_id", "created_at", "updated_at", "source", "ticker", "side", "action", "price", "count",
+           "status", "order_id", "message", "attempts", "latency_ms"]
+
+_init_lock = threading.Lock()
+_initialized = set()
+_queues = {}
+_queues_lock = threading.Lock()
+
+# ============================================================
+# ORDER LOG
+# ============================================================
+def _connect(path=None):
+    path = path or DB_PATH
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    conn = sqlite3.connect(path, timeout=10)
+    with _init_lock:
+        if path not in _initialized:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS orders (client_order_id TEXT PRIMARY KEY, created_at REAL, updated_at REAL, "
+                         "source TEXT, ticker TEXT, side TEXT, action TEXT, price INTEGER, count INTEGER, status TEXT, "
+                         "order_id TEXT, message TEXT, attempts INTEGER, latency_ms REAL)")
+            conn.execute("CREATE INDEX IF NOT EXISTS orders_created ON orders (created_at)")
+            conn.commit()
+            _initialized.add(path)
+    return conn
+
+def _insert(intent, path=None):
+    """True when the client_order_id is new (a repeat is ignored)"""
+    now = time.time()
+    with closing(_connect(path)) as conn, conn:
+        cur = conn.execute("INSERT OR IGNORE INTO orders (client_order_id, created_at, updated_at, source, ticker, side, action, "
+                           "price, count, status, order_id, message, attempts, latency_ms) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, '', '', 0, NULL)",
+                           (intent["client_order_id"], now, now, intent.get("source", ""), intent["ticker"], intent["side"],
+                            intent.get("action", "buy"), int(intent["price"]), int(intent["count"]), QUEUED))
+    return cur.rowcount == 1
+
+def _requeue(client_order_id, path=None):
+    """Flip a FAILED (or stale queued/submitting) order back to queued; True for exactly one caller"""
+    now = time.time()
+    with closing(_connect(path)) as conn, conn:
+        cur = conn.execute("UPDATE orders SET status = ?, message = '', updated_at = ? WHERE client_order_id = ? AND "
+                           "(status = ? OR (status IN (?, ?) AND updated_at < ?))",
+                           (QUEUED, now, client_order_id, FAILED, QUEUED, SUBMITTING, now - STALE_AFTER))
+    return cur.rowcount == 1
+
+def _recover(path=None):
+    """Mark orders left queued/submitting by a previous process FAILED, so the page shows
+    them as retryable instead of pending forever. Returns how many were recovered."""
+    now = time.time()
+    with closing(_connect(path)) as conn, conn:
+        cur = conn.execute("UPDATE orders SET status = ?, message = ?, updated_at = ? WHERE status IN (?, ?) AND updated_at < ?",
+                           (FAILED, "interrupted (no worker); retry to resubmit", now, QUEUED, SUBMITTING, now - STALE_AFTER))
+    return cur.rowcount
+
+def _update(client_order_id, path=None, **fields):
+    fields["updated_at"] = time.time()
+    cols = ", ".join(k + " = ?" for k in fields)
+    with closing(_connect(path)) as conn, conn:
+        conn.execute("UPDATE orders SET " + cols + " WHERE client_order_id = ?", list(fields.values()) + [client_order_id])
+
+def get_order(client_order_id, path=None):
+    with closing(_connect(path)) as conn, conn:
+        row = conn.execute("SELECT " + ", ".join(COLUMNS) + " FROM orders WHERE client_order_id = ?", (client_order_id,)).fetchone()
+    return dict(zip(COLUMNS, row)) if row else None
+
+def recent_orders(limit=50, source=None, path=None):
+    """Newest first"""
+    sql = "SELECT " + ", ".join(COLUMNS) + " FROM orders"
+    params = []
+    if source:
+        sql += " WHERE source = ?"
+        params.append(source)
+    sql += " ORDER BY created_at DESC LIMIT ?"
+    params.append(int(limit))
+    with closing(_connect(path)) as conn, conn:
+        return [dict(zip(COLUMNS, r)) for r in conn.execute(sql, params).fetchall()]
+
+def new_client_order_id():
+    return str(uuid.uuid4())
+
+# ============================================================
+# QUEUE
+# ============================================================
+class TokenBucket:
+    def __init__(self, rate=RATE_PER_SEC, burst=BURST):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.stamp = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.stamp) * self.rate)
+                self.stamp = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+class OrderQueue:
+    """Accepts intents from any page; a dispatcher thread feeds a bounded submit pool."""
+
+    def __init__(self, executor, path=None, in_flight=MAX_IN_FLIGHT, rate=RATE_PER_SEC):
+        self.executor = executor
+        self.path = path
+        self.bucket = TokenBucket(rate, max(1, min(BURST, rate)))
+        self._q = queue.Queue()
+        self._pool = ThreadPoolExecutor(max_workers=in_flight)
+        self._slots = threading.Semaphore(in_flight)
+        try:
+            _recover(path)
+        except Exception:
+            pass
+        threading.Thread(target=self._dispatch, name="kalshi-orders", daemon=True).start()
+
+    def enqueue(self, ticker, side, price, count, action="buy", source="", client_order_id=None, signal_at=None):
+        """Log and queue one intent; returns its client_order_id. Re-enqueueing an id
+        that is already logged is a no-op, which makes repeated clicks safe, except
+        for a FAILED order or one stuck queued/submitting past STALE_AFTER: it is
+        retried under the same id (as logged), so the exchange dedupes it if the
+        earlier attempt did land.
+        signal_at (kalshi_exec.mark()) makes the latency record include queue wait."""
+        intent = {"client_order_id": client_order_id or new_client_order_id(), "ticker": ticker, "side": side,
+                  "price": int(price), "count": int(count), "action": action, "source": source,
+                  "signal_at": signal_at if signal_at is not None else kalshi_exec.mark()}
+        if _insert(intent, self.path):
+            self._q.put(intent)
+        elif _requeue(intent["client_order_id"], self.path):
+            logged = get_order(intent["client_order_id"], self.path)
+            intent.update({k: logged[k] for k in ("ticker", "side", "price", "count", "action", "source")})
+            self._q.put(intent)
+        return intent["client_order_id"]
+
+    def enqueue_many(self, intents, source=""):
+        """Queue several intents at once (dicts with ticker/side/price/count); returns their ids"""
+        return [self.enqueue(i["ticker"], i["side"], i["price"], i["count"], i.get("action", "buy"),
+                             i.get("source", source), i.get("client_order_id")) for i in intents]
+
+    def pending(self):
+        return self._q.qsize()
+
+    def _dispatch(self):
+        while True:
+            intent = self._q.get()
+            self._slots.acquire()
+            self.bucket.acquire()
+            self._pool.submit(self._run, intent)
+
+    def _run(self, intent):
+        try:
+            self._submit(intent)
+        except Exception as e:
+            _update(intent["client_order_id"], self.path, status=FAILED, message=str(e))
+        finally:
+            self._slots.release()
+
+    def _submit(self, intent):
+        coid = intent["client_order_id"]
+        body = self.executor.build_order(intent["ticker"], intent["side"], intent["price"], intent["count"],
+                                         intent["action"], coid)
+        for attempt in range(1, MAX_ATTEMPTS + 1):
+            _update(coid, self.path, status=SUBMITTING, attempts=attempt)
+            status, data, record = self.executor.submit(body, intent["signal_at"], {"source": intent.get("source", "")})
+            err = data.get("error") if isinstance(data.get("error"), dict) else {}
+            if status in (200, 201):
+                oid = data.get("order", {}).get("order_id", data.get("order_id", ""))
+                return _update(coid, self.path, status=PLACED, order_id=oid, message="Order placed",
+                               latency_ms=record["ms"]["total"])
+            if status == 409 and err.get("code") == "order_already_exists":
+                # An earlier attempt reached the exchange; the id makes this retry harmless
+                return _update(coid, self.path, status=PLACED, order_id=err.get("order_id", ""),
+                               message="Order placed (confirmed on retry)", latency_ms=record["ms"]["total"])
+            message = err.get("message") or err.get("code") or record.get("error") or "HTTP " + str(status)
+            if status is not None and status not in RETRY_STATUSES:
+                return _update(coid, self.path, status=REJECTED, message=message, latency_ms=record["ms"]["total"])
+            if attempt < MAX_ATTEMPTS:
+                time.sleep(RETRY_BASE * (2 ** (attempt - 1)))
+        _update(coid, self.path, status=FAILED, message=message)
+
+def get_queue(api_key, pem, base_url=None):
+    """Process-wide queue per credential; None without usable credentials"""
+    key = (api_key, pem, base_url)
+    with _queues_lock:
+        if key not in _queues:
+            executor = kalshi_exec.get_executor(api_key, pem, base_url)
+            if executor is None:
+                return None
+            _queues[key] = OrderQueue(executor)
+        return _queues[key]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Kalshi order log")
+    parser.add_argument("--tail", type=int, default=20, help="show the newest N orders")
+    args = parser.parse_args()
+    for o in reversed(recent_orders(args.tail)):
+        print(time.strftime("%m-%d %H:%M:%S", time.localtime(o["created_at"])) + "  " + o["status"].ljust(10) + " "
+              + str(o["count"]) + "x " + o["ticker"] + " " + o["side"].upper() + " @ " + str(o["price"]) + "c  "
+              + (o["message"] or "") + ("  (" + str(round(o["latency_ms"], 1)) + " ms)" if o["latency_ms"] else ""))
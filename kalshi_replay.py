@@ -0,0 +1,203 @@
+# FILE: kalshi_replay.py
+# Local websocket server that replays recorded Kalshi market-data messages
+# Speaks enough of the Kalshi ws v2 protocol for kalshi_stream.MarketFeed:
+# subscribe/unsubscribe with sids, per-sid seq numbers, and a fresh
+# orderbook_snapshot (built from the replayed book) on every subscribe.
+#
+# Record:      BIGSNAPSHOT_KALSHI_RECORD=rec.jsonl streamlit run Home.py
+# Synthesize:  python kalshi_replay.py rec.jsonl --synthesize KXNBAGAME-26OCT18ATLBOS-ATL
+# Replay:      python kalshi_replay.py rec.jsonl --port 8765 --speed 10 [--drop-every 50]
+
+import argparse
+import asyncio
+import json
+import random
+import threading
+import time
+from websockets.asyncio.server import serve
+from kalshi_stream import OrderBook
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+DEFAULT_PORT = 8765
+# Recorded message type -> channel it is delivered on
+MESSAGE_CHANNELS = {
+    "orderbook_snapshot": "orderbook_delta",
+    "orderbook_delta": "orderbook_delta",
+    "ticker": "ticker",
+}
+
+# ============================================================
+# RECORDINGS
+# ============================================================
+def load_recording(path):
+    """[(t, msg)] market-data messages in time order; control messages are skipped"""
+    out = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            rec = json.loads(line)
+            msg = rec.get("msg", rec)
+            if msg.get("type") in MESSAGE_CHANNELS:
+                out.append((rec.get("t", 0), msg))
+    out.sort(key=lambda r: r[0])
+    return out
+
+def synthesize(path, tickers, n=500, interval=0.05, seed=1):
+    """Write a random-walk recording: one snapshot per ticker, then deltas and trades"""
+    rng = random.Random(seed)
+    t = time.time()
+    mids = {tk: rng.randint(30, 70) for tk in tickers}
+    with open(path, "w") as f:
+        for tk, mid in mids.items():
+            snap = {"market_ticker": tk, "yes": [[mid - i, 100 + 10 * i] for i in range(1, 4)],
+                    "no": [[100 - mid - i, 100 + 10 * i] for i in range(1, 4)]}
+            f.write(json.dumps({"t": t, "msg": {"type": "orderbook_snapshot", "sid": 1, "seq": 1, "msg": snap}}) + "\n")
+        for _ in range(n):
+            t += interval
+            tk = rng.choice(tickers)
+            if rng.random() < 0.2:
+                body = {"market_ticker": tk, "price": mids[tk] + rng.choice([-1, 0, 1])}
+                f.write(json.dumps({"t": t, "msg": {"type": "ticker", "sid": 2, "msg": body}}) + "\n")
+                continue
+            side = rng.choice(["yes", "no"])
+            base = mids[tk] if side == "yes" else 100 - mids[tk]
+            body = {"market_ticker": tk, "side": side, "price": base - rng.randint(0, 3), "delta": rng.choice([-20, -10, 10, 20, 50])}
+            f.write(json.dumps({"t": t, "msg": {"type": "orderbook_delta", "sid": 1, "seq": 0, "msg": body}}) + "\n")
+    return path
+
+# ============================================================
+# SERVER
+# ============================================================
+class ReplaySession:
+    """One client connection: its subscriptions, sid/seq counters and the replayed books."""
+
+    def __init__(self, ws, messages, speed=1.0, drop_every=0):
+        self.ws = ws
+        self.messages = messages
+        self.speed = speed
+        self.drop_every = drop_every
+        self.books = {}
+        self.subs = {}
+        self.seq = {}
+        self.next_sid = 1
+        self.sent = 0
+        self.dropped = 0
+        self._ready = asyncio.Event()
+
+    def _apply(self, msg):
+        body = msg.get("msg", {})
+        tk = body.get("market_ticker", "")
+        if msg["type"] == "orderbook_snapshot":
+            self.books[tk] = OrderBook(body.get("yes"), body.get("no"))
+        elif msg["type"] == "orderbook_delta" and tk in self.books:
+            self.books[tk].apply_delta(body.get("side", ""), body.get("price", 0), body.get("delta", 0))
+
+    async def _send(self, sid, kind, body, sequenced):
+        out = {"type": kind, "sid": sid, "msg": body}
+        if sequenced:
+            self.seq[sid] = self.seq.get(sid, 0) + 1
+            out["seq"] = self.seq[sid]
+        await self.ws.send(json.dumps(out))
+        self.sent += 1
+
+    async def _subscribe(self, req_id, params):
+        tickers = set(params.get("market_tickers") or [])
+        for channel in params.get("channels") or []:
+            sid = self.next_sid
+            self.next_sid += 1
+            self.subs[sid] = (channel, tickers)
+            await self.ws.send(json.dumps({"id": req_id, "type": "subscribed", "msg": {"channel": channel, "sid": sid}}))
+            if channel == "orderbook_delta":
+                # Like Kalshi, a subscribe starts with the current book for each ticker
+                for tk in sorted(tickers):
+                    if tk in self.books:
+                        await self._send(sid, "orderbook_snapshot", dict(self.books[tk].levels(), market_ticker=tk), True)
+        self._ready.set()
+
+    async def commands(self):
+        async for raw in self.ws:
+            cmd = json.loads(raw)
+            params = cmd.get("params", {})
+            if cmd.get("cmd") == "subscribe":
+                await self._subscribe(cmd.get("id"), params)
+            elif cmd.get("cmd") == "unsubscribe":
+                for sid in params.get("sids") or []:
+                    self.subs.pop(sid, None)
+                    self.seq.pop(sid, None)
+                await self.ws.send(json.dumps({"id": cmd.get("id"), "type": "unsubscribed", "msg": {"sids": params.get("sids") or []}}))
+
+    async def play(self):
+        await self._ready.wait()
+        start = time.monotonic()
+        t0 = self.messages[0][0] if self.messages else 0
+        n_deltas = 0
+        for t, msg in self.messages:
+            if self.speed > 0:
+                wait = (t - t0) / self.speed - (time.monotonic() - start)
+                if wait > 0:
+                    await asyncio.sleep(wait)
+            self._apply(msg)
+            kind = msg["type"]
+            channel = MESSAGE_CHANNELS[kind]
+            tk = msg.get("msg", {}).get("market_ticker", "")
+            drop = False
+            if kind == "orderbook_delta":
+                n_deltas += 1
+                drop = self.drop_every and n_deltas % self.drop_every == 0
+            for sid, (ch, tickers) in list(self.subs.items()):
+                if ch != channel or tk not in tickers:
+                    continue
+                if drop:
+                    # Consume the seq number without sending: the client sees a gap
+                    self.seq[sid] = self.seq.get(sid, 0) + 1
+                    self.dropped += 1
+                    continue
+                if kind == "orderbook_snapshot":
+                    await self._send(sid, kind, dict(self.books[tk].levels(), market_ticker=tk), True)
+                else:
+                    await self._send(sid, kind, msg.get("msg", {}), channel == "orderbook_delta")
+            if self.speed <= 0:
+                await asyncio.sleep(0)
+
+async def _handler(ws, messages, speed, drop_every):
+    session = ReplaySession(ws, messages, speed, drop_every)
+    commands = asyncio.ensure_future(session.commands())
+    try:
+        await session.play()
+        # Stay open after the recording ends so the client keeps its books
+        await commands
+    finally:
+        commands.cancel()
+
+async def serve_recording(messages, host="localhost", port=DEFAULT_PORT, speed=1.0, drop_every=0, started=None):
+    async with serve(lambda ws: _handler(ws, messages, speed, drop_every), host, port) as server:
+        if started is not None:
+            started.set()
+        await server.serve_forever()
+
+def start_in_thread(path, port=DEFAULT_PORT, speed=0, drop_every=0):
+    """Run the replay server on a daemon thread (for scripts and tests); returns its ws:// URL"""
+    messages = load_recording(path)
+    started = threading.Event()
+    threading.Thread(target=lambda: asyncio.run(serve_recording(messages, "localhost", port, speed, drop_every, started)),
+                     daemon=True).start()
+    started.wait(5)
+    return "ws://localhost:" + str(port)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay recorded Kalshi websocket messages")
+    parser.add_argument("recording", help="JSONL from BIGSNAPSHOT_KALSHI_RECORD (or --synthesize)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--speed", type=float, default=1.0, help="playback speed multiplier, 0 = as fast as possible")
+    parser.add_argument("--drop-every", type=int, default=0, help="withhold every Nth delta to exercise gap recovery")
+    parser.add_argument("--synthesize", nargs="+", metavar="TICKER", help="write a random-walk recording for these tickers first")
+    args = parser.parse_args()
+    if args.synthesize:
+        synthesize(args.recording, args.synthesize)
+    messages = load_recording(args.recording)
+    print("replaying " + str(len(messages)) + " messages on ws://localhost:" + str(args.port))
+    asyncio.run(serve_recording(messages, port=args.port, speed=args.speed, drop_every=args.drop_every))
@@ -0,0 +1,389 @@
+# FILE: kalshi_stream.py
+# Live Kalshi top-of-book from the websocket feed
+# One background connection per process keeps an in-memory order book for every
+# watched ticker (orderbook_snapshot + orderbook_delta, last trade from ticker).
+# A sequence gap resubscribes the affected tickers for a fresh snapshot; tickers
+# that are not in sync (disconnected, gap, not yet snapshotted) are answered
+# from the REST orderbook instead. Tickers no page has asked for in a while
+# (finished, settled) are unsubscribed.
+#
+# Replay a recording:   python kalshi_replay.py rec.jsonl --port 8765
+#                       BIGSNAPSHOT_KALSHI_WS_URL=ws://localhost:8765 streamlit run Home.py
+
+import asyncio
+import json
+import os
+import threading
+import time
+from websockets.asyncio.client import connect
+import http_client
+import kalshi_auth
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+WS_URL = os.environ.get("BIGSNAPSHOT_KALSHI_WS_URL", "wss://api.elections.kalshi.com/trade-api/ws/v2")
+WS_PATH = "/trade-api/ws/v2"
+REST_ORDERBOOK_URL = "https://api.elections.kalshi.com/trade-api/v2/markets/{ticker}/orderbook"
+CHANNELS = ["orderbook_delta", "ticker"]
+# REST answers for out-of-sync tickers are reused this long
+REST_FALLBACK_TTL = 5
+RECONNECT_BASE = 1
+RECONNECT_MAX = 30
+PING_INTERVAL = 20
+# A watched ticker nobody has asked for in this long is unsubscribed
+WATCH_TTL = 600
+EXPIRE_INTERVAL = 60
+
+_feed = None
+_feed_lock = threading.Lock()
+
+# ============================================================
+# ORDER BOOK
+# ============================================================
+class OrderBook:
+    """Resting bids per side in cents -> contracts. A yes ask is 100 minus the best no bid."""
+
+    __slots__ = ("yes", "no", "updated_at")
+
+    def __init__(self, yes=None, no=None):
+        self.yes = {}
+        self.no = {}
+        self.load(yes, no)
+
+    def load(self, yes, no):
+        self.yes = {int(p): int(q) for p, q in (yes or []) if q}
+        self.no = {int(p): int(q) for p, q in (no or []) if q}
+        self.updated_at = time.time()
+
+    def apply_delta(self, side, price, delta):
+        levels = self.yes if side == "yes" else self.no
+        qty = levels.get(int(price), 0) + int(delta)
+        if qty > 0:
+            levels[int(price)] = qty
+        else:
+            levels.pop(int(price), None)
+        self.updated_at = time.time()
+
+    def levels(self):
+        return {"yes": sorted(self.yes.items()), "no": sorted(self.no.items())}
+
+    def top(self):
+        yes_bid = max(self.yes) if self.yes else 0
+        no_bid = max(self.no) if self.no else 0
+        return {
+            "yes_bid": yes_bid,
+            "yes_ask": 100 - no_bid if no_bid else 0,
+            "no_bid": no_bid,
+            "no_ask": 100 - yes_bid if yes_bid else 0,
+            "yes_bid_size": self.yes.get(yes_bid, 0),
+            "no_bid_size": self.no.get(no_bid, 0),
+            "updated_at": self.updated_at,
+        }
+
+def rest_book(ticker, timeout=5):
+    """OrderBook from the public REST orderbook endpoint"""
+    data = http_client.get_json(REST_ORDERBOOK_URL.format(ticker=ticker), timeout=timeout)
+    ob = data.get("orderbook") or {}
+    return OrderBook(ob.get("yes"), ob.get("no"))
+
+# ============================================================
+# FEED
+# ============================================================
+class MarketFeed:
+    """Websocket client plus the books it maintains. handle() is pure state
+    and can be driven directly (e.g. from a recording) without a socket."""
+
+    def __init__(self, url=WS_URL, signer=None, record_path=None):
+        self.url = url
+        self.signer = signer
+        self.record_path = record_path
+        self.books = {}
+        self.last_trade = {}
+        self.synced = set()
+        self.wanted = set()
+        self.watched_at = {}
+        self.connected = False
+        self.stats = {"messages": 0, "gaps": 0, "reconnects": 0, "rest_fallbacks": 0, "last_error": ""}
+        self._seq = {}
+        self._sid_tickers = {}
+        self._sid_channel = {}
+        self._pending = {}
+        self._next_id = 1
+        self._rest = {}
+        self._lock = threading.Lock()
+        self._last_expire = time.time()
+        self._loop = None
+        self._ws = None
+        self._thread = None
+
+    # ---------- message handling ----------
+    def handle(self, msg):
+        """Apply one decoded message; returns a sid whose stream has a sequence gap, else None"""
+        kind = msg.get("type", "")
+        sid = msg.get("sid")
+        body = msg.get("msg") or {}
+        with self._lock:
+            self.stats["messages"] += 1
+            if kind == "subscribed":
+                # One "subscribed" per channel arrives for a request
+                pending = self._pending.get(msg.get("id"))
+                if pending is not None:
+                    tickers, left = pending
+                    self._sid_tickers[body.get("sid")] = tickers
+                    self._sid_channel[body.get("sid")] = body.get("channel", "")
+                    if left > 1:
+                        self._pending[msg.get("id")] = (tickers, left - 1)
+                    else:
+                        del self._pending[msg.get("id")]
+                return None
+            if "seq" in msg and sid is not None:
+                last = self._seq.get(sid)
+                self._seq[sid] = msg["seq"]
+                if kind != "orderbook_snapshot" and last is not None and msg["seq"] != last + 1:
+                    self.stats["gaps"] += 1
+                    self.synced -= self._sid_tickers.get(sid, set())
+                    return sid
+            ticker = body.get("market_ticker", "")
+            if self._ws is not None and ticker not in self.wanted:
+                # Late message for a ticker just unwatched
+                return None
+            if kind == "orderbook_snapshot":
+                book = self.books.get(ticker)
+                if book is None:
+                    self.books[ticker] = OrderBook(body.get("yes"), body.get("no"))
+                else:
+                    book.load(body.get("yes"), body.get("no"))
+                self.synced.add(ticker)
+            elif kind == "orderbook_delta":
+                book = self.books.get(ticker)
+                if book is not None and ticker in self.synced:
+                    book.apply_delta(body.get("side", ""), body.get("price", 0), body.get("delta", 0))
+            elif kind == "ticker":
+                if body.get("price"):
+                    self.last_trade[ticker] = (body["price"], time.time())
+            elif kind == "error":
+                self.stats["last_error"] = str(body.get("msg", body))
+        return None
+
+    def _command(self, cmd, params, tickers=None):
+        with self._lock:
+            req_id = self._next_id
+            self._next_id += 1
+            if tickers is not None:
+                self._pending[req_id] = (set(tickers), len(params.get("channels") or []))
+        return json.dumps({"id": req_id, "cmd": cmd, "params": params})
+
+    def _subscribe_cmd(self, tickers, channels=CHANNELS):
+        return self._command("subscribe", {"channels": list(channels), "market_tickers": sorted(tickers)}, tickers)
+
+    # ---------- connection ----------
+    def _headers(self):
+        return self.signer.headers("GET", WS_PATH) if self.signer else {}
+
+    def _record(self, raw):
+        try:
+            with open(self.record_path, "a") as f:
+                f.write(json.dumps({"t": time.time(), "msg": json.loads(raw)}) + "\n")
+        except:
+            pass
+
+    async def _resync(self, ws, sid):
+        with self._lock:
+            tickers = self._sid_tickers.pop(sid, set())
+            channel = self._sid_channel.pop(sid, "orderbook_delta")
+            self._seq.pop(sid, None)
+        await ws.send(self._command("unsubscribe", {"sids": [sid]}))
+        if tickers:
+            # Only the sid that gapped (the book; the ticker channel has no sequence) is resubscribed
+            await ws.send(self._subscribe_cmd(tickers, [channel]))
+
+    async def _drop(self, ws, sids, keep):
+        """Unsubscribe sids, then resubscribe the tickers in them that are still wanted"""
+        await ws.send(self._command("unsubscribe", {"sids": sorted(sids)}))
+        for channel, tickers in keep.items():
+            await ws.send(self._subscribe_cmd(tickers, [channel]))
+
+    async def _session(self):
+        async with connect(self.url, additional_headers=self._headers(), ping_interval=PING_INTERVAL) as ws:
+            with self._lock:
+                self._ws = ws
+                self._seq.clear()
+                self._sid_tickers.clear()
+                self._sid_channel.clear()
+                self._pending.clear()
+                self.connected = True
+                wanted = set(self.wanted)
+            if wanted:
+                await ws.send(self._subscribe_cmd(wanted))
+            async for raw in ws:
+                if self.record_path:
+                    self._record(raw)
+                gap_sid = self.handle(json.loads(raw))
+                if gap_sid is not None:
+                    await self._resync(ws, gap_sid)
+
+    async def _run(self):
+        delay = RECONNECT_BASE
+        while True:
+            started = time.time()
+            try:
+                await self._session()
+            except Exception as e:
+                with self._lock:
+                    self.stats["last_error"] = str(e)
+            with self._lock:
+                self._ws = None
+                self.connected = False
+                self.synced.clear()
+                self.stats["reconnects"] += 1
+            # A session that stayed up for a while resets the backoff
+            delay = RECONNECT_BASE if time.time() - started > RECONNECT_MAX else min(RECONNECT_MAX, delay * 2)
+            await asyncio.sleep(delay)
+
+    def start(self):
+        if self._thread is not None:
+            return self
+        self._loop = asyncio.new_event_loop()
+        def _main():
+            asyncio.set_event_loop(self._loop)
+            self._loop.run_until_complete(self._run())
+        self._thread = threading.Thread(target=_main, name="kalshi-stream", daemon=True)
+        self._thread.start()
+        return self
+
+    def watch(self, tickers):
+        """Add tickers to the live set; new ones are subscribed on the open connection"""
+        tickers = {t for t in tickers if t}
+        now = time.time()
+        with self._lock:
+            new = tickers - self.wanted
+            self.wanted |= new
+            for t in tickers:
+                self.watched_at[t] = now
+            ws = self._ws
+            due = now - self._last_expire >= EXPIRE_INTERVAL
+            if due:
+                self._last_expire = now
+        if new and ws is not None and self._loop is not None:
+            asyncio.run_coroutine_threadsafe(ws.send(self._subscribe_cmd(new)), self._loop)
+        if due:
+            self.expire()
+        return new
+
+    def unwatch(self, tickers):
+        """Drop tickers from the live set and their books; their subscriptions are removed
+        (a sid shared with still-wanted tickers is resubscribed without them)"""
+        gone = {t for t in tickers if t}
+        with self._lock:
+            gone &= self.wanted
+            if not gone:
+                return gone
+            self.wanted -= gone
+            self.synced -= gone
+            for t in gone:
+                self.watched_at.pop(t, None)
+                self.books.pop(t, None)
+                self.last_trade.pop(t, None)
+                self._rest.pop(t, None)
+            sids, keep = [], {}
+            for sid, tks in list(self._sid_tickers.items()):
+                if tks & gone:
+                    sids.append(sid)
+                    channel = self._sid_channel.pop(sid, "")
+                    rest = self._sid_tickers.pop(sid) - gone
+                    self._seq.pop(sid, None)
+                    if rest and channel:
+                        keep.setdefault(channel, set()).update(rest)
+            ws = self._ws
+        if sids and ws is not None and self._loop is not None:
+            asyncio.run_coroutine_threadsafe(self._drop(ws, sids, keep), self._loop)
+        return gone
+
+    def expire(self, max_idle=WATCH_TTL):
+        """Unwatch tickers no caller has asked for within max_idle seconds"""
+        cutoff = time.time() - max_idle
+        with self._lock:
+            idle = {t for t in self.wanted if self.watched_at.get(t, 0) < cutoff}
+        return self.unwatch(idle)
+
+    # ---------- reads ----------
+    def is_live(self, ticker):
+        return self.connected and ticker in self.synced
+
+    def book(self, ticker):
+        """Copy of the live book, None unless the ticker is in sync"""
+        with self._lock:
+            if not (self.connected and ticker in self.synced):
+                return None
+            live = self.books[ticker]
+            book = OrderBook()
+            book.yes, book.no, book.updated_at = dict(live.yes), dict(live.no), live.updated_at
+            return book
+
+    def _rest_top(self, ticker):
+        with self._lock:
+            hit = self._rest.get(ticker)
+        if hit and time.time() - hit[0] < REST_FALLBACK_TTL:
+            return hit[1]
+        try:
+            top = rest_book(ticker).top()
+        except:
+            return hit[1] if hit else None
+        top["source"] = "rest"
+        with self._lock:
+            self.stats["rest_fallbacks"] += 1
+            self._rest[ticker] = (time.time(), top)
+        return top
+
+    def top(self, ticker):
+        """Top of book for a ticker: live from the socket when in sync, else REST"""
+        with self._lock:
+            if self.connected and ticker in self.synced:
+                top = self.books[ticker].top()
+                top["source"] = "ws"
+                trade = self.last_trade.get(ticker)
+                top["last_price"] = trade[0] if trade else 0
+                return top
+        return self._rest_top(ticker)
+
+    def price(self, ticker):
+        """Yes price the way the REST pages read it: last trade, else the yes bid (None if unknown)"""
+        top = self.top(ticker)
+        if not top:
+            return None
+        return top.get("last_price") or top.get("yes_bid") or None
+
+def current_feed():
+    """The running feed, if a page has started one (never starts a connection)"""
+    return _feed
+
+def get_feed(api_key="", pem="", url=None):
+    """Process-wide running feed. The production socket needs Kalshi credentials;
+    returns None when they are missing (pages keep their REST prices)."""
+    global _feed
+    url = url or WS_URL
+    with _feed_lock:
+        if _feed is None:
+            signer = kalshi_auth.get_signer(api_key, pem)
+            if signer is None and url.startswith("wss://api.elections.kalshi.com"):
+                return None
+            _feed = MarketFeed(url, signer, os.environ.get("BIGSNAPSHOT_KALSHI_RECORD")).start()
+        return _feed
+
+def live_price(tickers, api_key="", pem="", rest=False):
+    """Watch tickers and return {ticker: price} for those the socket has in sync
+    (rest=True also answers the rest from the REST orderbook)"""
+    tickers = [tickers] if isinstance(tickers, str) else [t for t in tickers if t]
+    if not tickers:
+        return {}
+    feed = get_feed(api_key, pem)
+    if feed is None:
+        return {}
+    feed.watch(tickers)
+    out = {}
+    for t in tickers:
+        p = feed.price(t) if rest or feed.is_live(t) else None
+        if p:
+            out[t] = p
+    return out
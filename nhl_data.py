@@ -0,0 +1,321 @@
+# FILE: nhl_data.py
+# Slow-moving NHL team data for the NHL page and collector.py
+# Special-teams PP%/PK% is loaded with a bounded pool and persisted to disk,
+# so a cold page load reads yesterday's table instead of 32 serial requests.
+# Recent form and rest come from one pass over the daily scoreboards; probable
+# goalies are resolved in one concurrent batch after the slate has rendered.
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+import espn_summary
+import feeds
+import http_client
+import snapshot_store
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+NHL_BASE = feeds.ESPN_SITE_BASE + feeds.LEAGUE_PATHS["nhl"]
+TEAMS_URL = NHL_BASE + "/teams?limit=40"
+
+# Disk key for the aggregated table (stored alongside the URL snapshots)
+SPECIAL_TEAMS_KEY = "bigsnapshot:nhl/special_teams"
+SPECIAL_TEAMS_INTERVAL = 86400
+SPECIAL_TEAMS_WORKERS = 8
+DEFAULT_SPECIAL = {"pp_pct": 20.0, "pk_pct": 80.0}
+
+# Daily boards scanned for form/rest; ~10 games per team fit in four weeks
+FORM_LOOKBACK_DAYS = 28
+FORM_BUFFER = 20
+FORM_WORKERS = 8
+# A finished day never changes, so its board snapshot is reused for this long
+PAST_BOARD_MAX_AGE = 30 * 86400
+# Rest beyond this many days is treated the same
+MAX_REST_DAYS = 2
+
+_refresh_lock = threading.Lock()
+_refreshing = False
+_form_index = None
+_form_lock = threading.Lock()
+
+TBD_GOALIES = ("TBD", "TBD")
+_goalies = {}
+_goalies_lock = threading.Lock()
+# One batch at a time; the batch itself fans out through espn_summary's pool
+_goalie_pool = ThreadPoolExecutor(max_workers=1)
+_goalie_batch = None
+
+# ============================================================
+# SPECIAL TEAMS
+# ============================================================
+def team_stats_url(espn_id):
+    return NHL_BASE + "/teams/" + str(espn_id) + "/statistics"
+
+def list_teams():
+    """[(display_name, abbreviation, espn_id)] for every team"""
+    resp = http_client.get(TEAMS_URL, timeout=10)
+    resp.raise_for_status()
+    teams = []
+    for team_entry in resp.json().get("sports", [{}])[0].get("leagues", [{}])[0].get("teams", []):
+        t = team_entry.get("team", {})
+        if t.get("displayName") and t.get("id"):
+            teams.append((t["displayName"], t.get("abbreviation", ""), t["id"]))
+    return teams
+
+def _team_special(espn_id):
+    """{"pp_pct", "pk_pct"} for one team, None when the fetch fails"""
+    try:
+        sr = http_client.get(team_stats_url(espn_id), timeout=5)
+        sr.raise_for_status()
+        ts = {}
+        for cat in sr.json().get("results", {}).get("stats", {}).get("categories", []):
+            for stat in cat.get("stats", []):
+                ts[stat.get("name", "")] = stat.get("value", 0)
+        if not ts:
+            return None
+        pp = ts.get("powerPlayPct", ts.get("PPPctg", 0))
+        pk = ts.get("penaltyKillPct", ts.get("PKPctg", 0))
+        return {
+            "pp_pct": round(float(pp), 1) if pp else DEFAULT_SPECIAL["pp_pct"],
+            "pk_pct": round(float(pk), 1) if pk else DEFAULT_SPECIAL["pk_pct"],
+        }
+    except:
+        return None
+
+def load_special_teams(workers=SPECIAL_TEAMS_WORKERS):
+    """Fetch every team's PP%/PK% concurrently and persist the table, keyed by ESPN display name.
+    A team whose fetch fails keeps its row from the previous table (defaults if it has none);
+    when every fetch fails the previous table is returned and nothing is written."""
+    teams = list_teams()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(lambda t: _team_special(t[2]), teams))
+    previous, _ = snapshot_store.read_snapshot(SPECIAL_TEAMS_KEY)
+    previous = previous or {}
+    if not any(results):
+        return previous
+    table = {}
+    for (name, abbr, _), row in zip(teams, results):
+        if row is None:
+            row = dict(previous.get(name) or DEFAULT_SPECIAL)
+        row["abbr"] = abbr
+        table[name] = row
+    snapshot_store.write_snapshot(SPECIAL_TEAMS_KEY, table)
+    return table
+
+def _refresh_in_background():
+    global _refreshing
+    with _refresh_lock:
+        if _refreshing:
+            return
+        _refreshing = True
+    def _run():
+        global _refreshing
+        try:
+            load_special_teams()
+        except:
+            pass
+        finally:
+            with _refresh_lock:
+                _refreshing = False
+    threading.Thread(target=_run, daemon=True).start()
+
+def special_teams_age():
+    _, saved_at = snapshot_store.read_snapshot(SPECIAL_TEAMS_KEY)
+    return time.time() - saved_at if saved_at else None
+
+def get_special_teams(codes=None, max_age=SPECIAL_TEAMS_INTERVAL):
+    """{page_code: {"pp_pct", "pk_pct"}} from the disk table right away; a stale table is
+    refreshed on a background thread, so only a first-ever start waits on the league load.
+    codes maps ESPN display names to page codes (ESPN abbreviation otherwise)."""
+    table, saved_at = snapshot_store.read_snapshot(SPECIAL_TEAMS_KEY)
+    if table:
+        if time.time() - saved_at >= max_age:
+            _refresh_in_background()
+    else:
+        try:
+            table = load_special_teams()
+        except:
+            return {}
+    codes = codes or {}
+    return {codes.get(name, row.get("abbr", "")): {"pp_pct": row["pp_pct"], "pk_pct": row["pk_pct"]}
+            for name, row in table.items()}
+
+# ============================================================
+# FORM INDEX
+# ============================================================
+def _day(date_str):
+    return datetime.strptime(date_str, "%Y%m%d").date()
+
+class FormIndex:
+    """Rolling per-team results (W/L/OT with dates) built from daily scoreboards.
+
+    Each day is ingested once; the latest two days are re-ingested while games
+    can still finish. Results are keyed by page code via codes (display name ->
+    code, ESPN abbreviation otherwise).
+    """
+
+    def __init__(self, codes=None):
+        self.codes = codes or {}
+        self._days = {}
+        self._teams = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def _code(self, team):
+        return self.codes.get(team.get("displayName", ""), team.get("abbreviation", ""))
+
+    def ingest_board(self, date_str, data):
+        played, results = set(), {}
+        for event in (data or {}).get("events", []):
+            status = event.get("status", {})
+            name = status.get("type", {}).get("name", "")
+            if name not in ("STATUS_FINAL", "STATUS_IN_PROGRESS", "STATUS_END_PERIOD"):
+                continue
+            for c in event.get("competitions", [{}])[0].get("competitors", []):
+                code = self._code(c.get("team", {}))
+                if not code:
+                    continue
+                played.add(code)
+                if name == "STATUS_FINAL":
+                    results[code] = "W" if c.get("winner", False) else ("OT" if status.get("period", 3) > 3 else "L")
+        with self._lock:
+            self._days[date_str] = {"played": played, "results": results}
+            self._dirty = True
+
+    def has_day(self, date_str):
+        with self._lock:
+            return date_str in self._days
+
+    def trim(self, oldest):
+        """Drop days before oldest (YYYYMMDD)"""
+        with self._lock:
+            for d in [d for d in self._days if d < oldest]:
+                del self._days[d]
+                self._dirty = True
+
+    def _buffers(self):
+        with self._lock:
+            if self._dirty:
+                teams = {}
+                for d in sorted(self._days):
+                    for code, res in self._days[d]["results"].items():
+                        teams.setdefault(code, []).append((d, res))
+                self._teams = {code: rows[-FORM_BUFFER:] for code, rows in teams.items()}
+                self._dirty = False
+            return self._teams
+
+    def results(self, team, n=10):
+        return [res for _, res in self._buffers().get(team, [])[-n:]]
+
+    def last_n(self, team, n=10):
+        """'W-L-OT' over the last n finished games, '?-?-?' when the team has none indexed"""
+        rows = self.results(team, n)
+        if not rows:
+            return "?-?-?"
+        return f"{rows.count('W')}-{rows.count('L')}-{rows.count('OT')}"
+
+    def points_pct(self, team, n=10):
+        rows = self.results(team, n)
+        if not rows:
+            return None
+        return (rows.count("W") * 2 + rows.count("OT")) / (len(rows) * 2)
+
+    def played_on(self, team, date_str):
+        with self._lock:
+            day = self._days.get(date_str)
+        return bool(day) and team in day["played"]
+
+    def rest_days(self, team, date_str, default=1):
+        """Full days off before date_str (0 = back-to-back), capped at MAX_REST_DAYS"""
+        target = _day(date_str)
+        with self._lock:
+            days = sorted(self._days.items(), reverse=True)
+        for d, day in days:
+            if d < date_str and team in day["played"]:
+                return min(MAX_REST_DAYS, (target - _day(d)).days - 1)
+        return default
+
+def _board(date_str, max_age):
+    try:
+        return snapshot_store.get_json(feeds.scoreboard_url("nhl", date_str), max_age)
+    except:
+        return None
+
+def refresh_form_index(index, lookback=FORM_LOOKBACK_DAYS, workers=FORM_WORKERS):
+    """Ingest any missing day in the window plus yesterday and today"""
+    today = feeds.date_str()
+    yesterday = feeds.date_str(-1)
+    jobs = [(today, feeds.SCOREBOARD_MAX_AGE), (yesterday, feeds.RESULTS_MAX_AGE)]
+    for offset in range(2, lookback + 1):
+        d = feeds.date_str(-offset)
+        if not index.has_day(d):
+            jobs.append((d, PAST_BOARD_MAX_AGE))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        boards = list(pool.map(lambda j: _board(*j), jobs))
+    for (d, _), data in zip(jobs, boards):
+        if data is not None:
+            index.ingest_board(d, data)
+    index.trim(feeds.date_str(-lookback))
+    return index
+
+def get_form_index(codes=None):
+    """Process-wide form index, refreshed on every call (past days are never re-read)"""
+    global _form_index
+    with _form_lock:
+        if _form_index is None or _form_index.codes != (codes or {}):
+            _form_index = FormIndex(codes)
+        index = _form_index
+    return refresh_form_index(index)
+
+# ============================================================
+# PROBABLE GOALIES
+# ============================================================
+def parse_probable_goalies(data):
+    """(home, away) starter short names from a game summary, "TBD" when not announced"""
+    home_goalie, away_goalie = TBD_GOALIES
+    try:
+        for item in data.get("rosters", []):
+            ha = item.get("homeAway", "")
+            for entry in item.get("roster", []):
+                if entry.get("probable", False) or entry.get("starter", False):
+                    if entry.get("position", {}).get("abbreviation", "") == "G":
+                        name = entry.get("athlete", {}).get("shortName", "TBD")
+                        if ha == "home": home_goalie = name
+                        else: away_goalie = name
+        if home_goalie == "TBD" or away_goalie == "TBD":
+            for comp in data.get("header", {}).get("competitions", []):
+                for c in comp.get("competitors", []):
+                    for lc in c.get("leaders", []):
+                        if lc.get("abbreviation", "") == "SV%":
+                            athletes = lc.get("leaders", [])
+                            if athletes:
+                                gn = athletes[0].get("athlete", {}).get("shortName", "TBD")
+                                if c.get("homeAway") == "home" and home_goalie == "TBD": home_goalie = gn
+                                elif c.get("homeAway") == "away" and away_goalie == "TBD": away_goalie = gn
+    except: pass
+    return home_goalie, away_goalie
+
+def resolve_goalies(event_ids):
+    """Fetch every event summary concurrently, then parse starters; returns {event_id: (home, away)}"""
+    ids = [str(e) for e in event_ids if e]
+    espn_summary.prefetch_summaries("nhl", ids)
+    out = {eid: parse_probable_goalies(espn_summary.get_summary("nhl", eid) or {}) for eid in ids}
+    with _goalies_lock:
+        _goalies.update(out)
+    return out
+
+def known_goalies(event_ids):
+    """Last resolved assignment per event, without any network work"""
+    with _goalies_lock:
+        return {str(e): _goalies.get(str(e), TBD_GOALIES) for e in event_ids}
+
+def start_goalie_batch(event_ids):
+    """Future resolving {event_id: (home, away)} on the background pool. While a batch is
+    still pending every caller shares it, so concurrent sessions never queue up batches."""
+    global _goalie_batch
+    with _goalies_lock:
+        if _goalie_batch is None or _goalie_batch.done():
+            _goalie_batch = _goalie_pool.submit(resolve_goalies, list(event_ids))
+        return _goalie_batch
@@ -0,0 +1,143 @@
+# FILE: nws_forecast.py
+# NWS forecasts for the Temp page
+# The api.weather.gov points -> forecast URL lookup never changes for a fixed
+# lat/lon, so it is resolved once and kept on disk; pages go straight to the
+# gridpoint forecast. load_board fans every city's forecast and obhistory out
+# concurrently so the whole board costs about one city's round trips.
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import http_client
+import nws_obs
+import snapshot_store
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+POINTS_URL = "https://api.weather.gov/points/{lat},{lon}"
+HEADERS = {"User-Agent": "Temp/1.0"}
+# Disk key for the {"lat,lon": gridpoint} table; entries never expire
+POINTS_KEY = "bigsnapshot:nws/points"
+# Gridpoint forecasts are issued a few times a day
+FORECAST_MAX_AGE = 600
+BOARD_WORKERS = 8
+
+_points = None
+_points_lock = threading.Lock()
+_forecasts = {}
+_forecasts_lock = threading.Lock()
+
+# ============================================================
+# POINTS
+# ============================================================
+def _point_key(lat, lon):
+    return str(lat) + "," + str(lon)
+
+def _table():
+    global _points
+    with _points_lock:
+        if _points is None:
+            data, _ = snapshot_store.read_snapshot(POINTS_KEY)
+            _points = data or {}
+        return _points
+
+def _fetch_point(lat, lon):
+    resp = http_client.get(POINTS_URL.format(lat=lat, lon=lon), headers=HEADERS, timeout=10)
+    resp.raise_for_status()
+    props = resp.json().get("properties", {})
+    return {
+        "forecast": props.get("forecast", ""),
+        "forecast_hourly": props.get("forecastHourly", ""),
+        "grid": str(props.get("gridId", "")) + "/" + str(props.get("gridX", "")) + "," + str(props.get("gridY", "")),
+    }
+
+def resolve_point(lat, lon):
+    """Gridpoint URLs for a lat/lon: memory, then disk, then one points request that is persisted"""
+    key = _point_key(lat, lon)
+    point = _table().get(key)
+    if point and point.get("forecast"):
+        return point
+    point = _fetch_point(lat, lon)
+    if point["forecast"]:
+        with _points_lock:
+            _points[key] = point
+            table = dict(_points)
+        snapshot_store.write_snapshot(POINTS_KEY, table)
+    return point
+
+def forget_point(lat, lon):
+    # NWS occasionally re-grids an office; a 404 forecast drops the stale mapping
+    with _points_lock:
+        if _points is not None and _points.pop(_point_key(lat, lon), None) is not None:
+            table = dict(_points)
+        else:
+            return
+    snapshot_store.write_snapshot(POINTS_KEY, table)
+
+def resolve_points(cities, workers=BOARD_WORKERS):
+    """Resolve every city's gridpoint concurrently; cities is {name: {"lat", "lon", ...}}"""
+    def _one(cfg):
+        try:
+            return resolve_point(cfg["lat"], cfg["lon"])
+        except:
+            return None
+    names = list(cities)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return dict(zip(names, pool.map(lambda n: _one(cities[n]), names)))
+
+# ============================================================
+# FORECAST
+# ============================================================
+def parse_overnight_low(data):
+    """Temperature of the first Tonight/Night period, None when absent"""
+    for period in (data or {}).get("properties", {}).get("periods", []):
+        name = period.get("name", "")
+        if "Tonight" in name or "Night" in name:
+            temp = period.get("temperature")
+            if temp:
+                return temp
+    return None
+
+def forecast_low(lat, lon, max_age=FORECAST_MAX_AGE):
+    """Upcoming overnight LOW from the gridpoint forecast, cached per gridpoint for max_age"""
+    point = resolve_point(lat, lon)
+    url = point.get("forecast", "")
+    if not url:
+        return None
+    with _forecasts_lock:
+        hit = _forecasts.get(url)
+    if hit and time.time() - hit[0] < max_age:
+        return hit[1]
+    resp = http_client.get(url, headers=HEADERS, timeout=10)
+    if resp.status_code == 404:
+        forget_point(lat, lon)
+        return None
+    if resp.status_code != 200:
+        return hit[1] if hit else None
+    low = parse_overnight_low(resp.json())
+    with _forecasts_lock:
+        _forecasts[url] = (time.time(), low)
+    return low
+
+# ============================================================
+# BOARD
+# ============================================================
+def load_board(cities, workers=None):
+    """{name: {"forecast_low", "readings"}} for every city, all requests in flight together"""
+    # One worker per request (a forecast and an obhistory per city)
+    workers = workers or max(1, 2 * len(cities))
+    def _low(cfg):
+        try:
+            return forecast_low(cfg["lat"], cfg["lon"])
+        except:
+            return None
+    def _obs(cfg):
+        try:
+            return nws_obs.get_history(cfg["nws"])
+        except:
+            return []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        lows = {n: pool.submit(_low, cfg) for n, cfg in cities.items()}
+        obs = {n: pool.submit(_obs, cfg) for n, cfg in cities.items()}
+        return {n: {"forecast_low": lows[n].result(), "readings": obs[n].result()} for n in cities}
@@ -0,0 +1,172 @@
+# FILE: nws_obs.py
+# NWS observation history (forecast.weather.gov/data/obhistory) for the Temp page
+# Each refresh is a conditional GET; a 304 costs no body at all. A changed page is
+# streamed through a small table extractor that keeps the ten needed cells per row
+# and stops at the first row already stored, so only new observations are parsed
+# and merged into the per-station history kept on disk.
+
+import threading
+import time
+from html.parser import HTMLParser
+import http_client
+import snapshot_store
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+OBHISTORY_URL = "https://forecast.weather.gov/data/obhistory/{station}.html"
+HEADERS = {"User-Agent": "Temp/1.0"}
+COLUMNS = ["date", "time", "wind", "vis", "weather", "sky", "air", "dwpt", "max_6hr", "min_6hr"]
+# Title/column header rows at the top of the table
+HEADER_ROWS = 3
+# Rows kept per station (the page itself carries ~72 hours)
+MAX_ROWS = 400
+# Reruns inside this window reuse the stored history without a request
+MIN_CHECK_INTERVAL = 30
+CHUNK_SIZE = 16384
+
+_history = {}
+_history_lock = threading.Lock()
+
+# ============================================================
+# EXTRACTOR
+# ============================================================
+class ObTableParser(HTMLParser):
+    """Rows of the first <table> as lists of the first len(COLUMNS) cell texts.
+
+    Stops collecting at the end of that table, or at the first row whose
+    (date, time) equals stop_at, so callers can quit feeding early.
+    """
+
+    def __init__(self, stop_at=None):
+        super().__init__(convert_charrefs=True)
+        self.stop_at = tuple(stop_at) if stop_at else None
+        self.rows = []
+        self.done = False
+        self.reached_stop = False
+        self._depth = 0
+        self._seen_rows = 0
+        self._row = None
+        self._cell = None
+
+    def handle_starttag(self, tag, attrs):
+        if self.done:
+            return
+        if tag == "table":
+            self._depth += 1
+        elif self._depth == 1 and tag == "tr":
+            self._row = []
+        elif self._depth == 1 and tag == "td" and self._row is not None and len(self._row) < len(COLUMNS):
+            self._cell = []
+
+    def handle_endtag(self, tag):
+        if self.done or not self._depth:
+            return
+        if tag == "table":
+            self._depth -= 1
+            if not self._depth:
+                self.done = True
+        elif self._depth == 1 and tag == "td" and self._cell is not None:
+            self._row.append("".join(self._cell).strip())
+            self._cell = None
+        elif self._depth == 1 and tag == "tr" and self._row is not None:
+            self._end_row()
+
+    def handle_data(self, data):
+        if self._cell is not None:
+            self._cell.append(data)
+
+    def _end_row(self):
+        row, self._row = self._row, None
+        self._seen_rows += 1
+        if self._seen_rows <= HEADER_ROWS or len(row) < len(COLUMNS):
+            return
+        if self.stop_at and (row[0], row[1]) == self.stop_at:
+            self.done = True
+            self.reached_stop = True
+            return
+        self.rows.append(dict(zip(COLUMNS, row)))
+
+def parse_rows(chunks, stop_at=None):
+    """(new_rows, reached_stop) from an iterable of HTML text chunks"""
+    parser = ObTableParser(stop_at)
+    for chunk in chunks:
+        parser.feed(chunk)
+        if parser.done:
+            break
+    return parser.rows, parser.reached_stop
+
+# ============================================================
+# HISTORY
+# ============================================================
+def _key(station):
+    return "bigsnapshot:nws/obhistory/" + station
+
+def _row_key(row):
+    return (row.get("date", ""), row.get("time", ""))
+
+def _load(station):
+    with _history_lock:
+        state = _history.get(station)
+    if state is None:
+        state, _ = snapshot_store.read_snapshot(_key(station))
+        state = state or {"rows": [], "etag": None, "last_modified": None}
+        state["checked_at"] = 0
+        with _history_lock:
+            _history[station] = state
+    return state
+
+def _save(station, state):
+    with _history_lock:
+        _history[station] = state
+    snapshot_store.write_snapshot(_key(station), {k: state[k] for k in ("rows", "etag", "last_modified")})
+
+def merge_rows(new_rows, old_rows, limit=MAX_ROWS):
+    """New rows on top, stored rows below them minus any (date, time) just re-read"""
+    fresh = {_row_key(r) for r in new_rows}
+    return (new_rows + [r for r in old_rows if _row_key(r) not in fresh])[:limit]
+
+def _text_chunks(resp):
+    if not resp.encoding:
+        resp.encoding = "utf-8"
+    return resp.iter_content(chunk_size=CHUNK_SIZE, decode_unicode=True)
+
+def refresh(station, timeout=15):
+    """One conditional fetch for a station; returns the merged history, newest first"""
+    state = _load(station)
+    headers = dict(HEADERS)
+    # max-age=0 lets caches revalidate against the origin instead of bypassing them
+    headers["Cache-Control"] = "max-age=0"
+    if state.get("etag"):
+        headers["If-None-Match"] = state["etag"]
+    if state.get("last_modified"):
+        headers["If-Modified-Since"] = state["last_modified"]
+    resp = http_client.get(OBHISTORY_URL.format(station=station), headers=headers, timeout=timeout, stream=True)
+    try:
+        if resp.status_code == 304:
+            state["checked_at"] = time.time()
+            return state["rows"]
+        if resp.status_code != 200:
+            return state["rows"]
+        old = state["rows"]
+        new_rows, _ = parse_rows(_text_chunks(resp), _row_key(old[0]) if old else None)
+        state = {
+            "rows": merge_rows(new_rows, old),
+            "etag": resp.headers.get("ETag"),
+            "last_modified": resp.headers.get("Last-Modified"),
+            "checked_at": time.time(),
+        }
+        _save(station, state)
+        return state["rows"]
+    finally:
+        resp.close()
+
+def get_history(station, min_interval=MIN_CHECK_INTERVAL):
+    """Stored history for a station, revalidated upstream at most every min_interval seconds"""
+    state = _load(station)
+    if state["rows"] and time.time() - state["checked_at"] < min_interval:
+        return state["rows"]
+    try:
+        return refresh(station)
+    except:
+        return state["rows"]
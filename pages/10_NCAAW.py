@@ -5,9 +5,12 @@ st.set_page_config(page_title="BigSnapshot NCAAW Edge Finder", page_icon="🏀",
 from auth import require_auth
 require_auth()
 st_autorefresh(interval=30000, key="ncaaw_datarefresh")
-import uuid, re, requests, pytz
+import uuid, re, pytz
 import requests as req_ga
 from datetime import datetime, timedelta
+import espn_summary, feeds, http_client, snapshot_store
+import games as games_store
+import kalshi_catalog, kalshi_index, play_store
 
 # ============================================================
 # GA4 TRACKING
@@ -162,132 +165,18 @@ def remove_position(pos_id):
 # ============================================================
 # ESPN DATA FETCHERS
 # ============================================================
-@st.cache_data(ttl=30)
 def fetch_espn_games():
-    today_str = now.strftime("%Y%m%d")
-    url = f"https://site.api.espn.com/apis/site/v2/sports/basketball/womens-college-basketball/scoreboard?dates={today_str}&limit=200&groups=50"
     try:
-        r = requests.get(url, timeout=10)
-        data = r.json()
+        return games_store.get_games("ncaaw", now.strftime("%Y%m%d"))
     except:
         return []
-    games = []
-    for evt in data.get("events", []):
-        try:
-            comp = evt["competitions"][0]
-            status_obj = comp.get("status", {})
-            state = status_obj.get("type", {}).get("state", "pre")
-            detail = status_obj.get("type", {}).get("shortDetail", "")
-            period = status_obj.get("period", 0)
-            clock = status_obj.get("displayClock", "0:00")
-            teams = comp.get("competitors", [])
-            home_team = None
-            away_team = None
-            for t in teams:
-                if t.get("homeAway") == "home":
-                    home_team = t
-                elif t.get("homeAway") == "away":
-                    away_team = t
-            if not home_team or not away_team:
-                continue
-            def extract_team(t):
-                team_data = t.get("team", {})
-                abbr = team_data.get("abbreviation", "???")
-                name = team_data.get("displayName", abbr)
-                short = team_data.get("shortDisplayName", name)
-                logo = team_data.get("logo", "")
-                color = team_data.get("color", "555555")
-                if color and not color.startswith("#"):
-                    color = "#" + color
-                score = int(t.get("score", 0))
-                record = "0-0"
-                for rec in t.get("records", []):
-                    if rec.get("type") == "total":
-                        record = rec.get("summary", "0-0")
-                        break
-                rank = 99
-                if t.get("curatedRank", {}).get("current", 99) < 99:
-                    rank = t["curatedRank"]["current"]
-                team_id = str(team_data.get("id", ""))
-                return abbr, name, short, logo, color, score, record, rank, team_id
-            h_abbr, h_name, h_short, h_logo, h_color, h_score, h_record, h_rank, h_id = extract_team(home_team)
-            a_abbr, a_name, a_short, a_logo, a_color, a_score, a_record, a_rank, a_id = extract_team(away_team)
-            odds_data = comp.get("odds", [{}])
-            home_ml = 0
-            away_ml = 0
-            spread_val = 0
-            ou_val = 0
-            if odds_data and len(odds_data) > 0:
-                od = odds_data[0]
-                home_ml = od.get("homeTeamOdds", {}).get("moneyLine", 0) or 0
-                away_ml = od.get("awayTeamOdds", {}).get("moneyLine", 0) or 0
-                spread_val = od.get("spread", 0) or 0
-                ou_val = od.get("overUnder", 0) or 0
-            linescores_home = []
-            for ls in home_team.get("linescores", []):
-                linescores_home.append(int(ls.get("value", 0)))
-            linescores_away = []
-            for ls in away_team.get("linescores", []):
-                linescores_away.append(int(ls.get("value", 0)))
-            game_id = evt.get("id", "")
-            game = {
-                "game_id": game_id,
-                "state": state,
-                "detail": detail,
-                "period": period,
-                "clock": clock,
-                "home_abbr": h_abbr,
-                "home_name": h_name,
-                "home_short": h_short,
-                "home_logo": h_logo,
-                "home_color": h_color,
-                "home_score": h_score,
-                "home_record": h_record,
-                "home_rank": h_rank,
-                "away_abbr": a_abbr,
-                "away_name": a_name,
-                "away_short": a_short,
-                "away_logo": a_logo,
-                "away_color": a_color,
-                "away_score": a_score,
-                "away_record": a_record,
-                "away_rank": a_rank,
-                "home_ml": home_ml,
-                "away_ml": away_ml,
-                "spread": spread_val,
-                "over_under": ou_val,
-                "linescores_home": linescores_home,
-                "linescores_away": linescores_away,
-                "home_id": h_id,
-                "away_id": a_id,
-            }
-            games.append(game)
-        except:
-            continue
-    return games
 
-@st.cache_data(ttl=300)
 def fetch_game_summary(game_id):
-    url = f"https://site.api.espn.com/apis/site/v2/sports/basketball/womens-college-basketball/summary?event={game_id}"
-    try:
-        r = requests.get(url, timeout=10)
-        return r.json()
-    except:
-        return {}
+    return espn_summary.get_summary("ncaaw", game_id) or {}
 
-@st.cache_data(ttl=20)
 def fetch_espn_win_prob(game_id):
-    url = f"https://site.api.espn.com/apis/site/v2/sports/basketball/womens-college-basketball/summary?event={game_id}"
-    try:
-        r = requests.get(url, timeout=10)
-        data = r.json()
-        wp_list = data.get("winprobability", [])
-        if wp_list:
-            last = wp_list[-1]
-            return last.get("homeWinPercentage", 0.5)
-        return 0.5
-    except:
-        return 0.5
+    wp = espn_summary.get_win_prob("ncaaw", game_id)
+    return wp / 100 if wp is not None else 0.5
 
 def parse_predictor(summary):
     try:
@@ -353,7 +242,7 @@ def fetch_injuries():
     injuries = {}
     try:
         url = "https://site.api.espn.com/apis/site/v2/sports/basketball/womens-college-basketball/injuries"
-        r = requests.get(url, timeout=10)
+        r = http_client.get(url, timeout=10)
         data = r.json()
         for team_entry in data.get("items", []):
             team_ref = team_entry.get("team", {})
@@ -375,9 +264,7 @@ def fetch_yesterday_teams():
     try:
         yesterday = now - timedelta(days=1)
         ystr = yesterday.strftime("%Y%m%d")
-        url = f"https://site.api.espn.com/apis/site/v2/sports/basketball/womens-college-basketball/scoreboard?dates={ystr}&limit=200&groups=50"
-        r = requests.get(url, timeout=10)
-        data = r.json()
+        data = snapshot_store.get_json(feeds.scoreboard_url("ncaaw", ystr), feeds.RESULTS_MAX_AGE)
         for evt in data.get("events", []):
             comp = evt.get("competitions", [{}])[0]
             for t in comp.get("competitors", []):
@@ -388,21 +275,8 @@ def fetch_yesterday_teams():
         pass
     return b2b
 
-@st.cache_data(ttl=30)
 def fetch_plays(game_id):
-    url = f"https://site.api.espn.com/apis/site/v2/sports/basketball/womens-college-basketball/summary?event={game_id}"
-    try:
-        r = requests.get(url, timeout=10)
-        data = r.json()
-        plays = []
-        for play_grp in data.get("plays", []):
-            if isinstance(play_grp, dict):
-                plays.append(play_grp)
-            elif isinstance(play_grp, list):
-                plays.extend(play_grp)
-        return plays
-    except:
-        return []
+    return espn_summary.get_flat_plays("ncaaw", game_id)
 
 # ============================================================
 # KALSHI DATA FETCHERS (PUBLIC, NO AUTH)
@@ -411,34 +285,23 @@ def fetch_plays(game_id):
 def fetch_kalshi_ml():
     out = {}
     try:
-        cursor = None
-        while True:
-            url = "https://api.elections.kalshi.com/trade-api/v2/markets?series_ticker=KXNCAAWBGAME&status=open&limit=200"
-            if cursor:
-                url += f"&cursor={cursor}"
-            r = requests.get(url, timeout=10)
-            data = r.json()
-            markets = data.get("markets", [])
-            for m in markets:
-                ticker = m.get("ticker", "")
-                title = m.get("title", "")
-                yes_ask = m.get("yes_ask", 0)
-                no_ask = m.get("no_ask", 0)
-                yes_bid = m.get("yes_bid", 0)
-                no_bid = m.get("no_bid", 0)
-                volume = m.get("volume", 0)
-                out[ticker] = {
-                    "ticker": ticker,
-                    "title": title,
-                    "yes_ask": yes_ask,
-                    "no_ask": no_ask,
-                    "yes_bid": yes_bid,
-                    "no_bid": no_bid,
-                    "volume": volume,
-                }
-            cursor = data.get("cursor", None)
-            if not cursor or len(markets) < 200:
-                break
+        for m in kalshi_catalog.get_markets("KXNCAAWBGAME"):
+            ticker = m.get("ticker", "")
+            title = m.get("title", "")
+            yes_ask = m.get("yes_ask", 0)
+            no_ask = m.get("no_ask", 0)
+            yes_bid = m.get("yes_bid", 0)
+            no_bid = m.get("no_bid", 0)
+            volume = m.get("volume", 0)
+            out[ticker] = {
+                "ticker": ticker,
+                "title": title,
+                "yes_ask": yes_ask,
+                "no_ask": no_ask,
+                "yes_bid": yes_bid,
+                "no_bid": no_bid,
+                "volume": volume,
+            }
     except:
         pass
     return out
@@ -447,44 +310,38 @@ def fetch_kalshi_ml():
 def fetch_kalshi_spreads_raw():
     out = {}
     try:
-        cursor = None
-        while True:
-            url = "https://api.elections.kalshi.com/trade-api/v2/markets?series_ticker=KXNCAAWBSPREAD&status=open&limit=200"
-            if cursor:
-                url += f"&cursor={cursor}"
-            r = requests.get(url, timeout=10)
-            data = r.json()
-            markets = data.get("markets", [])
-            for m in markets:
-                ticker = m.get("ticker", "")
-                title = m.get("title", "")
-                subtitle = m.get("subtitle", "")
-                yes_ask = m.get("yes_ask", 0)
-                no_ask = m.get("no_ask", 0)
-                yes_bid = m.get("yes_bid", 0)
-                no_bid = m.get("no_bid", 0)
-                volume = m.get("volume", 0)
-                floor_val = m.get("floor_strike", None)
-                cap_val = m.get("cap_strike", None)
-                out[ticker] = {
-                    "ticker": ticker,
-                    "title": title,
-                    "subtitle": subtitle,
-                    "yes_ask": yes_ask,
-                    "no_ask": no_ask,
-                    "yes_bid": yes_bid,
-                    "no_bid": no_bid,
-                    "volume": volume,
-                    "floor": floor_val,
-                    "cap": cap_val,
-                }
-            cursor = data.get("cursor", None)
-            if not cursor or len(markets) < 200:
-                break
+        for m in kalshi_catalog.get_markets("KXNCAAWBSPREAD"):
+            ticker = m.get("ticker", "")
+            title = m.get("title", "")
+            subtitle = m.get("subtitle", "")
+            yes_ask = m.get("yes_ask", 0)
+            no_ask = m.get("no_ask", 0)
+            yes_bid = m.get("yes_bid", 0)
+            no_bid = m.get("no_bid", 0)
+            volume = m.get("volume", 0)
+            floor_val = m.get("floor_strike", None)
+            cap_val = m.get("cap_strike", None)
+            out[ticker] = {
+                "ticker": ticker,
+                "title": title,
+                "subtitle": subtitle,
+                "yes_ask": yes_ask,
+                "no_ask": no_ask,
+                "yes_bid": yes_bid,
+                "no_bid": no_bid,
+                "volume": volume,
+                "floor": floor_val,
+                "cap": cap_val,
+            }
     except:
         pass
     return out
 
+# One index per Kalshi fetch, shared by every rerun; title lookups are memoized per team
+@st.cache_resource(ttl=60)
+def fetch_kalshi_ml_index():
+    return kalshi_index.MarketIndex(fetch_kalshi_ml().values())
+
 def find_spread_markets_for_game(spread_dict, home_abbr, away_abbr, home_name="", away_name=""):
     matches = []
     search_terms = [home_abbr.upper(), away_abbr.upper()]
@@ -502,12 +359,8 @@ def find_spread_markets_for_game(spread_dict, home_abbr, away_abbr, home_name=""
             matches.append(m)
     return matches
 
-def find_ml_price_for_team(kalshi_ml_dict, team_abbr, team_name=""):
-    for ticker, m in kalshi_ml_dict.items():
-        title_up = m.get("title", "").upper()
-        if team_abbr.upper() in title_up or (team_name and team_name.upper() in title_up):
-            return m
-    return None
+def find_ml_price_for_team(ml_index, team_abbr, team_name=""):
+    return ml_index.first_in_title((team_abbr, team_name))
 
 # ============================================================
 # 9-FACTOR EDGE MODEL
@@ -785,7 +638,7 @@ def check_spread_sniper(game, spread_list, kalshi_ml_dict):
     relevant_spreads = find_spread_markets_for_game(
         {t: s for t, s in zip(spread_list.keys(), spread_list.values())},
         game.get("home_abbr", ""), game.get("away_abbr", ""),
-        game.get("home_name", ""), game.get("away_name", "")
+        game.get("home_full", ""), game.get("away_full", "")
     )
     best_snipe = None
     for sp in relevant_spreads:
@@ -821,7 +674,7 @@ def check_spread_sniper(game, spread_list, kalshi_ml_dict):
         st.session_state.ncaaw_sniper_alerts.append(alert)
         st.session_state.ncaaw_alerted_games.add(game_id)
 
-def check_comeback(game, kalshi_ml_dict):
+def check_comeback(game, ml_index):
     if game.get("state") != "in":
         return
     game_id = game.get("game_id", "")
@@ -861,7 +714,7 @@ def check_comeback(game, kalshi_ml_dict):
             tracked["peak_lead"] = lead
         comeback_amt = tracked["peak_lead"] - lead
         if comeback_amt >= 6 and game_id not in st.session_state.ncaaw_comeback_alerted:
-            trailer_ml = find_ml_price_for_team(kalshi_ml_dict, tracked["trailer_abbr"], tracked["trailer"])
+            trailer_ml = find_ml_price_for_team(ml_index, tracked["trailer_abbr"], tracked["trailer"])
             no_price = trailer_ml.get("no_ask", 0) if trailer_ml else 0
             alert = {
                 "game_id": game_id,
@@ -951,7 +804,7 @@ MOBILE_CSS = """
 # ============================================================
 def render_scoreboard(game):
     state = game.get("state", "pre")
-    detail = game.get("detail", "")
+    detail = game.get("short_detail", "")
     home_abbr = game.get("home_abbr", "???")
     away_abbr = game.get("away_abbr", "???")
     home_score = game.get("home_score", 0)
@@ -964,8 +817,8 @@ def render_scoreboard(game):
     away_rank = game.get("away_rank", 99)
     home_record = game.get("home_record", "0-0")
     away_record = game.get("away_record", "0-0")
-    ls_home = game.get("linescores_home", [])
-    ls_away = game.get("linescores_away", [])
+    ls_home = game.get("home_linescores", [])
+    ls_away = game.get("away_linescores", [])
 
     h_rank_badge = f'<span style="background:#FFD700;color:#000;padding:1px 6px;border-radius:8px;font-size:0.7rem;font-weight:700;margin-right:4px;">#{home_rank}</span>' if home_rank < 26 else ""
     a_rank_badge = f'<span style="background:#FFD700;color:#000;padding:1px 6px;border-radius:8px;font-size:0.7rem;font-weight:700;margin-right:4px;">#{away_rank}</span>' if away_rank < 26 else ""
@@ -1086,89 +939,8 @@ def get_play_icon(play_type, score_value):
     return "", ""
 
 # ============================================================
-# TIEBREAKER PANEL — Parse plays for turnovers per team/half
+# TIEBREAKER PANEL — Turnovers per team/half (aggregated in play_store)
 # ============================================================
-def calc_tiebreaker_stats(plays, home_abbr, away_abbr, home_name="", away_name="", home_id="", away_id=""):
-    stats = {
-        "home": {"name": home_abbr, "turnovers": 0, "steals": 0, "made_fg": 0, "missed_fg": 0, "rebounds": 0, "assists": 0, "by_half": {}},
-        "away": {"name": away_abbr, "turnovers": 0, "steals": 0, "made_fg": 0, "missed_fg": 0, "rebounds": 0, "assists": 0, "by_half": {}},
-    }
-    if not plays:
-        return stats
-    for p in plays:
-        if not isinstance(p, dict):
-            continue
-        text = p.get("text", "")
-        text_lower = text.lower()
-        period = p.get("period", {}).get("number", 0) if isinstance(p.get("period"), dict) else 0
-        if period == 0:
-            period = p.get("period", 0) if isinstance(p.get("period"), (int, float)) else 0
-        if period <= 0:
-            period = 1
-        if period <= 4:
-            half_key = f"Q{period}"
-        else:
-            half_key = f"OT{period - 4}"
-        side = None
-        # Method 1: Match by team ID from play object
-        team_obj = p.get("team", {})
-        if isinstance(team_obj, dict):
-            play_team_id = str(team_obj.get("id", ""))
-            if play_team_id and home_id and play_team_id == str(home_id):
-                side = "home"
-            elif play_team_id and away_id and play_team_id == str(away_id):
-                side = "away"
-        # Method 2: Match by homeAway field if present
-        if side is None:
-            home_away = p.get("homeAway", "")
-            if home_away == "home":
-                side = "home"
-            elif home_away == "away":
-                side = "away"
-        # Method 3: Text matching as fallback
-        if side is None:
-            home_matches = [home_abbr.lower()]
-            away_matches = [away_abbr.lower()]
-            if home_name:
-                home_matches.append(home_name.lower())
-                for part in home_name.lower().split():
-                    if len(part) > 3:
-                        home_matches.append(part)
-            if away_name:
-                away_matches.append(away_name.lower())
-                for part in away_name.lower().split():
-                    if len(part) > 3:
-                        away_matches.append(part)
-            is_home = any(m in text_lower for m in home_matches)
-            is_away = any(m in text_lower for m in away_matches)
-            if is_home and not is_away:
-                side = "home"
-            elif is_away and not is_home:
-                side = "away"
-        if side is None:
-            continue
-        if half_key not in stats[side]["by_half"]:
-            stats[side]["by_half"][half_key] = {"turnovers": 0, "steals": 0, "rebounds": 0, "assists": 0}
-        h = stats[side]["by_half"][half_key]
-        if "turnover" in text_lower:
-            stats[side]["turnovers"] += 1
-            h["turnovers"] += 1
-        if "steal" in text_lower:
-            other = "away" if side == "home" else "home"
-            stats[other]["steals"] += 1
-            if half_key not in stats[other]["by_half"]:
-                stats[other]["by_half"][half_key] = {"turnovers": 0, "steals": 0, "rebounds": 0, "assists": 0}
-            stats[other]["by_half"][half_key]["steals"] += 1
-        if "made" in text_lower:
-            stats[side]["made_fg"] += 1
-        if "rebound" in text_lower:
-            stats[side]["rebounds"] += 1
-            h["rebounds"] += 1
-        if "assist" in text_lower:
-            stats[side]["assists"] += 1
-            h["assists"] += 1
-    return stats
-
 def render_tiebreaker_panel(stats, home_abbr, away_abbr):
     home = stats["home"]
     away = stats["away"]
@@ -1244,7 +1016,7 @@ def render_tiebreaker_panel(stats, home_abbr, away_abbr):
 
 # --- Fetch All Data ---
 games = fetch_espn_games()
-kalshi_ml_data = fetch_kalshi_ml()
+kalshi_ml_index = fetch_kalshi_ml_index()
 injuries = fetch_injuries()
 b2b_teams = fetch_yesterday_teams()
 
@@ -1252,10 +1024,11 @@ b2b_teams = fetch_yesterday_teams()
 live_games = [g for g in games if g.get('state') == 'in']
 scheduled_games = [g for g in games if g.get('state') == 'pre']
 final_games = [g for g in games if g.get('state') == 'post']
+summary_prefetch = espn_summary.prefetch_summaries("ncaaw", [g.get('game_id', '') for g in games if g.get('state') != 'post'])
 
 # --- Run Comeback Checks on Live Games ---
 for g in live_games:
-    check_comeback(g, kalshi_ml_data)
+    check_comeback(g, kalshi_ml_index)
 
 # --- Inject CSS ---
 st.markdown(MOBILE_CSS, unsafe_allow_html=True)
@@ -1333,6 +1106,7 @@ tab_edge, tab_live, tab_cushion, tab_shark = st.tabs(["Edge Finder", "Live Monit
 with tab_edge:
     st.markdown("### 🎯 Pre-Game 9-Factor Edge Model")
     st.caption("Analyzes record gap, ranking gap, home court, B2B, moneyline, spread, injuries, ESPN predictor, and O/U context")
+    st.caption(espn_summary.format_prefetch_stats(summary_prefetch))
 
     # --- Section A: Strong + Moderate Edges ---
     pre_games = [g for g in games if g.get('state') == 'pre']
@@ -1377,7 +1151,7 @@ with tab_edge:
                         <div style="font-size:clamp(22px,5vw,32px);font-weight:900;color:{g_color};">{edge.get('grade','')}</div>
                     </div>
                     <div style="color:#aaa;font-size:clamp(11px,2.5vw,13px);margin:4px 0;">
-                        Edge: {edge.get('edge_pct',0):.0f}% | Fav: {edge.get('fav_label','')} | {g.get('detail','')}
+                        Edge: {edge.get('edge_pct',0):.0f}% | Fav: {edge.get('fav_label','')} | {g.get('short_detail','')}
                     </div>
                     <div style="margin-top:8px;">
                 """
@@ -1422,7 +1196,7 @@ with tab_edge:
                         <div style="font-size:clamp(22px,5vw,32px);font-weight:900;color:{g_color};">{edge.get('grade','')}</div>
                     </div>
                     <div style="color:#aaa;font-size:clamp(11px,2.5vw,13px);margin:4px 0;">
-                        Edge: {edge.get('edge_pct',0):.0f}% | Fav: {edge.get('fav_label','')} | {g.get('detail','')}
+                        Edge: {edge.get('edge_pct',0):.0f}% | Fav: {edge.get('fav_label','')} | {g.get('short_detail','')}
                     </div>
                 </div>
                 """
@@ -1445,8 +1219,8 @@ with tab_edge:
         away_imp = american_to_implied_prob(away_ml)
         if not home_imp or not away_imp:
             continue
-        home_kalshi = find_ml_price_for_team(kalshi_ml_data, g.get("home_abbr", ""), g.get("home_name", ""))
-        away_kalshi = find_ml_price_for_team(kalshi_ml_data, g.get("away_abbr", ""), g.get("away_name", ""))
+        home_kalshi = find_ml_price_for_team(kalshi_ml_index, g.get("home_abbr", ""), g.get("home_full", ""))
+        away_kalshi = find_ml_price_for_team(kalshi_ml_index, g.get("away_abbr", ""), g.get("away_full", ""))
 
         for side, vegas_imp, kalshi_m, abbr in [
             ("home", home_imp, home_kalshi, g.get("home_abbr", "")),
@@ -1561,7 +1335,7 @@ with tab_edge:
             elif state == "post":
                 badge = "✅ FINAL"
             else:
-                badge = f"🕐 {g.get('detail', 'Scheduled')}"
+                badge = f"🕐 {g.get('short_detail', 'Scheduled')}"
             row_html = f"""
             <div style="max-width:100%;box-sizing:border-box;background:#111;border-radius:8px;padding:8px 12px;margin:4px 0;display:flex;justify-content:space-between;align-items:center;flex-wrap:wrap;">
                 <div style="font-size:clamp(12px,3vw,15px);">
@@ -1644,7 +1418,7 @@ with tab_live:
                     abbr = g.get(f"{side}_abbr", "")
                     ml_val = g.get(f"{side}_ml", 0)
                     vegas_imp = american_to_implied_prob(ml_val)
-                    kalshi_m = find_ml_price_for_team(kalshi_ml_data, abbr, g.get(f"{side}_name", ""))
+                    kalshi_m = find_ml_price_for_team(kalshi_ml_index, abbr, g.get(f"{side}_full", ""))
                     if vegas_imp and kalshi_m:
                         yes_ask = kalshi_m.get("yes_ask", 0)
                         if yes_ask > 0:
@@ -1671,7 +1445,7 @@ with tab_live:
             lead = abs(g.get("home_score", 0) - g.get("away_score", 0))
             mins_el_tb = calc_minutes_elapsed(g.get("period", 0), g.get("clock", "0:00"))
             if lead <= 5 and mins_el_tb >= 4:
-                tb_stats = calc_tiebreaker_stats(plays, g.get("home_abbr", ""), g.get("away_abbr", ""), g.get("home_name", ""), g.get("away_name", ""), g.get("home_id", ""), g.get("away_id", ""))
+                tb_stats = play_store.tiebreaker_stats("ncaaw", g.get("game_id", ""), g.get("home_id", ""), g.get("away_id", ""), [g.get("home_abbr", ""), g.get("home_full", "")], [g.get("away_abbr", ""), g.get("away_full", "")])
                 tb_html = render_tiebreaker_panel(tb_stats, g.get("home_abbr", ""), g.get("away_abbr", ""))
                 st.markdown(tb_html, unsafe_allow_html=True)
 
@@ -1735,7 +1509,7 @@ with tab_cushion:
             clock = g.get("clock", "0:00")
             p_label = f"Q{period}" if period <= 4 else f"OT{period - 4}"
 
-            trailer_ml = find_ml_price_for_team(kalshi_ml_data, trailer, g.get("away_name" if home_leading else "home_name", ""))
+            trailer_ml = find_ml_price_for_team(kalshi_ml_index, trailer, g.get("away_full" if home_leading else "home_full", ""))
             trailer_yes = trailer_ml.get("yes_ask", 0) if trailer_ml else 0
             trailer_no = trailer_ml.get("no_ask", 0) if trailer_ml else 0
 
@@ -1838,7 +1612,7 @@ with tab_shark:
             clock = g.get("clock", "0:00")
             p_label = f"Q{period}" if period <= 4 else f"OT{period - 4}"
 
-            trailer_ml = find_ml_price_for_team(kalshi_ml_data, trailer_abbr, g.get("away_name" if home_leading else "home_name", ""))
+            trailer_ml = find_ml_price_for_team(kalshi_ml_index, trailer_abbr, g.get("away_full" if home_leading else "home_full", ""))
             trailer_yes = trailer_ml.get("yes_ask", 0) if trailer_ml else 0
             trailer_no = trailer_ml.get("no_ask", 0) if trailer_ml else 0
 
@@ -28,12 +28,13 @@ def send_ga4_event(page_title, page_path):
 
 send_ga4_event("NFL Edge Finder", "/NFL")
 
-import requests
 import json
 import os
-from datetime import datetime, timedelta
+from datetime import datetime
 import pytz
 import streamlit.components.v1 as components
+import espn_summary, feeds, http_client, snapshot_store
+import games as games_store
 
 def speak_play(text):
     """Browser text-to-speech for play-by-play"""
@@ -363,188 +364,28 @@ def render_football_field(ball_yard, down, distance, possession_team, away_team,
 # ============================================================
 # FETCH FUNCTIONS
 # ============================================================
-@st.cache_data(ttl=30)
 def fetch_games():
     """Fetch games - NO date filter so it catches Super Bowl / playoffs / any live game"""
-    urls = [
-        "https://site.api.espn.com/apis/site/v2/sports/football/nfl/scoreboard",
-    ]
     today_str = datetime.now(eastern).strftime('%Y%m%d')
-    urls.append("https://site.api.espn.com/apis/site/v2/sports/football/nfl/scoreboard?dates=" + today_str)
-
-    all_event_ids = set()
-    games = []
-
-    for url in urls:
-        try:
-            resp = requests.get(url, timeout=10)
-            data = resp.json()
-            for event in data.get("events", []):
-                eid = event.get("id", "")
-                if eid in all_event_ids:
-                    continue
-                all_event_ids.add(eid)
-
-                comp = event.get("competitions", [{}])[0]
-                competitors = comp.get("competitors", [])
-                if len(competitors) < 2:
-                    continue
-
-                home_team, away_team = None, None
-                home_score, away_score = 0, 0
-                home_abbrev, away_abbrev = "", ""
-
-                for c in competitors:
-                    full_name = c.get("team", {}).get("displayName", "")
-                    abbr = TEAM_ABBREVS.get(full_name, c.get("team", {}).get("abbreviation", ""))
-                    espn_abbr = c.get("team", {}).get("abbreviation", "")
-                    score = int(c.get("score", 0) or 0)
-                    if c.get("homeAway") == "home":
-                        home_team = abbr
-                        home_score = score
-                        home_abbrev = espn_abbr
-                    else:
-                        away_team = abbr
-                        away_score = score
-                        away_abbrev = espn_abbr
-
-                status = event.get("status", {}).get("type", {}).get("name", "STATUS_SCHEDULED")
-                period = event.get("status", {}).get("period", 0)
-                clock = event.get("status", {}).get("displayClock", "")
-                detail = event.get("status", {}).get("type", {}).get("detail", "")
-
-                game_date_str = event.get("date", "")
-                game_date = None
-                if game_date_str:
-                    try:
-                        game_date = datetime.fromisoformat(game_date_str.replace("Z", "+00:00")).astimezone(eastern)
-                    except:
-                        pass
-
-                situation = comp.get("situation", {})
-                poss_team_id = situation.get("possession", "")
-                down = situation.get("down", 0)
-                distance = situation.get("distance", 0)
-                yard_line = situation.get("yardLine", 50)
-                yards_to_endzone = situation.get("yardsToEndzone", 50)
-                is_red_zone = situation.get("isRedZone", False)
-                poss_text = situation.get("possessionText", "")
-                last_play = situation.get("lastPlay", {})
-
-                possession_team = None
-                is_home_possession = None
-                for c in competitors:
-                    if c.get("team", {}).get("id") == poss_team_id:
-                        poss_full = c.get("team", {}).get("displayName", "")
-                        possession_team = TEAM_ABBREVS.get(poss_full, c.get("team", {}).get("abbreviation", ""))
-                        is_home_possession = c.get("homeAway") == "home"
-                        break
-
-                minutes_played = 0
-                if period > 0:
-                    completed_quarters = (period - 1) * 15
-                    if clock:
-                        try:
-                            parts = clock.split(":")
-                            mins_left = int(parts[0])
-                            minutes_played = completed_quarters + (15 - mins_left)
-                        except:
-                            minutes_played = completed_quarters
-
-                # Halftime detection
-                is_halftime = "halftime" in detail.lower() or (period == 2 and clock == "0:00")
-
-                games.append({
-                    "event_id": eid,
-                    "away": away_team, "home": home_team,
-                    "away_abbrev": away_abbrev, "home_abbrev": home_abbrev,
-                    "away_score": away_score, "home_score": home_score,
-                    "status": status, "period": period, "clock": clock,
-                    "detail": detail, "is_halftime": is_halftime,
-                    "minutes_played": minutes_played,
-                    "total_score": home_score + away_score,
-                    "game_date": game_date,
-                    "possession_team": possession_team,
-                    "is_home_possession": is_home_possession,
-                    "down": down, "distance": distance,
-                    "yard_line": yard_line, "yards_to_endzone": yards_to_endzone,
-                    "is_red_zone": is_red_zone, "poss_text": poss_text,
-                    "last_play": last_play
-                })
-        except Exception as e:
-            st.error("ESPN fetch error: " + str(e))
+    games, errors = games_store.get_games_multi("nfl", [None, today_str], codes=TEAM_ABBREVS)
+    for err in errors:
+        st.error("ESPN fetch error: " + err)
 
     if not games:
-        for days_ahead in range(1, 8):
-            future_date = (datetime.now(eastern) + timedelta(days=days_ahead)).strftime('%Y%m%d')
-            url2 = "https://site.api.espn.com/apis/site/v2/sports/football/nfl/scoreboard?dates=" + future_date
-            try:
-                resp2 = requests.get(url2, timeout=5)
-                data2 = resp2.json()
-                if data2.get("events"):
-                    for event in data2.get("events", []):
-                        comp = event.get("competitions", [{}])[0]
-                        competitors = comp.get("competitors", [])
-                        if len(competitors) < 2:
-                            continue
-                        home_team, away_team = None, None
-                        home_score, away_score = 0, 0
-                        home_abbrev, away_abbrev = "", ""
-                        for c in competitors:
-                            full_name = c.get("team", {}).get("displayName", "")
-                            abbr = TEAM_ABBREVS.get(full_name, c.get("team", {}).get("abbreviation", ""))
-                            espn_abbr = c.get("team", {}).get("abbreviation", "")
-                            score = int(c.get("score", 0) or 0)
-                            if c.get("homeAway") == "home":
-                                home_team = abbr
-                                home_score = score
-                                home_abbrev = espn_abbr
-                            else:
-                                away_team = abbr
-                                away_score = score
-                                away_abbrev = espn_abbr
-                        status = event.get("status", {}).get("type", {}).get("name", "STATUS_SCHEDULED")
-                        period = event.get("status", {}).get("period", 0)
-                        clock = event.get("status", {}).get("displayClock", "")
-                        detail = event.get("status", {}).get("type", {}).get("detail", "")
-                        game_date_str = event.get("date", "")
-                        game_date = None
-                        if game_date_str:
-                            try:
-                                game_date = datetime.fromisoformat(game_date_str.replace("Z", "+00:00")).astimezone(eastern)
-                            except:
-                                pass
-                        games.append({
-                            "event_id": event.get("id", ""),
-                            "away": away_team, "home": home_team,
-                            "away_abbrev": away_abbrev, "home_abbrev": home_abbrev,
-                            "away_score": away_score, "home_score": home_score,
-                            "status": status, "period": period, "clock": clock,
-                            "detail": detail, "is_halftime": False,
-                            "minutes_played": 0, "total_score": 0,
-                            "game_date": game_date,
-                            "possession_team": None, "is_home_possession": None,
-                            "down": 0, "distance": 0,
-                            "yard_line": 50, "yards_to_endzone": 50,
-                            "is_red_zone": False, "poss_text": "",
-                            "last_play": {}
-                        })
-                    break
-            except:
-                continue
+        # Next game day from one week-long date-range board
+        try: games = games_store.first_day(games_store.get_schedule("nfl", days=7, codes=TEAM_ABBREVS, timeout=5))
+        except: games = []
     return games
 
-@st.cache_data(ttl=30)
 def fetch_play_by_play(event_id):
     """Fetch last plays from ESPN summary endpoint"""
     if not event_id:
         return []
-    url = "https://site.api.espn.com/apis/site/v2/sports/football/nfl/summary?event=" + str(event_id)
     try:
-        resp = requests.get(url, timeout=10)
-        data = resp.json()
+        data = espn_summary.get_summary("nfl", event_id) or {}
         plays = []
-        drives = data.get("drives", {}).get("previous", [])
+        # Copy: the summary is shared with other sessions and must not be mutated
+        drives = list(data.get("drives", {}).get("previous", []))
         current = data.get("drives", {}).get("current", {})
         if current:
             drives.append(current)
@@ -569,7 +410,7 @@ def fetch_play_by_play(event_id):
 def fetch_injuries():
     url = "https://site.api.espn.com/apis/site/v2/sports/football/nfl/injuries"
     try:
-        resp = requests.get(url, timeout=10)
+        resp = http_client.get(url, timeout=10)
         data = resp.json()
         injuries = {}
         for team_data in data.get("injuries", []):
@@ -594,7 +435,7 @@ def fetch_injuries():
 def fetch_nfl_news():
     url = "https://site.api.espn.com/apis/site/v2/sports/football/nfl/news?limit=10"
     try:
-        resp = requests.get(url, timeout=10)
+        resp = http_client.get(url, timeout=10)
         data = resp.json()
         articles = []
         for article in data.get("articles", []):
@@ -907,7 +748,7 @@ if live_games:
                 yards_to_endzone=g.get('yards_to_endzone'), is_home_possession=g.get('is_home_possession'),
                 last_play=g.get('last_play'), period=g['period'], clock=g['clock'],
                 home_team=g['home'], away_team=g['away'], game_key=game_key,
-                home_abbrev=g.get('home_abbrev', g['home']), away_abbrev=g.get('away_abbrev', g['away'])
+                home_abbrev=g.get('home_abbr', g['home']), away_abbrev=g.get('away_abbr', g['away'])
             )
             field_html = render_football_field(
                 ball_yard=ball_yard, down=g.get('down'), distance=g.get('distance'),
@@ -928,7 +769,7 @@ if live_games:
         with col_plays:
             st.markdown("**📋 Last 10 Plays**")
             tts_on = st.checkbox("🔊 Announce plays", key="tts_" + game_key)
-            plays = fetch_play_by_play(g.get('event_id'))
+            plays = fetch_play_by_play(g.get('game_id'))
             if plays:
                 for idx, play in enumerate(reversed(plays)):
                     icon, color = get_play_icon(play.get('text', ''))
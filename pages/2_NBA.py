@@ -5,9 +5,12 @@ st.set_page_config(page_title="BigSnapshot NBA Edge Finder", page_icon="🏀", l
 from auth import require_auth
 require_auth()
 st_autorefresh(interval=24000, key="datarefresh")
-import uuid, re, requests, pytz
+import uuid, re, pytz
 import requests as req_ga
 from datetime import datetime, timedelta
+import espn_summary, feeds, http_client, snapshot_store
+import games as games_store
+import kalshi_catalog, kalshi_depth, kalshi_index, kalshi_stream, play_store, team_matcher
 
 def send_ga4_event(pt, pp):
     try:
@@ -19,12 +22,20 @@ send_ga4_event("BigSnapshot NBA Edge Finder", "/NBA")
 eastern = pytz.timezone("US/Eastern")
 now = datetime.now(eastern)
 VERSION = "12.1"
+try:
+    # Only needed to open the live Kalshi price stream; pages fall back to REST without them
+    KALSHI_API_KEY = st.secrets.get("KALSHI_API_KEY", "")
+    KALSHI_PRIVATE_KEY = st.secrets.get("KALSHI_PRIVATE_KEY", "")
+except:
+    KALSHI_API_KEY, KALSHI_PRIVATE_KEY = "", ""
 LEAGUE_AVG_TOTAL = 225
 THRESHOLDS = [210.5, 215.5, 220.5, 225.5, 230.5, 235.5, 240.5, 245.5]
 HOME_COURT_ADV = 3.0
 MIN_UNDERDOG_LEAD = 7
 MIN_SPREAD_BRACKET = 10
 MAX_NO_PRICE = 85
+# Contract count the sniper prices against the order book
+SNIPER_CONTRACTS = 10
 MIN_WP_EDGE = 8
 LEAD_BY_QUARTER = {1: 7, 2: 8, 3: 10, 4: 13}
 
@@ -160,92 +171,17 @@ def remove_position(pid):
 # === END PART A ===
 # ── PART B: DATA FETCH + ALERT FUNCTIONS ──
 
-@st.cache_data(ttl=30)
 def fetch_espn_games():
     try:
         today = datetime.now(eastern).strftime("%Y%m%d")
-        url = "https://site.api.espn.com/apis/site/v2/sports/basketball/nba/scoreboard?dates=" + today
-        data = requests.get(url, timeout=10).json()
-        games = []
-        for event in data.get("events", []):
-            comp = event["competitions"][0]
-            teams = comp["competitors"]
-            away_team = teams[1] if teams[0].get("homeAway") == "home" else teams[0]
-            home_team = teams[0] if teams[0].get("homeAway") == "home" else teams[1]
-            away_full = away_team["team"].get("displayName", "")
-            home_full = home_team["team"].get("displayName", "")
-            away = TEAM_ABBREVS.get(away_full, TEAM_ABBREVS.get(away_team["team"].get("abbreviation", ""), away_full))
-            home = TEAM_ABBREVS.get(home_full, TEAM_ABBREVS.get(home_team["team"].get("abbreviation", ""), home_full))
-            away_score = int(away_team.get("score", 0) or 0)
-            home_score = int(home_team.get("score", 0) or 0)
-            away_rec = away_team.get("records", [{}])[0].get("summary", "0-0") if away_team.get("records") else "0-0"
-            home_rec = home_team.get("records", [{}])[0].get("summary", "0-0") if home_team.get("records") else "0-0"
-            status_obj = event.get("status", {})
-            status_type = status_obj.get("type", {})
-            state = status_type.get("state", "pre")
-            status = status_type.get("name", "STATUS_SCHEDULED")
-            period = status_obj.get("period", 0)
-            clock_str = status_obj.get("displayClock", "0:00")
-            minutes_played = 0
-            if state == "in":
-                completed_periods = max(0, period - 1)
-                completed_mins = 0
-                for p in range(1, completed_periods + 1):
-                    completed_mins += 12 if p <= 4 else 5
-                try:
-                    cparts = clock_str.replace(" ", "").split(":")
-                    remaining = float(cparts[0]) + float(cparts[1]) / 60 if len(cparts) == 2 else float(cparts[0])
-                except: remaining = 0
-                current_period_length = 12 if period <= 4 else 5
-                minutes_played = completed_mins + (current_period_length - remaining)
-            elif state == "post": minutes_played = 48
-            total_score = away_score + home_score
-            vegas = {}
-            home_ml = 0
-            try:
-                odds_list = comp.get("odds", [])
-                if odds_list:
-                    o = odds_list[0]
-                    vegas = {"spread": o.get("details", ""), "overUnder": o.get("overUnder", 0), "homeML": o.get("homeTeamOdds", {}).get("moneyLine", 0), "awayML": o.get("awayTeamOdds", {}).get("moneyLine", 0)}
-                    home_ml = vegas.get("homeML", 0) or 0
-            except: pass
-            gt_raw = event.get("date", "")
-            try:
-                gt_dt = datetime.strptime(gt_raw, "%Y-%m-%dT%H:%MZ").replace(tzinfo=pytz.utc).astimezone(eastern)
-                game_time = gt_dt.strftime("%-I:%M %p ET")
-                game_datetime = gt_dt.strftime("%Y-%m-%d %H:%M")
-            except: game_time, game_datetime = "", ""
-            games.append({"away": away, "home": home, "away_score": away_score, "home_score": home_score,
-                "away_record": away_rec, "home_record": home_rec,
-                "away_id": away_team["team"].get("id", ""), "home_id": home_team["team"].get("id", ""),
-                "away_abbrev": away_team["team"].get("abbreviation", ""), "home_abbrev": home_team["team"].get("abbreviation", ""),
-                "away_full": away_full, "home_full": home_full, "status": status, "state": state,
-                "period": period, "clock": clock_str, "minutes_played": minutes_played, "total_score": total_score,
-                "game_id": event.get("id", ""), "vegas_odds": vegas, "home_ml": home_ml,
-                "game_time": game_time, "game_datetime": game_datetime})
-        return games
+        return games_store.get_games("nba", today, codes=TEAM_ABBREVS)
     except: return []
 
-@st.cache_data(ttl=300)
 def fetch_game_summary(game_id):
-    try:
-        url = "https://site.api.espn.com/apis/site/v2/sports/basketball/nba/summary?event=" + str(game_id)
-        return requests.get(url, timeout=10).json()
-    except: return None
+    return espn_summary.get_summary("nba", game_id)
 
-@st.cache_data(ttl=20)
 def fetch_espn_win_prob(game_id):
-    try:
-        url = "https://site.api.espn.com/apis/site/v2/sports/basketball/nba/summary?event=" + str(game_id)
-        data = requests.get(url, timeout=10).json()
-        try:
-            wp = data["winprobability"]
-            if wp: return wp[-1]["homeWinPercentage"] * 100
-        except: pass
-        try: return float(data["predictor"]["homeTeam"]["gameProjection"])
-        except: pass
-    except: pass
-    return None
+    return espn_summary.get_win_prob("nba", game_id)
 
 def parse_predictor(summary):
     try:
@@ -292,7 +228,7 @@ def fetch_injuries():
     injuries = {}
     try:
         url = "https://site.api.espn.com/apis/site/v2/sports/basketball/nba/injuries"
-        data = requests.get(url, timeout=10).json()
+        data = http_client.get(url, timeout=10).json()
         for tb in data.get("items", []):
             tn = TEAM_ABBREVS.get(tb.get("team", {}).get("displayName", ""), tb.get("team", {}).get("displayName", ""))
             ti = []
@@ -306,8 +242,7 @@ def fetch_injuries():
 def fetch_yesterday_teams():
     try:
         yesterday = (datetime.now(eastern) - timedelta(days=1)).strftime("%Y%m%d")
-        url = "https://site.api.espn.com/apis/site/v2/sports/basketball/nba/scoreboard?dates=" + yesterday
-        data = requests.get(url, timeout=10).json()
+        data = snapshot_store.get_json(feeds.scoreboard_url("nba", yesterday), feeds.RESULTS_MAX_AGE)
         teams = set()
         for event in data.get("events", []):
             for comp in event.get("competitions", []):
@@ -317,33 +252,14 @@ def fetch_yesterday_teams():
         return teams
     except: return set()
 
-@st.cache_data(ttl=30)
 def fetch_plays(game_id):
-    try:
-        url = "https://site.api.espn.com/apis/site/v2/sports/basketball/nba/summary?event=" + str(game_id)
-        data = requests.get(url, timeout=10).json()
-        plays_raw = []
-        for drive in data.get("plays", []):
-            if isinstance(drive, dict): plays_raw.append(drive)
-            elif isinstance(drive, list): plays_raw.extend(drive)
-        plays_raw = plays_raw[-15:]
-        result = []
-        for p in plays_raw[-10:]:
-            period = p.get("period", {}).get("number", 0) if isinstance(p.get("period"), dict) else p.get("period", 0)
-            clock = p.get("clock", {}).get("displayValue", "") if isinstance(p.get("clock"), dict) else p.get("clock", "")
-            play_type = p.get("type", {}).get("text", "") if isinstance(p.get("type"), dict) else ""
-            team_id = str(p["team"].get("id", "")) if p.get("team") else ""
-            result.append({"text": p.get("text", ""), "period": period, "clock": clock, "score_value": p.get("scoreValue", 0), "play_type": play_type, "team_id": team_id})
-        return result
-    except: return []
+    return espn_summary.get_recent_plays("nba", game_id, 10)
 
 @st.cache_data(ttl=60)
 def fetch_kalshi_ml():
     try:
-        url = "https://api.elections.kalshi.com/trade-api/v2/markets?series_ticker=KXNBAGAME&limit=100&status=open"
-        data = requests.get(url, timeout=10).json()
         result = {}
-        for m in data.get("markets", []):
+        for m in kalshi_catalog.get_markets("KXNBAGAME"):
             ticker = m.get("ticker", "")
             title = m.get("title", "")
             yes_bid = m.get("yes_bid", 0) or 0
@@ -374,9 +290,7 @@ def fetch_kalshi_ml():
 def fetch_kalshi_spreads_raw():
     spreads, spread_list = {}, []
     try:
-        url = "https://api.elections.kalshi.com/trade-api/v2/markets?series_ticker=KXNBASPREAD&limit=200&status=open"
-        data = requests.get(url, timeout=10).json()
-        for m in data.get("markets", []):
+        for m in kalshi_catalog.get_markets("KXNBASPREAD"):
             ticker = m.get("ticker", "")
             title = (m.get("title", "") or "").lower()
             subtitle = (m.get("subtitle", "") or "").lower()
@@ -393,51 +307,45 @@ def fetch_kalshi_spreads_raw():
     except: pass
     return spreads, spread_list
 
-def find_spread_markets_for_game(ha, aa, hn, an, spread_list):
+# Parsed once per Kalshi fetch and shared by every rerun (cache_resource returns the same object)
+@st.cache_resource(ttl=60)
+def fetch_kalshi_spread_index():
+    return kalshi_index.MarketIndex(fetch_kalshi_spreads_raw()[1], kalshi_index.parse_spread_value)
+
+def apply_live_ml(kalshi_ml_data, games_live):
+    """Swap REST prices for websocket top-of-book on the ML markets of in-progress games"""
+    keys = [g.get('away', '') + "@" + g.get('home', '') for g in games_live]
+    tickers = [kalshi_ml_data[k]['ticker'] for k in keys if k in kalshi_ml_data]
+    live = kalshi_stream.live_price(tickers, KALSHI_API_KEY, KALSHI_PRIVATE_KEY)
+    for k in keys:
+        info = kalshi_ml_data.get(k)
+        if not info or info['ticker'] not in live: continue
+        yes_price = live[info['ticker']]
+        if info['yes_team_code'] == info['away_code']:
+            away_implied, home_implied = yes_price, 100 - yes_price
+        else:
+            home_implied, away_implied = yes_price, 100 - yes_price
+        kalshi_ml_data[k] = dict(info, yes_price=yes_price, away_implied=away_implied, home_implied=home_implied, live=True)
+    return kalshi_ml_data
+
+def find_spread_markets_for_game(ha, aa, hn, an, spread_index):
     matches = []
     ha_l, aa_l, hn_l, an_l = ha.lower(), aa.lower(), hn.lower(), an.lower()
-    for m in spread_list:
-        ticker = (m.get("ticker", "") or "").lower()
+    for m in spread_index.for_game(aa, ha, (ha, hn), (aa, an)):
+        spread_val = spread_index.spread_val(m)
+        if spread_val is None: continue
         title = (m.get("title", "") or "").lower()
-        subtitle = (m.get("subtitle", "") or "").lower()
-        combined = ticker + " " + title + " " + subtitle
-        if (ha_l in combined or hn_l in combined) and (aa_l in combined or an_l in combined):
-            spread_val = None
-            pat1 = re.search(r'(?:over|more than|by)\s+([\d.]+)', title)
-            if pat1: spread_val = float(pat1.group(1))
-            else:
-                pat2 = re.search(r'(\d+\.?\d*)\s*[-\u2013to]+\s*(\d+\.?\d*)', title)
-                if pat2: spread_val = (float(pat2.group(1)) + float(pat2.group(2))) / 2
-                else:
-                    pat3 = re.search(r'\b([1-9]\d?(?:\.\d+)?)\b', title)
-                    if pat3:
-                        v = float(pat3.group(1))
-                        if 1 <= v <= 50: spread_val = v
-            if spread_val is None: continue
-            yes_price = m.get("last_price", 0) or m.get("yes_bid", 0) or 0
-            no_ask = m.get("no_ask", 0)
-            no_price = no_ask if no_ask else (100 - yes_price if yes_price else 0)
-            team_side = None
-            if ha_l in title or hn_l in title: team_side = "home"
-            elif aa_l in title or an_l in title: team_side = "away"
-            matches.append({"ticker": m.get("ticker", ""), "title": m.get("title", ""), "spread_val": spread_val,
-                "yes_price": yes_price, "no_price": no_price, "no_ask": no_ask, "team_side": team_side})
-    matches.sort(key=lambda x: x["spread_val"], reverse=True)
+        yes_price = m.get("last_price", 0) or m.get("yes_bid", 0) or 0
+        no_ask = m.get("no_ask", 0)
+        no_price = no_ask if no_ask else (100 - yes_price if yes_price else 0)
+        team_side = None
+        if ha_l in title or hn_l in title: team_side = "home"
+        elif aa_l in title or an_l in title: team_side = "away"
+        matches.append({"ticker": m.get("ticker", ""), "title": m.get("title", ""), "spread_val": spread_val,
+            "yes_price": yes_price, "no_price": no_price, "no_ask": no_ask, "team_side": team_side})
     return matches
 
-def find_ml_price_for_team(ha, aa, fav_side, kalshi_ml_data):
-    ha_u, aa_u = ha.upper(), aa.upper()
-    for key, val in kalshi_ml_data.items():
-        tk = val.get("ticker", "").upper()
-        if ha_u in tk and aa_u in tk:
-            fav_code = ha_u if fav_side == "home" else aa_u
-            if tk.endswith(fav_code): return val.get("yes_price", None), val.get("ticker", None)
-            else:
-                yp = val.get("yes_price", 0)
-                return (100 - yp if yp else None), val.get("ticker", None)
-    return None, None
-
-def check_spread_sniper(g, spread_list, kalshi_ml_data):
+def check_spread_sniper(g, spread_index, kalshi_ml_data):
     away = g.get('away', '')
     home = g.get('home', '')
     away_score = g.get('away_score', 0)
@@ -486,7 +394,7 @@ def check_spread_sniper(g, spread_list, kalshi_ml_data):
         wp_edge = fav_wp - 50
     ha_code = KALSHI_CODES.get(home, home[:3].upper())
     aa_code = KALSHI_CODES.get(away, away[:3].upper())
-    spread_markets = find_spread_markets_for_game(ha_code, aa_code, home, away, spread_list)
+    spread_markets = find_spread_markets_for_game(ha_code, aa_code, home, away, spread_index)
     no_markets = len(spread_markets) == 0
     actionable = []
     for sm in spread_markets:
@@ -500,7 +408,14 @@ def check_spread_sniper(g, spread_list, kalshi_ml_data):
             continue
         sm['effective_no_price'] = effective_no
         actionable.append(sm)
-    actionable.sort(key=lambda x: x.get('effective_no_price', 999))
+    # Depth is fetched only for the brackets that passed the price filters
+    fills = kalshi_depth.estimate_fills([sm['ticker'] for sm in actionable], "no", SNIPER_CONTRACTS)
+    for sm in actionable:
+        fill = fills.get(sm['ticker'])
+        sm['fill'] = fill
+        if fill and fill['complete']: sm['fill_price'] = fill['avg_price']
+    # Brackets that fill SNIPER_CONTRACTS first (by fill price), then the rest by top of book
+    actionable.sort(key=lambda x: ('fill_price' not in x, x.get('fill_price', x.get('effective_no_price', 999))))
     st.session_state.alerted_games.add(game_id)
     return {
         'game': g, 'fav_name': fav_name, 'fav_abbrev': fav_abbrev,
@@ -677,15 +592,9 @@ def infer_possession(plays, away, home):
     text = (last.get("text", "") or "").lower()
     play_type = (last.get("play_type", "") or "").lower()
     team_id = str(last.get("team_id", ""))
-    acting_team = None
-    if team_id:
-        for name, eid in ESPN_TEAM_IDS.items():
-            if str(eid) == team_id: acting_team = name; break
-    if not acting_team:
-        hl, al = home.lower(), away.lower()
-        hc, ac = KALSHI_CODES.get(home, "").lower(), KALSHI_CODES.get(away, "").lower()
-        if hl in text or hc in text: acting_team = home
-        elif al in text or ac in text: acting_team = away
+    matcher = team_matcher.game_matcher(str(ESPN_TEAM_IDS.get(home, "")), str(ESPN_TEAM_IDS.get(away, "")), (home, KALSHI_CODES.get(home, "")), (away, KALSHI_CODES.get(away, "")), use_words=False)
+    side = matcher.attribute(team_id, text)
+    acting_team = home if side == "home" else (away if side == "away" else None)
     if not acting_team: return "UNKNOWN", None
     other = home if acting_team == away else away
     if any(w in play_type for w in ["made", "makes", "dunk", "layup"]) or any(w in text for w in ["makes", "made shot", "dunk", "layup"]): return other, "⬆️ " + other + " ball (after score)"
@@ -780,62 +689,6 @@ def get_play_icon(play_type, score_value):
     if "timeout" in pt: return ("TO", "#a855f7")
     return ("-", "#888")
 
-@st.cache_data(ttl=30)
-def fetch_all_plays(game_id):
-    try:
-        url = "https://site.api.espn.com/apis/site/v2/sports/basketball/nba/summary?event=" + str(game_id)
-        data = requests.get(url, timeout=10).json()
-        plays_raw = []
-        for drive in data.get("plays", []):
-            if isinstance(drive, dict): plays_raw.append(drive)
-            elif isinstance(drive, list): plays_raw.extend(drive)
-        return plays_raw
-    except: return []
-
-def calc_tiebreaker_stats(plays, home, away, home_id="", away_id=""):
-    home_data = {"name": home, "turnovers": 0, "steals": 0, "rebounds": 0, "assists": 0, "made_fg": 0, "by_quarter": {}}
-    away_data = {"name": away, "turnovers": 0, "steals": 0, "rebounds": 0, "assists": 0, "made_fg": 0, "by_quarter": {}}
-    home_lower, away_lower = home.lower(), away.lower()
-    home_code, away_code = KALSHI_CODES.get(home, "").lower(), KALSHI_CODES.get(away, "").lower()
-    home_words = [w.lower() for w in home.split() if len(w) > 3]
-    away_words = [w.lower() for w in away.split() if len(w) > 3]
-    for p in plays:
-        text = p.get("text", "") or ""
-        text_lower = text.lower()
-        period_raw = p.get("period", {})
-        period_num = period_raw.get("number", 0) if isinstance(period_raw, dict) else (period_raw or 0)
-        q_label = ("Q" + str(period_num)) if period_num <= 4 else ("OT" + str(period_num - 4))
-        play_team = None
-        espn_tid = str(p.get("team", {}).get("id", "")) if isinstance(p.get("team"), dict) else ""
-        ha_field = p.get("homeAway", "")
-        if espn_tid and home_id and espn_tid == str(home_id): play_team = "home"
-        elif espn_tid and away_id and espn_tid == str(away_id): play_team = "away"
-        elif ha_field == "home": play_team = "home"
-        elif ha_field == "away": play_team = "away"
-        else:
-            if home_lower in text_lower or home_code in text_lower: play_team = "home"
-            elif away_lower in text_lower or away_code in text_lower: play_team = "away"
-            else:
-                for hw in home_words:
-                    if hw in text_lower: play_team = "home"; break
-                if not play_team:
-                    for aw in away_words:
-                        if aw in text_lower: play_team = "away"; break
-        if not play_team: continue
-        acting = home_data if play_team == "home" else away_data
-        other = away_data if play_team == "home" else home_data
-        if q_label not in acting["by_quarter"]: acting["by_quarter"][q_label] = {"turnovers": 0, "steals": 0, "rebounds": 0, "assists": 0}
-        if q_label not in other["by_quarter"]: other["by_quarter"][q_label] = {"turnovers": 0, "steals": 0, "rebounds": 0, "assists": 0}
-        if "turnover" in text_lower:
-            acting["turnovers"] += 1; acting["by_quarter"][q_label]["turnovers"] += 1
-            other["steals"] += 1; other["by_quarter"][q_label]["steals"] += 1
-        elif "steal" in text_lower:
-            other["steals"] += 1; other["by_quarter"][q_label]["steals"] += 1
-        if "rebound" in text_lower: acting["rebounds"] += 1; acting["by_quarter"][q_label]["rebounds"] += 1
-        if "assist" in text_lower: acting["assists"] += 1; acting["by_quarter"][q_label]["assists"] += 1
-        if "made" in text_lower: acting["made_fg"] += 1
-    return {"home": home_data, "away": away_data}
-
 def render_tiebreaker_panel(stats, home, away):
     h_d, a_d = stats.get("home", {}), stats.get("away", {})
     ha = KALSHI_CODES.get(home, home[:3].upper())
@@ -895,16 +748,18 @@ def render_tiebreaker_panel(stats, home, away):
 # ── Data Fetch Calls ──
 games = fetch_espn_games()
 kalshi_ml_data = fetch_kalshi_ml()
-kalshi_spreads_parsed, kalshi_spread_list = fetch_kalshi_spreads_raw()
+kalshi_spread_index = fetch_kalshi_spread_index()
 injuries = fetch_injuries()
 b2b_teams = fetch_yesterday_teams()
 
 live_games = [g for g in games if g.get('status') in ['STATUS_IN_PROGRESS', 'STATUS_HALFTIME', 'STATUS_END_PERIOD'] or (g.get('period', 0) > 0 and g.get('status') not in ['STATUS_FINAL', 'STATUS_FULL_TIME'])]
 scheduled_games = [g for g in games if g.get('status') == 'STATUS_SCHEDULED' and g.get('period', 0) == 0]
 final_games = [g for g in games if g.get('status') in ['STATUS_FINAL', 'STATUS_FULL_TIME']]
+summary_prefetch = espn_summary.prefetch_summaries("nba", [g.get('game_id') for g in games if g not in final_games])
+kalshi_ml_data = apply_live_ml(kalshi_ml_data, live_games)
 
 for g in live_games:
-    sniper_result = check_spread_sniper(g, kalshi_spread_list, kalshi_ml_data)
+    sniper_result = check_spread_sniper(g, kalshi_spread_index, kalshi_ml_data)
     if sniper_result: st.session_state.sniper_alerts.append(sniper_result)
     comeback_result = check_comeback(g, kalshi_ml_data)
     if comeback_result: st.session_state.comeback_alerts.append(comeback_result)
@@ -972,6 +827,7 @@ with tab_edge:
 Only STRONG and MODERATE edges are shown below.
 """)
     st.caption("ESPN BPI + Vegas + Live Stats | Only showing STRONG + MODERATE edges")
+    st.caption(espn_summary.format_prefetch_stats(summary_prefetch))
 
     edge_results = []
     for g in scheduled_games:
@@ -1266,6 +1122,11 @@ with tab_spread:
                 best = None
                 for sp in alert.get('spreads', []):
                     no_price = sp.get('effective_no_price', sp.get('no_price', 0))
+                    fill = sp.get('fill')
+                    fill_str = ''
+                    if fill and fill.get('avg_price') is not None:
+                        fill_str = ' | Fill ' + str(fill['filled']) + '/' + str(fill['requested']) + ' @ ' + str(fill['avg_price']) + '¢ avg (' + str(fill['levels']) + ' lvl)'
+                    elif fill: fill_str = ' | No NO depth'
                     swing = sp.get('spread_val', 0) + alert.get('dog_lead', 0)
                     if no_price <= 40: tag, tcolor = "🔥 FIRE", "#ef4444"
                     elif no_price <= 60: tag, tcolor = "✅ GOOD", "#22c55e"
@@ -1273,10 +1134,12 @@ with tab_spread:
                     else: tag, tcolor = "🟠 WARN", "#f97316"
                     bh = '<div style="background:#0f172a;padding:clamp(6px,2vw,12px);border-radius:6px;margin-bottom:4px;max-width:100%;box-sizing:border-box;overflow-x:hidden">'
                     bh += '<span style="background:' + tcolor + ';color:white;padding:2px 6px;border-radius:4px;font-size:clamp(10px,2vw,13px);font-weight:bold">' + tag + '</span>'
-                    bh += '<span style="color:white;font-size:clamp(12px,3vw,15px);margin-left:6px;word-wrap:break-word">' + sp.get('title', '') + ' | NO: ' + str(no_price) + '¢ | Swing: ' + str(round(swing)) + '</span></div>'
+                    bh += '<span style="color:white;font-size:clamp(12px,3vw,15px);margin-left:6px;word-wrap:break-word">' + sp.get('title', '') + ' | NO: ' + str(no_price) + '¢' + fill_str + ' | Swing: ' + str(round(swing)) + '</span></div>'
                     st.markdown(bh, unsafe_allow_html=True)
-                    if best is None or no_price < best.get('no_price', 999):
-                        best = {'title': sp.get('title', ''), 'no_price': no_price, 'spread_val': sp.get('spread_val', 0)}
+                    exec_price = sp.get('fill_price', no_price)
+                    rank = ('fill_price' not in sp, exec_price)
+                    if best is None or rank < best['rank']:
+                        best = {'title': sp.get('title', ''), 'no_price': exec_price, 'spread_val': sp.get('spread_val', 0), 'rank': rank}
                 if best:
                     bh2 = '<div style="border-left:4px solid #22c55e;background:#0f2a1a;padding:clamp(8px,2vw,12px);border-radius:8px;margin-top:8px;max-width:100%;box-sizing:border-box;overflow-x:hidden">'
                     bh2 += '<span style="color:#22c55e;font-weight:bold;font-size:clamp(12px,3vw,16px)">BEST BET: ' + best['title'] + ' — NO @ ' + str(best['no_price']) + '¢</span></div>'
@@ -1432,8 +1295,7 @@ with tab_live:
 
             lead_tb = abs(g.get('home_score', 0) - g.get('away_score', 0))
             if lead_tb <= 5 and g.get('minutes_played', 0) >= 6:
-                all_plays = fetch_all_plays(g.get('game_id', ''))
-                tb_stats = calc_tiebreaker_stats(all_plays, g.get('home', ''), g.get('away', ''), g.get('home_id', ''), g.get('away_id', ''))
+                tb_stats = play_store.tiebreaker_stats("nba", g.get('game_id', ''), g.get('home_id', ''), g.get('away_id', ''), [g.get('home', ''), KALSHI_CODES.get(g.get('home', ''), '')], [g.get('away', ''), KALSHI_CODES.get(g.get('away', ''), '')])
                 tb_html = render_tiebreaker_panel(tb_stats, g.get('home', ''), g.get('away', ''))
                 st.markdown(tb_html, unsafe_allow_html=True)
             st.divider()
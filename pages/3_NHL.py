@@ -1,4 +1,5 @@
 import streamlit as st
+from streamlit_autorefresh import st_autorefresh
 
 st.set_page_config(page_title="NHL Edge Finder", page_icon="🏒", layout="wide")
 
@@ -20,16 +21,21 @@ send_ga4_event("NHL Edge Finder", "/NHL")
 # ============================================================
 # IMPORTS
 # ============================================================
-import requests
 import json
 import os
 from datetime import datetime, timedelta
 import pytz
 from styles import apply_styles
+import feeds, http_client, nhl_data
+import games as games_store
 
 apply_styles()
 
 VERSION = "21.1 LIVE"
+# Poll interval (ms) while the batched goalie lookup is still running
+GOALIE_POLL_MS = 3000
+# Weight of the goalie component in the total edge
+GOALIE_WEIGHT = 1.5
 
 # ============================================================
 # MOBILE-RESPONSIVE CSS
@@ -332,46 +338,22 @@ TEAM_ABBREVS = {
     "Vegas Golden Knights": "VGK", "Washington Capitals": "WSH", "Winnipeg Jets": "WPG"
 }
 
-ESPN_TEAM_IDS = {}
-
 # ============================================================
 # ESPN API FUNCTIONS
 # ============================================================
-@st.cache_data(ttl=3600)
-def fetch_yesterday_teams():
-    yesterday = (datetime.now(eastern) - timedelta(days=1)).strftime('%Y%m%d')
-    url = f"https://site.api.espn.com/apis/site/v2/sports/hockey/nhl/scoreboard?dates={yesterday}"
-    teams_played = set()
-    try:
-        resp = requests.get(url, timeout=10)
-        data = resp.json()
-        for event in data.get("events", []):
-            comp = event.get("competitions", [{}])[0]
-            status_name = event.get("status", {}).get("type", {}).get("name", "")
-            if status_name in ("STATUS_FINAL", "STATUS_IN_PROGRESS", "STATUS_END_PERIOD"):
-                for c in comp.get("competitors", []):
-                    full_name = c.get("team", {}).get("displayName", "")
-                    abbr = TEAM_ABBREVS.get(full_name, c.get("team", {}).get("abbreviation", ""))
-                    if abbr:
-                        teams_played.add(abbr)
-    except: pass
-    return teams_played
-
 @st.cache_data(ttl=3600)
 def fetch_team_stats():
     stats = {}
     try:
         url = "https://site.api.espn.com/apis/site/v2/sports/hockey/nhl/standings"
-        resp = requests.get(url, timeout=10)
+        resp = http_client.get(url, timeout=10)
         data = resp.json()
         for group in data.get("children", []):
             for div in group.get("standings", {}).get("entries", []):
                 team_obj = div.get("team", {})
                 full_name = team_obj.get("displayName", "")
                 abbr = TEAM_ABBREVS.get(full_name, team_obj.get("abbreviation", ""))
-                espn_id = team_obj.get("id", "")
                 if abbr:
-                    ESPN_TEAM_IDS[abbr] = espn_id
                     ts = {}
                     for s in div.get("stats", []):
                         ts[s.get("name", "")] = s.get("value", 0)
@@ -390,144 +372,44 @@ def fetch_team_stats():
         st.warning(f"Could not fetch team stats: {e}")
     return stats
 
-@st.cache_data(ttl=3600)
+# Disk-backed table (nhl_data); refreshed daily in the background, never blocks a warm start
+@st.cache_data(ttl=600)
 def fetch_team_special_teams():
-    special = {}
-    try:
-        url = "https://site.api.espn.com/apis/site/v2/sports/hockey/nhl/teams?limit=40"
-        resp = requests.get(url, timeout=10)
-        data = resp.json()
-        for team_entry in data.get("sports", [{}])[0].get("leagues", [{}])[0].get("teams", []):
-            t = team_entry.get("team", {})
-            full_name = t.get("displayName", "")
-            abbr = TEAM_ABBREVS.get(full_name, t.get("abbreviation", ""))
-            espn_id = t.get("id", "")
-            if abbr and espn_id:
-                try:
-                    stats_url = f"https://site.api.espn.com/apis/site/v2/sports/hockey/nhl/teams/{espn_id}/statistics"
-                    sr = requests.get(stats_url, timeout=5)
-                    sd = sr.json()
-                    ts = {}
-                    for cat in sd.get("results", {}).get("stats", {}).get("categories", []):
-                        for stat in cat.get("stats", []):
-                            ts[stat.get("name", "")] = stat.get("value", 0)
-                    pp = ts.get("powerPlayPct", ts.get("PPPctg", 0))
-                    pk = ts.get("penaltyKillPct", ts.get("PKPctg", 0))
-                    special[abbr] = {
-                        "pp_pct": round(float(pp), 1) if pp else 20.0,
-                        "pk_pct": round(float(pk), 1) if pk else 80.0,
-                    }
-                except:
-                    special[abbr] = {"pp_pct": 20.0, "pk_pct": 80.0}
-    except: pass
-    return special
-
-@st.cache_data(ttl=1800)
-def fetch_last10_record(team_abbr):
-    espn_id = ESPN_TEAM_IDS.get(team_abbr, "")
-    if not espn_id:
-        return "?-?-?"
-    try:
-        now_et = datetime.now(eastern)
-        season_year = now_et.year if now_et.month >= 9 else now_et.year
-        url = f"https://site.api.espn.com/apis/site/v2/sports/hockey/nhl/teams/{espn_id}/schedule?season={season_year}&seasontype=2"
-        resp = requests.get(url, timeout=10)
-        data = resp.json()
-        completed = []
-        for event in data.get("events", []):
-            if event.get("status", {}).get("type", {}).get("name", "") == "STATUS_FINAL":
-                comp = event.get("competitions", [{}])[0]
-                for c in comp.get("competitors", []):
-                    t_abbr = TEAM_ABBREVS.get(c.get("team", {}).get("displayName", ""), c.get("team", {}).get("abbreviation", ""))
-                    if t_abbr == team_abbr:
-                        winner = c.get("winner", False)
-                        period = event.get("status", {}).get("period", 3)
-                        completed.append("W" if winner else ("OT" if period > 3 else "L"))
-                        break
-        last10 = completed[-10:] if len(completed) >= 10 else completed
-        return f"{last10.count('W')}-{last10.count('L')}-{last10.count('OT')}"
-    except:
-        return "?-?-?"
-
-@st.cache_data(ttl=900)
-def fetch_probable_goalies(event_id):
-    home_goalie, away_goalie = "TBD", "TBD"
     try:
-        url = f"https://site.api.espn.com/apis/site/v2/sports/hockey/nhl/summary?event={event_id}"
-        resp = requests.get(url, timeout=10)
-        data = resp.json()
-        for item in data.get("rosters", []):
-            ha = item.get("homeAway", "")
-            for entry in item.get("roster", []):
-                if entry.get("probable", False) or entry.get("starter", False):
-                    if entry.get("position", {}).get("abbreviation", "") == "G":
-                        name = entry.get("athlete", {}).get("shortName", "TBD")
-                        if ha == "home": home_goalie = name
-                        else: away_goalie = name
-        if home_goalie == "TBD" or away_goalie == "TBD":
-            for comp in data.get("header", {}).get("competitions", []):
-                for c in comp.get("competitors", []):
-                    for lc in c.get("leaders", []):
-                        if lc.get("abbreviation", "") == "SV%":
-                            athletes = lc.get("leaders", [])
-                            if athletes:
-                                gn = athletes[0].get("athlete", {}).get("shortName", "TBD")
-                                if c.get("homeAway") == "home" and home_goalie == "TBD": home_goalie = gn
-                                elif c.get("homeAway") == "away" and away_goalie == "TBD": away_goalie = gn
-    except: pass
-    return home_goalie, away_goalie
+        return nhl_data.get_special_teams(TEAM_ABBREVS)
+    except: return {}
 
 @st.cache_data(ttl=120)
 def fetch_nhl_games_real():
     today_date = datetime.now(eastern).strftime('%Y%m%d')
-    url = f"https://site.api.espn.com/apis/site/v2/sports/hockey/nhl/scoreboard?dates={today_date}"
-    yesterday_teams = fetch_yesterday_teams()
+    yesterday = feeds.date_str(-1)
+    # One pass over recent daily boards answers back-to-back, rest and last-10 for every team
+    form = nhl_data.get_form_index(TEAM_ABBREVS)
     team_stats = fetch_team_stats()
     special_teams = fetch_team_special_teams()
     games = []
     try:
-        resp = requests.get(url, timeout=10)
-        data = resp.json()
-        for event in data.get("events", []):
-            comp = event.get("competitions", [{}])[0]
-            competitors = comp.get("competitors", [])
-            if len(competitors) < 2: continue
-            home_team, away_team, home_abbr, away_abbr = None, None, "", ""
-            home_record, away_record = "0-0-0", "0-0-0"
-            for c in competitors:
-                fn = c.get("team", {}).get("displayName", "")
-                ab = TEAM_ABBREVS.get(fn, c.get("team", {}).get("abbreviation", ""))
-                rec = c.get("records", [{}])[0].get("summary", "0-0-0") if c.get("records") else "0-0-0"
-                if c.get("homeAway") == "home":
-                    home_team, home_abbr, home_record = fn, ab, rec
-                else:
-                    away_team, away_abbr, away_record = fn, ab, rec
-            gd = event.get("date", "")
-            status_type = event.get("status", {}).get("type", {}).get("name", "STATUS_SCHEDULED")
-            game_date_str, game_time = "TBD", "TBD"
-            if gd:
-                for fmt in ["%Y-%m-%dT%H:%M%SZ", "%Y-%m-%dT%H:%M:%SZ", "%Y-%m-%dT%H:%M:%S%z"]:
-                    try:
-                        dt = datetime.strptime(gd[:20].rstrip("Z"), fmt.replace("Z","").replace("%z",""))
-                        dt_e = dt.replace(tzinfo=pytz.UTC).astimezone(eastern)
-                        game_date_str = dt_e.strftime("%a %b %d")
-                        game_time = dt_e.strftime("%I:%M %p ET")
-                        break
-                    except: continue
+        for g in games_store.get_games("nhl", today_date, codes=TEAM_ABBREVS):
+            home_abbr, away_abbr = g.home, g.away
+            game_date_str = g.start.strftime("%a %b %d") if g.start else "TBD"
+            game_time = g.start.strftime("%I:%M %p ET") if g.start else "TBD"
             home_st = special_teams.get(home_abbr, {"pp_pct": 20.0, "pk_pct": 80.0})
             away_st = special_teams.get(away_abbr, {"pp_pct": 20.0, "pk_pct": 80.0})
             home_ts = team_stats.get(home_abbr, {"gf_per_game": 3.0, "ga_per_game": 3.0, "point_pct": 0.500})
             away_ts = team_stats.get(away_abbr, {"gf_per_game": 3.0, "ga_per_game": 3.0, "point_pct": 0.500})
-            eid = event.get("id", "")
-            hg, ag = fetch_probable_goalies(eid)
+            eid = g.game_id
+            # Goalies are filled in by the batched stage below; the slate never waits on summaries
+            hg, ag = nhl_data.TBD_GOALIES
             games.append({
                 "id": eid, "home": home_abbr, "away": away_abbr,
-                "home_name": home_team, "away_name": away_team,
-                "home_record": home_record, "away_record": away_record,
-                "game_date": game_date_str, "game_time": game_time, "status": status_type,
-                "home_b2b": home_abbr in yesterday_teams, "away_b2b": away_abbr in yesterday_teams,
-                "home_rest": 0 if home_abbr in yesterday_teams else 1,
-                "away_rest": 0 if away_abbr in yesterday_teams else 1,
+                "home_name": g.home_full, "away_name": g.away_full,
+                "home_record": g.home_record, "away_record": g.away_record,
+                "game_date": game_date_str, "game_time": game_time, "status": g.status,
+                "home_b2b": form.played_on(home_abbr, yesterday), "away_b2b": form.played_on(away_abbr, yesterday),
+                "home_rest": form.rest_days(home_abbr, today_date),
+                "away_rest": form.rest_days(away_abbr, today_date),
+                "home_l10": form.last_n(home_abbr), "away_l10": form.last_n(away_abbr),
+                "home_l10_pct": form.points_pct(home_abbr), "away_l10_pct": form.points_pct(away_abbr),
                 "home_pp": home_st["pp_pct"], "away_pp": away_st["pp_pct"],
                 "home_pk": home_st["pk_pct"], "away_pk": away_st["pk_pct"],
                 "home_gf_pg": home_ts["gf_per_game"], "home_ga_pg": home_ts["ga_per_game"],
@@ -567,6 +449,10 @@ def calc_home_ice(game, team):
 def calc_form_edge(game, team):
     opp = "home" if team == "away" else "away"
     diff = game[f"{team}_point_pct"] - game[f"{opp}_point_pct"]
+    # Blend season points% with last-10 form when both teams have recent results
+    l10, ol10 = game.get(f"{team}_l10_pct"), game.get(f"{opp}_l10_pct")
+    if l10 is not None and ol10 is not None:
+        diff = (diff + (l10 - ol10)) / 2
     return max(-1.5, min(1.5, diff * 6))
 
 def calc_st_edge(game, team):
@@ -601,7 +487,7 @@ def calc_total_edge(game, team):
     st = calc_st_edge(game, team)
     gf = calc_gfga_edge(game, team)
     r = calc_record_edge(game, team)
-    total = g*1.5 + f*1.2 + h*1.0 + fo*1.0 + st*0.8 + gf*1.0 + r*0.5
+    total = g*GOALIE_WEIGHT + f*1.2 + h*1.0 + fo*1.0 + st*0.8 + gf*1.0 + r*0.5
     return {"total": round(total,2), "goalie": round(g,2), "fatigue": round(f,2),
             "home_ice": round(h,2), "form": round(fo,2), "special_teams": round(st,2),
             "gf_ga": round(gf,2), "record": round(r,2)}
@@ -614,9 +500,17 @@ def get_model_prob(ae, he):
     hp = max(10, min(90, 50 + d * 5))
     return round(100 - hp), round(hp)
 
-def analyze_game(game):
-    ae = calc_total_edge(game, "away")
-    he = calc_total_edge(game, "home")
+def rescore_goalie(edges, game, team):
+    # Swap only the goalie component of an existing breakdown
+    g = calc_goalie_edge(game, team)
+    out = dict(edges)
+    out["total"] = round(edges["total"] + (g - edges["goalie"]) * GOALIE_WEIGHT, 2)
+    out["goalie"] = round(g, 2)
+    return out
+
+def analyze_game(game, ae=None, he=None):
+    ae = ae or calc_total_edge(game, "away")
+    he = he or calc_total_edge(game, "home")
     a_sc = get_score(ae["total"])
     h_sc = get_score(he["total"])
     reasons_h, reasons_a = [], []
@@ -680,18 +574,41 @@ if not games:
     st.warning("No NHL games scheduled today.")
     st.stop()
 
+# Goalie stage: last known starters now, all summaries fetched concurrently in the background
+goalie_batch = nhl_data.start_goalie_batch([g["id"] for g in games])
+known = nhl_data.known_goalies([g["id"] for g in games])
+for g in games:
+    g["home_goalie_name"], g["away_goalie_name"] = known[str(g["id"])]
+
 st.header("🎯 MONEYLINE PICKS")
 
-# Analyze and sort
+# Analyze and sort; a game whose only change is its goalies just gets the goalie edge re-scored
+if "nhl_scores" not in st.session_state:
+    st.session_state.nhl_scores = {}
 analyses = []
 for game in games:
-    pt, ps, reasons = analyze_game(game)
+    goalies = (game["home_goalie_name"], game["away_goalie_name"])
+    base = {k: v for k, v in game.items() if not k.endswith("_goalie_name")}
+    prev = st.session_state.nhl_scores.get(game["id"])
+    if prev and prev["base"] == base and prev["goalies"] == goalies:
+        analyses.append(prev["analysis"])
+        continue
+    if prev and prev["base"] == base:
+        ae = rescore_goalie(prev["analysis"]["ae"], game, "away")
+        he = rescore_goalie(prev["analysis"]["he"], game, "home")
+    else:
+        ae = calc_total_edge(game, "away")
+        he = calc_total_edge(game, "home")
+    pt, ps, reasons = analyze_game(game, ae, he)
     tier, tc = get_tier(ps)
-    ae = calc_total_edge(game, "away")
-    he = calc_total_edge(game, "home")
     ap, hp = get_model_prob(ae["total"], he["total"])
-    analyses.append({"game": game, "pick_team": pt, "pick_score": ps, "reasons": reasons,
-                      "tier": tier, "tc": tc, "ae": ae, "he": he, "ap": ap, "hp": hp})
+    a = {"game": game, "pick_team": pt, "pick_score": ps, "reasons": reasons,
+         "tier": tier, "tc": tc, "ae": ae, "he": he, "ap": ap, "hp": hp}
+    st.session_state.nhl_scores[game["id"]] = {"base": base, "goalies": goalies, "analysis": a}
+    analyses.append(a)
+# Keep only today's games
+today_ids = {game["id"] for game in games}
+st.session_state.nhl_scores = {k: v for k, v in st.session_state.nhl_scores.items() if k in today_ids}
 analyses.sort(key=lambda x: x["pick_score"], reverse=True)
 
 for a in analyses:
@@ -774,10 +691,8 @@ for a in analyses:
         """
         st.markdown(stats_html, unsafe_allow_html=True)
 
-        # Last 10 (fetched on demand)
-        l10_away = fetch_last10_record(g['away'])
-        l10_home = fetch_last10_record(g['home'])
-        st.caption(f"Last 10: {g['away']} {l10_away} | {g['home']} {l10_home}")
+        # Last 10 (league form index)
+        st.caption(f"Last 10: {g['away']} {g['away_l10']} | {g['home']} {g['home_l10']}")
 
         # Edge breakdown as HTML
         def edge_class(v):
@@ -838,3 +753,13 @@ with st.expander("📖 LEGEND & GUIDE"):
 
 st.markdown("---")
 st.caption(f"⚠️ Educational only. Not financial advice. v{VERSION}")
+
+# Goalie stage result: never block the run. Poll while the batch is pending;
+# once it lands, repaint only when a starter assignment actually changed
+if goalie_batch.done():
+    try: resolved = goalie_batch.result()
+    except: resolved = {}
+    if any(resolved.get(str(g["id"]), nhl_data.TBD_GOALIES) != (g["home_goalie_name"], g["away_goalie_name"]) for g in games if str(g["id"]) in resolved):
+        st.rerun()
+else:
+    st_autorefresh(interval=GOALIE_POLL_MS, key="nhl_goalie_poll")
@@ -1,13 +1,12 @@
 """
 🌡️ TEMP.PY - City View with NWS Observations
-OWNER ONLY - Tomorrow's Forecast + NWS Table Only
+OWNER ONLY - Tomorrow's Forecast + NWS Table Only (or every city at once)
 """
 import streamlit as st
-import requests
+import nws_forecast
+import nws_obs
 from datetime import datetime
 import pytz
-from bs4 import BeautifulSoup
-import time
 
 st.set_page_config(page_title="🌡️ Temp Trading", page_icon="🌡️", layout="wide")
 
@@ -34,136 +33,32 @@ if "default_city" not in st.session_state:
     st.session_state.default_city = "New York City"
 
 def fetch_nws_forecast(lat, lon):
-    """Fetch tomorrow's forecast LOW from NWS"""
+    """Fetch tomorrow's forecast LOW from NWS (gridpoint URL resolved once, kept on disk)"""
     try:
-        points_url = f"https://api.weather.gov/points/{lat},{lon}"
-        resp = requests.get(points_url, headers={"User-Agent": "Temp/1.0"}, timeout=10)
-        if resp.status_code != 200:
-            return None
-        
-        data = resp.json()
-        forecast_url = data.get("properties", {}).get("forecast", "")
-        if not forecast_url:
-            return None
-        
-        forecast_resp = requests.get(forecast_url, headers={"User-Agent": "Temp/1.0"}, timeout=10)
-        if forecast_resp.status_code != 200:
-            return None
-        
-        periods = forecast_resp.json().get("properties", {}).get("periods", [])
-        
-        for period in periods:
-            name = period.get("name", "")
-            if "Tonight" in name or "Night" in name:
-                temp = period.get("temperature")
-                if temp:
-                    return temp
-        
-        return None
+        return nws_forecast.forecast_low(lat, lon)
     except:
         return None
 
 def fetch_full_nws_recording(station):
-    """Fetch NWS obhistory - CRITICAL: cells[9] = 6hr MIN for LOW settlement"""
-    timestamp = int(time.time())
-    url = f"https://forecast.weather.gov/data/obhistory/{station}.html?_={timestamp}"
+    """Fetch NWS obhistory - CRITICAL: min_6hr (cells[9]) = 6hr MIN for LOW settlement"""
     try:
-        headers = {
-            "User-Agent": "Temp/1.0",
-            "Cache-Control": "no-cache, no-store, must-revalidate, max-age=0",
-            "Pragma": "no-cache",
-            "Expires": "0"
-        }
-        
-        resp = requests.get(url, headers=headers, timeout=15)
-        if resp.status_code != 200:
-            return []
-        
-        soup = BeautifulSoup(resp.text, 'html.parser')
-        table = soup.find('table')
-        if not table:
-            return []
-        
-        rows = table.find_all('tr')
-        readings = []
-        
-        for row in rows[3:]:
-            cells = row.find_all('td')
-            if len(cells) < 10:
-                continue
-            
-            try:
-                readings.append({
-                    "date": cells[0].text.strip(),
-                    "time": cells[1].text.strip(),
-                    "wind": cells[2].text.strip(),
-                    "vis": cells[3].text.strip(),
-                    "weather": cells[4].text.strip(),
-                    "sky": cells[5].text.strip(),
-                    "air": cells[6].text.strip(),
-                    "dwpt": cells[7].text.strip(),
-                    "max_6hr": cells[8].text.strip(),
-                    "min_6hr": cells[9].text.strip()
-                })
-            except:
-                continue
-        
-        return readings
+        return nws_obs.get_history(station)
     except:
         return []
 
-st.title("🌡️ Temperature Trading Dashboard")
-st.caption("⚠️ OWNER ONLY - EDUCATIONAL PURPOSES")
-
-# Sidebar: City Selector
-with st.sidebar:
-    st.header("📍 Select City")
-    city_selection = st.selectbox(
-        "Choose a city to view:",
-        list(CITIES.keys()),
-        index=list(CITIES.keys()).index(st.session_state.default_city),
-        label_visibility="collapsed"
-    )
-    
-    col_a, col_b = st.columns(2)
-    with col_a:
-        if st.button("⭐ Set Default", use_container_width=True):
-            st.session_state.default_city = city_selection
-            st.success(f"✅ Saved!")
-    with col_b:
-        if st.button("🔄 Refresh", use_container_width=True):
-            st.rerun()
-
-st.divider()
-
-cfg = CITIES[city_selection]
-st.header(f"📍 {city_selection}")
+@st.cache_resource
+def resolve_city_points():
+    """All CITIES gridpoints, resolved once per process (and only once ever, via disk)"""
+    return nws_forecast.resolve_points(CITIES)
 
-# Tomorrow's Forecast
-st.subheader("📅 Tomorrow's Forecast")
+def latest_value(readings, field):
+    """(value, time) of the newest reading with a non-empty field"""
+    for r in readings:
+        if r.get(field):
+            return r[field], r.get("time", "")
+    return None, ""
 
-lat = cfg.get("lat")
-lon = cfg.get("lon")
-
-if lat and lon:
-    forecast_low = fetch_nws_forecast(lat, lon)
-    
-    if forecast_low:
-        forecast_settlement = round(forecast_low)
-        st.success(f"🎯 NWS Forecast LOW: **{forecast_low}°F** → Settlement: **{forecast_settlement}°F**")
-    else:
-        st.info("⏳ Tomorrow's forecast not yet available from NWS")
-else:
-    st.error("⚠️ Missing lat/lon coordinates for this city")
-
-st.divider()
-
-# Full NWS Table
-st.subheader("📋 Full NWS Table")
-
-full_readings = fetch_full_nws_recording(cfg["nws"])
-
-if full_readings:
+def render_nws_table(readings):
     table_html = """
     <style>
     .nws-full { width: 100%; border-collapse: collapse; font-family: Arial, sans-serif; font-size: 12px; }
@@ -197,7 +92,7 @@ if full_readings:
     <tbody>
     """
     
-    for r in full_readings:
+    for r in readings:
         table_html += f"""<tr>
         <td>{r['date']}</td>
         <td>{r['time']}</td>
@@ -213,9 +108,87 @@ if full_readings:
     
     table_html += "</tbody></table></div>"
     st.markdown(table_html, unsafe_allow_html=True)
-    st.caption(f"Source: https://forecast.weather.gov/data/obhistory/{cfg['nws']}.html")
+
+st.title("🌡️ Temperature Trading Dashboard")
+st.caption("⚠️ OWNER ONLY - EDUCATIONAL PURPOSES")
+
+resolve_city_points()
+
+# Sidebar: View + City Selector
+with st.sidebar:
+    view_mode = st.radio("View", ["📍 Single City", "📊 All Cities"], horizontal=True)
+    st.header("📍 Select City")
+    city_selection = st.selectbox(
+        "Choose a city to view:",
+        list(CITIES.keys()),
+        index=list(CITIES.keys()).index(st.session_state.default_city),
+        label_visibility="collapsed"
+    )
+    
+    col_a, col_b = st.columns(2)
+    with col_a:
+        if st.button("⭐ Set Default", use_container_width=True):
+            st.session_state.default_city = city_selection
+            st.success(f"✅ Saved!")
+    with col_b:
+        if st.button("🔄 Refresh", use_container_width=True):
+            st.rerun()
+
+st.divider()
+
+if view_mode == "📊 All Cities":
+    # Every city's forecast + obhistory in flight at once
+    board = nws_forecast.load_board(CITIES)
+    st.header("📊 All Cities")
+    cols = st.columns(4)
+    for i, (name, row) in enumerate(board.items()):
+        air, air_time = latest_value(row["readings"], "air")
+        min6, min6_time = latest_value(row["readings"], "min_6hr")
+        with cols[i % 4]:
+            low = row["forecast_low"]
+            st.metric(name, f"{low}°F" if low else "—", help="NWS forecast LOW → settlement " + (f"{round(low)}°F" if low else "n/a"))
+            st.caption(f"Air {air or '—'}°F @ {air_time or '—'} | 6hr Min {min6 or '—'}°F @ {min6_time or '—'}")
+    st.divider()
+    for name, row in board.items():
+        with st.expander(f"📋 {name} ({CITIES[name]['nws']})", expanded=(name == st.session_state.default_city)):
+            if row["readings"]:
+                render_nws_table(row["readings"])
+                st.caption(f"Source: https://forecast.weather.gov/data/obhistory/{CITIES[name]['nws']}.html")
+            else:
+                st.warning("⚠️ No NWS data available")
 else:
-    st.warning("⚠️ No NWS data available")
+    cfg = CITIES[city_selection]
+    st.header(f"📍 {city_selection}")
+
+    # Tomorrow's Forecast
+    st.subheader("📅 Tomorrow's Forecast")
+
+    lat = cfg.get("lat")
+    lon = cfg.get("lon")
+
+    if lat and lon:
+        forecast_low = fetch_nws_forecast(lat, lon)
+    
+        if forecast_low:
+            forecast_settlement = round(forecast_low)
+            st.success(f"🎯 NWS Forecast LOW: **{forecast_low}°F** → Settlement: **{forecast_settlement}°F**")
+        else:
+            st.info("⏳ Tomorrow's forecast not yet available from NWS")
+    else:
+        st.error("⚠️ Missing lat/lon coordinates for this city")
+
+    st.divider()
+
+    # Full NWS Table
+    st.subheader("📋 Full NWS Table")
+
+    full_readings = fetch_full_nws_recording(cfg["nws"])
+
+    if full_readings:
+        render_nws_table(full_readings)
+        st.caption(f"Source: https://forecast.weather.gov/data/obhistory/{cfg['nws']}.html")
+    else:
+        st.warning("⚠️ No NWS data available")
 
 st.divider()
 st.caption("⚠️ **DISCLAIMER:** EDUCATIONAL and EXPERIMENTAL purposes ONLY. NOT financial advice. NOT betting advice.")
@@ -6,13 +6,9 @@ ESPN-Only WP — No Sigmoid Fallback
 BigSnapshot.com
 """
 import streamlit as st
-import requests
 import time
-import base64
 from datetime import datetime, timezone, timedelta
-from cryptography.hazmat.primitives import hashes, serialization
-from cryptography.hazmat.primitives.asymmetric import padding
-from cryptography.hazmat.backends import default_backend
+import espn_summary, feeds, http_client, kalshi_auth, kalshi_catalog, kalshi_depth, kalshi_exec, kalshi_orders, kalshi_stream, snapshot_store
 
 st.set_page_config(page_title="Match Analyzer", page_icon="🔬", layout="wide")
 
@@ -21,39 +17,23 @@ st.set_page_config(page_title="Match Analyzer", page_icon="🔬", layout="wide")
 # ============================================================
 API_KEY = st.secrets.get("KALSHI_API_KEY", "")
 PRIVATE_KEY = st.secrets.get("KALSHI_PRIVATE_KEY", "")
-KALSHI_BASE = "https://api.elections.kalshi.com"
+KALSHI_BASE = kalshi_exec.TRADE_URL
 
 
-def create_kalshi_signature(timestamp, method, path):
-    try:
-        message = (str(timestamp) + method + path).encode('utf-8')
-        pk = serialization.load_pem_private_key(
-            PRIVATE_KEY.encode(), password=None, backend=default_backend()
-        )
-        sig = pk.sign(
-            message,
-            padding.PSS(
-                mgf=padding.MGF1(hashes.SHA256()),
-                salt_length=padding.PSS.DIGEST_LENGTH
-            ),
-            hashes.SHA256()
-        )
-        return base64.b64encode(sig).decode()
-    except Exception:
-        return None
+# Key is parsed once per process; reruns and sessions share the same signer
+@st.cache_resource
+def get_kalshi_signer():
+    return kalshi_auth.get_signer(API_KEY, PRIVATE_KEY)
 
 
 def kalshi_headers(method, path):
-    ts = str(int(time.time() * 1000))
-    sig = create_kalshi_signature(ts, method, path)
-    if not sig:
+    signer = get_kalshi_signer()
+    if not signer:
+        return None
+    try:
+        return signer.headers(method, path)
+    except Exception:
         return None
-    return {
-        "KALSHI-ACCESS-KEY": API_KEY,
-        "KALSHI-ACCESS-SIGNATURE": sig,
-        "KALSHI-ACCESS-TIMESTAMP": ts,
-        "Content-Type": "application/json"
-    }
 
 
 def get_kalshi_balance():
@@ -62,7 +42,7 @@ def get_kalshi_balance():
     if not h:
         return None
     try:
-        r = requests.get(KALSHI_BASE + path, headers=h, timeout=10)
+        r = http_client.get(KALSHI_BASE + path, headers=h, timeout=10)
         if r.status_code == 200:
             return r.json().get("balance", 0) / 100
         return None
@@ -70,32 +50,29 @@ def get_kalshi_balance():
         return None
 
 
-def place_kalshi_order(ticker, side, price_cents, count):
-    path = "/trade-api/v2/portfolio/orders"
-    h = kalshi_headers("POST", path)
-    if not h:
-        return False, "Auth failed", ""
-    body = {
-        "ticker": ticker,
-        "action": "buy",
-        "side": side,
-        "count": count,
-        "type": "limit",
-    }
-    if side == "yes":
-        body["yes_price"] = price_cents
-    else:
-        body["no_price"] = price_cents
-    try:
-        r = requests.post(KALSHI_BASE + path, headers=h, json=body, timeout=10)
-        d = r.json()
-        if r.status_code in [200, 201]:
-            oid = d.get("order", {}).get("order_id", d.get("order_id", ""))
-            return True, "Order placed", oid
-        msg = d.get("message", d.get("error", "HTTP " + str(r.status_code)))
-        return False, msg, ""
-    except Exception as e:
-        return False, str(e), ""
+# Process-wide order queue: a background worker submits over the warm pooled connection
+@st.cache_resource
+def get_order_queue():
+    return kalshi_orders.get_queue(API_KEY, PRIVATE_KEY)
+
+
+def queue_kalshi_order(ticker, side, price_cents, count, signal_at=None):
+    """Enqueue one limit order and return its client_order_id (None without auth).
+    The same ticket keeps its id until the exchange has placed or rejected it: a repeated
+    click is a no-op, and a click after a failure (e.g. timeout) retries under the same id."""
+    q = get_order_queue()
+    if not q:
+        return None
+    params = (ticker, side, int(price_cents), int(count))
+    ticket = st.session_state.get("order_ticket")
+    coid = None
+    if ticket and ticket[0] == params:
+        prev = kalshi_orders.get_order(ticket[1])
+        if prev and prev["status"] not in kalshi_orders.SETTLED:
+            coid = ticket[1]
+    coid = coid or kalshi_orders.new_client_order_id()
+    st.session_state.order_ticket = (params, coid)
+    return q.enqueue(ticker, side, price_cents, count, source="MatchAnalyzer", client_order_id=coid, signal_at=signal_at)
 
 
 # ============================================================
@@ -103,16 +80,13 @@ def place_kalshi_order(ticker, side, price_cents, count):
 # ============================================================
 LEAGUES = {
     "NBA": {"pace": 0.034, "minutes": 48, "periods": 4, "pmin": 12,
-            "label": "NBA", "espn": "basketball/nba", "kalshi": "KXNBAGAME", "plbl": "Q",
-            "wp_sport": "basketball", "wp_league": "nba"},
+            "label": "NBA", "feed": "nba", "kalshi": "KXNBAGAME", "plbl": "Q"},
     "NCAAM": {"pace": 0.028, "minutes": 40, "periods": 2, "pmin": 20,
-              "label": "NCAA Men", "espn": "basketball/mens-college-basketball",
-              "kalshi": "KXNCAAMBGAME", "plbl": "H",
-              "wp_sport": "basketball", "wp_league": "mens-college-basketball"},
+              "label": "NCAA Men", "feed": "ncaam",
+              "kalshi": "KXNCAAMBGAME", "plbl": "H"},
     "NCAAW": {"pace": 0.022, "minutes": 40, "periods": 4, "pmin": 10,
-              "label": "NCAA Women", "espn": "basketball/womens-college-basketball",
-              "kalshi": "KXNCAAWBGAME", "plbl": "Q",
-              "wp_sport": "basketball", "wp_league": "womens-college-basketball"},
+              "label": "NCAA Women", "feed": "ncaaw",
+              "kalshi": "KXNCAAWBGAME", "plbl": "Q"},
 }
 
 
@@ -124,10 +98,8 @@ def fetch_espn_games(league_key):
     cfg = LEAGUES.get(league_key)
     if not cfg:
         return []
-    url = "https://site.api.espn.com/apis/site/v2/sports/" + cfg.get("espn", "") + "/scoreboard"
     try:
-        r = requests.get(url, timeout=10)
-        d = r.json()
+        d = snapshot_store.get_json(feeds.scoreboard_url(cfg.get("feed", "nba")), feeds.SCOREBOARD_MAX_AGE)
     except Exception:
         return []
     games = []
@@ -218,47 +190,19 @@ def fetch_espn_games(league_key):
 # ============================================================
 # ESPN WIN PROBABILITY — DEDICATED ENDPOINT
 # ============================================================
-@st.cache_data(ttl=20)
-def fetch_espn_wp(game_id, sport, league_name):
-    url = "https://site.api.espn.com/apis/site/v2/sports/" + sport + "/" + league_name + "/summary?event=" + str(game_id)
-    try:
-        r = requests.get(url, timeout=8)
-        if r.status_code != 200:
-            return None
-        d = r.json()
-        # Try winprobability array (most accurate, last entry)
-        wp_data = d.get("winprobability", [])
-        if wp_data:
-            last = wp_data[-1]
-            val = last.get("homeWinPercentage", None)
-            if val is not None:
-                return float(val) * 100
-        # Try predictor
-        pred = d.get("predictor", {})
-        if pred:
-            ht = pred.get("homeTeam", {})
-            val = ht.get("gameProjection", None)
-            if val is not None:
-                return float(val)
-        return None
-    except Exception:
-        return None
+def fetch_espn_wp(game_id, feed):
+    return espn_summary.get_win_prob(feed, game_id)
 
 
 # ============================================================
 # ESPN WP TIMELINE — FULL GAME HISTORY
 # ============================================================
-@st.cache_data(ttl=20)
-def fetch_espn_wp_timeline(game_id, sport, league_name):
+def fetch_espn_wp_timeline(game_id, feed):
     """Fetch full WP timeline from ESPN for chart overlay."""
-    url = "https://site.api.espn.com/apis/site/v2/sports/"
-    url += sport + "/" + league_name
-    url += "/summary?event=" + str(game_id)
     try:
-        r = requests.get(url, timeout=10)
-        if r.status_code != 200:
+        d = espn_summary.get_summary(feed, game_id)
+        if not d:
             return None
-        d = r.json()
         wp_arr = d.get("winprobability", [])
         if not wp_arr or len(wp_arr) < 2:
             return None
@@ -301,14 +245,8 @@ def get_total_seconds(cfg):
 # ============================================================
 @st.cache_data(ttl=30)
 def fetch_kalshi_markets(series_ticker):
-    url = KALSHI_BASE + "/trade-api/v2/markets"
-    try:
-        r = requests.get(url, params={"series_ticker": series_ticker, "status": "open", "limit": 200}, timeout=10)
-        d = r.json()
-    except Exception:
-        return {}
     prices = {}
-    for m in d.get("markets", []):
+    for m in kalshi_catalog.get_markets(series_ticker):
         tk = m.get("ticker", "")
         prices[tk] = {
             "yes_price": m.get("yes_price", m.get("last_price", 0)),
@@ -473,8 +411,6 @@ def build_espn_wp_chart(timeline, total_sec, kalshi_price=None, current_wp=None,
 # ============================================================
 # SESSION STATE
 # ============================================================
-if "order_log" not in st.session_state:
-    st.session_state.order_log = []
 if "sel_game_id" not in st.session_state:
     st.session_state.sel_game_id = None
 if "sel_league" not in st.session_state:
@@ -570,6 +506,9 @@ g_clock = sel_game.get("clock", "0:00") if sel_game else "0:00"
 k_price, k_ticker = (None, None)
 if sel_game:
     k_price, k_ticker = find_kalshi_price(sel_game, sel_league)
+    if k_ticker and sel_game.get("state") == "in":
+        # Sub-second price from the websocket book once the ticker is in sync
+        k_price = kalshi_stream.live_price(k_ticker, API_KEY, PRIVATE_KEY).get(k_ticker, k_price)
 
 # SCOREBOARD
 if sel_game:
@@ -628,11 +567,11 @@ if sel_game and sel_game.get("state") == "in":
     wp = sel_game.get("espn_wp")
     # If not there, try dedicated endpoint
     if wp is None:
-        wp = fetch_espn_wp(sel_game.get("id", ""), cfg.get("wp_sport", "basketball"), cfg.get("wp_league", "nba"))
+        wp = fetch_espn_wp(sel_game.get("id", ""), cfg.get("feed", "nba"))
 
 # Also try for post games (final WP)
 if wp is None and sel_game and sel_game.get("state") == "post":
-    wp = fetch_espn_wp(sel_game.get("id", ""), cfg.get("wp_sport", "basketball"), cfg.get("wp_league", "nba"))
+    wp = fetch_espn_wp(sel_game.get("id", ""), cfg.get("feed", "nba"))
 
 # ============================================================
 # DISPLAY: WP + EDGE + PROFIT + CHECKLIST + BUY (only if wp available)
@@ -668,6 +607,7 @@ if sel_game and wp is not None:
     contracts = st.slider("Contracts", 1, 100, 10, key="csl")
 
     if kpv > 0 and kpv <= 100:
+        signal_at = kalshi_exec.mark()
         he = wp - kpv
         ae = abs(he)
         bs = "home" if he >= 0 else "away"
@@ -730,21 +670,45 @@ if sel_game and wp is not None:
         html += '</div>'
         st.markdown(html, unsafe_allow_html=True)
 
+        # EXECUTABLE PRICE (order-book depth for the chosen side and size)
+        if k_ticker:
+            fill = kalshi_depth.estimate_fills([k_ticker], bside, contracts).get(k_ticker)
+            if fill and fill.get("avg_price") is not None:
+                fc = "#10b981" if fill["complete"] and fill["avg_price"] <= bp else "#f59e0b"
+                ftxt = "Fill " + str(fill["filled"]) + "/" + str(contracts) + " @ " + str(fill["avg_price"]) + "c avg (worst " + str(fill["worst_price"]) + "c, " + str(fill["levels"]) + " lvl) = $" + str(fill["cost"])
+                if not fill["complete"]:
+                    ftxt += " — only " + str(fill["depth"]) + " on the book"
+                st.markdown('<div style="text-align:center;color:' + fc + ';font-size:12px;margin:4px 0">📚 ' + ftxt + '</div>', unsafe_allow_html=True)
+            elif fill:
+                st.markdown('<div style="text-align:center;color:#ef4444;font-size:12px;margin:4px 0">📚 No ' + bside.upper() + ' depth on the book</div>', unsafe_allow_html=True)
+
         # BUY BUTTON
         if api_ok and k_ticker and ae >= 2:
+            oq = get_order_queue()
+            if oq:
+                oq.executor.warm_async()
             blab = "🚀 BUY " + str(contracts) + "x " + sn + " " + bside.upper() + " @ " + str(int(bp)) + "c"
             if st.button(blab, key="buy", use_container_width=True, type="primary"):
-                ok, msg, oid = place_kalshi_order(k_ticker, bside, int(bp), contracts)
-                if ok:
-                    st.success("✅ Order placed! " + str(contracts) + "x " + sn + " " + bside.upper() + " @ " + str(bp) + "c — ID: " + oid)
+                coid = queue_kalshi_order(k_ticker, bside, int(bp), contracts, signal_at)
+                if coid:
+                    # Give the worker a moment so a fast ack shows on this run; otherwise it lands in the log
+                    deadline = time.time() + 1.5
+                    o = kalshi_orders.get_order(coid)
+                    while o and o["status"] not in kalshi_orders.TERMINAL and time.time() < deadline:
+                        time.sleep(0.05)
+                        o = kalshi_orders.get_order(coid)
+                    if o and o["status"] == kalshi_orders.PLACED:
+                        st.success("✅ Order placed! " + str(contracts) + "x " + sn + " " + bside.upper() + " @ " + str(bp) + "c — ID: " + o["order_id"])
+                    elif o and o["status"] == kalshi_orders.REJECTED:
+                        st.error("❌ Order failed: " + o["message"])
+                    elif o and o["status"] == kalshi_orders.FAILED:
+                        st.warning("⚠️ No answer from Kalshi (" + o["message"] + ") — the order may be live. Click again to retry under the same order ID.")
+                    else:
+                        st.info("⏳ Order queued — " + str(contracts) + "x " + sn + " " + bside.upper() + " @ " + str(bp) + "c. Status updates in the order log.")
+                    if o and o["latency_ms"]:
+                        st.caption("⏱ signal→ack " + str(round(o["latency_ms"], 1)) + " ms (attempts: " + str(o["attempts"]) + ")")
                 else:
-                    st.error("❌ Order failed: " + msg)
-                st.session_state.order_log.append({
-                    "time": datetime.now().strftime("%H:%M:%S"),
-                    "ticker": k_ticker, "side": bside.upper(),
-                    "team": sn, "contracts": contracts,
-                    "price": int(bp), "ok": ok, "msg": msg,
-                })
+                    st.error("❌ Order failed: Auth failed")
         elif not api_ok:
             st.info("Connect Kalshi API to enable one-click trading")
         elif not k_ticker:
@@ -787,7 +751,7 @@ st.markdown("---")
 espn_timeline = None
 if sel_game and sel_game.get("state") in ["in", "post"]:
     espn_timeline = fetch_espn_wp_timeline(
-        sel_game.get("id", ""), cfg.get("wp_sport", "basketball"), cfg.get("wp_league", "nba")
+        sel_game.get("id", ""), cfg.get("feed", "nba")
     )
 
 if espn_timeline and len(espn_timeline) >= 2 and wp is not None:
@@ -809,14 +773,24 @@ elif sel_game and wp is not None:
     st.caption("📡 ESPN WP timeline will appear once the game is live with enough data points.")
 
 # ORDER LOG
-if st.session_state.order_log:
+# Persistent (snapshots/orders.sqlite), shared across sessions and restarts
+try:
+    order_log = kalshi_orders.recent_orders(20, source="MatchAnalyzer")
+except:
+    order_log = []
+if order_log:
     st.markdown("---")
-    st.markdown("**📋 ORDER LOG (" + str(len(st.session_state.order_log)) + ")**")
-    for o in st.session_state.order_log:
-        ic = "✅" if o.get("ok") else "❌"
-        cl = "#10b981" if o.get("ok") else "#ef4444"
-        bg = "#0a1f0a" if o.get("ok") else "#1f0a0a"
-        st.markdown('<div style="display:flex;justify-content:space-between;padding:4px 8px;border-radius:4px;background:' + bg + ';margin-bottom:2px"><span style="color:#94a3b8;font-size:11px">' + o.get("time", "") + '</span><span style="color:#e2e8f0;font-size:11px;font-weight:600">' + str(o.get("contracts", 0)) + 'x ' + o.get("team", "") + ' ' + o.get("side", "") + ' @ ' + str(o.get("price", 0)) + 'c</span><span style="color:' + cl + ';font-size:11px;font-weight:700">' + ic + ' ' + o.get("msg", "") + '</span></div>', unsafe_allow_html=True)
+    st.markdown("**📋 ORDER LOG (" + str(len(order_log)) + ")**")
+    for o in order_log:
+        ok = o["status"] == kalshi_orders.PLACED
+        done = o["status"] in kalshi_orders.TERMINAL
+        ic = "✅" if ok else "❌" if done else "⏳"
+        cl = "#10b981" if ok else "#ef4444" if done else "#f59e0b"
+        bg = "#0a1f0a" if ok else "#1f0a0a" if done else "#1f1a0a"
+        msg = o["message"] or o["status"]
+        if o["latency_ms"]:
+            msg += " (" + str(round(o["latency_ms"], 1)) + " ms)"
+        st.markdown('<div style="display:flex;justify-content:space-between;padding:4px 8px;border-radius:4px;background:' + bg + ';margin-bottom:2px"><span style="color:#94a3b8;font-size:11px">' + datetime.fromtimestamp(o["created_at"]).strftime("%H:%M:%S") + '</span><span style="color:#e2e8f0;font-size:11px;font-weight:600">' + str(o["count"]) + 'x ' + o["ticker"] + ' ' + o["side"].upper() + ' @ ' + str(o["price"]) + 'c</span><span style="color:' + cl + ';font-size:11px;font-weight:700">' + ic + ' ' + msg + '</span></div>', unsafe_allow_html=True)
 
 # REFRESH
 st.markdown("---")
@@ -5,9 +5,12 @@ st.set_page_config(page_title="BigSnapshot NCAA Edge Finder", page_icon="🏀",
 from auth import require_auth
 require_auth()
 st_autorefresh(interval=30000, key="ncaa_datarefresh")
-import uuid, re, requests, pytz
+import uuid, re, pytz
 import requests as req_ga
 from datetime import datetime, timedelta
+import espn_summary, feeds, http_client, snapshot_store
+import games as games_store
+import kalshi_catalog, kalshi_depth, kalshi_stream, play_store, team_matcher
 
 # ── GA4 ──
 def send_ga4_event(page_title, page_path):
@@ -22,6 +25,12 @@ send_ga4_event("BigSnapshot NCAA Edge Finder", "/NCAA")
 eastern = pytz.timezone("US/Eastern")
 now = datetime.now(eastern)
 VERSION = "3.0"
+try:
+    # Only needed to open the live Kalshi price stream; pages fall back to REST without them
+    KALSHI_API_KEY = st.secrets.get("KALSHI_API_KEY", "")
+    KALSHI_PRIVATE_KEY = st.secrets.get("KALSHI_PRIVATE_KEY", "")
+except:
+    KALSHI_API_KEY, KALSHI_PRIVATE_KEY = "", ""
 LEAGUE_AVG_TOTAL = 135
 GAME_MINUTES = 40
 HALF_MINUTES = 20
@@ -30,6 +39,8 @@ HOME_COURT_ADV = 4.0
 MIN_UNDERDOG_LEAD = 8
 MIN_SPREAD_BRACKET = 8
 MAX_NO_PRICE = 85
+# Contract count the sniper prices against the order book
+SNIPER_CONTRACTS = 10
 MIN_WP_EDGE = 8
 LEAD_BY_HALF = {1: 8, 2: 12}
 KALSHI_GAME_LINK = "https://kalshi.com/sports/basketball/college-basketball-m/games"
@@ -72,33 +83,6 @@ def speak_play(text):
     """
     components.html(js, height=0)
 
-# ── Helper: calc_minutes_elapsed ──
-def calc_minutes_elapsed(period, clock_str):
-    try:
-        period = int(period) if period else 1
-        if not clock_str or clock_str == "0:00":
-            if period <= 2:
-                return period * HALF_MINUTES
-            else:
-                return GAME_MINUTES + (period - 2) * 5
-        parts = clock_str.replace(" ", "").split(":")
-        minutes_left = int(parts[0])
-        seconds_left = int(parts[1]) if len(parts) > 1 else 0
-        remaining = minutes_left + seconds_left / 60.0
-        if period == 1:
-            half_length = HALF_MINUTES
-            completed = 0
-        elif period == 2:
-            half_length = HALF_MINUTES
-            completed = HALF_MINUTES
-        else:
-            half_length = 5
-            completed = GAME_MINUTES + (period - 3) * 5
-        elapsed = completed + (half_length - remaining)
-        return max(0, elapsed)
-    except:
-        return 0
-
 # ── Helper: calc_projection ──
 def calc_projection(total_score, minutes_elapsed):
     if minutes_elapsed < 6:
@@ -165,151 +149,20 @@ def remove_position(pos_id):
     st.session_state.ncaa_positions = [p for p in st.session_state.ncaa_positions if p.get('id') != pos_id]
 
 # ── ESPN: fetch_espn_games ──
-@st.cache_data(ttl=30)
 def fetch_espn_games():
     try:
         today = datetime.now(eastern).strftime("%Y%m%d")
-        url = f"https://site.api.espn.com/apis/site/v2/sports/basketball/mens-college-basketball/scoreboard?dates={today}&limit=200&groups=50"
-        resp = requests.get(url, timeout=10)
-        data = resp.json()
-        games = []
-        for event in data.get("events", []):
-            try:
-                comp = event["competitions"][0]
-                competitors = comp.get("competitors", [])
-                home_team_data = None
-                away_team_data = None
-                for c in competitors:
-                    if c.get("homeAway") == "home":
-                        home_team_data = c
-                    else:
-                        away_team_data = c
-                if not home_team_data or not away_team_data:
-                    continue
-                ht = home_team_data.get("team", {})
-                at = away_team_data.get("team", {})
-                status_obj = event.get("status", {})
-                status_type = status_obj.get("type", {})
-                state = status_type.get("state", "pre")
-                period = status_obj.get("period", 0)
-                clock = status_obj.get("displayClock", "")
-                status_detail = status_type.get("detail", "")
-                home_score = int(home_team_data.get("score", 0) or 0)
-                away_score = int(away_team_data.get("score", 0) or 0)
-                home_record_str = ""
-                away_record_str = ""
-                for rec in home_team_data.get("records", []):
-                    if rec.get("type") == "total":
-                        home_record_str = rec.get("summary", "")
-                        break
-                for rec in away_team_data.get("records", []):
-                    if rec.get("type") == "total":
-                        away_record_str = rec.get("summary", "")
-                        break
-                home_color = "#" + ht.get("color", "555555")
-                away_color = "#" + at.get("color", "555555")
-                home_rank = home_team_data.get("curatedRank", {}).get("current", 99)
-                away_rank = away_team_data.get("curatedRank", {}).get("current", 99)
-                vegas = {}
-                home_ml_val = 0
-                odds_list = comp.get("odds", [])
-                if odds_list:
-                    o = odds_list[0]
-                    vegas = {
-                        "spread": o.get("details", ""),
-                        "overUnder": o.get("overUnder", ""),
-                        "homeML": o.get("homeTeamOdds", {}).get("moneyLine", 0),
-                        "awayML": o.get("awayTeamOdds", {}).get("moneyLine", 0)
-                    }
-                    home_ml_val = vegas.get("homeML", 0) or 0
-                conference = ""
-                notes = comp.get("notes", [])
-                if notes:
-                    conference = notes[0].get("headline", "")
-                venue_name = comp.get("venue", {}).get("fullName", "")
-                broadcast = ""
-                broadcasts = comp.get("broadcasts", [])
-                if broadcasts:
-                    names = [n.get("names", [""])[0] for n in broadcasts if n.get("names")]
-                    broadcast = ", ".join(names)
-                game_dt_str = event.get("date", "")
-                game_time = ""
-                game_datetime = ""
-                if game_dt_str:
-                    try:
-                        utc_dt = datetime.strptime(game_dt_str[:19], "%Y-%m-%dT%H:%M:%S").replace(tzinfo=pytz.utc)
-                        et_dt = utc_dt.astimezone(eastern)
-                        game_time = et_dt.strftime("%-I:%M %p ET")
-                        game_datetime = et_dt.strftime("%Y-%m-%d %H:%M")
-                    except:
-                        game_time = game_dt_str
-                minutes_elapsed = calc_minutes_elapsed(period, clock) if state == "in" else 0
-                g = {
-                    "away_team": at.get("displayName", at.get("shortDisplayName", "")),
-                    "home_team": ht.get("displayName", ht.get("shortDisplayName", "")),
-                    "away_abbr": at.get("abbreviation", "").upper(),
-                    "home_abbr": ht.get("abbreviation", "").upper(),
-                    "away_score": away_score,
-                    "home_score": home_score,
-                    "away_record": away_record_str,
-                    "home_record": home_record_str,
-                    "away_id": str(at.get("id", "")),
-                    "home_id": str(ht.get("id", "")),
-                    "away_color": away_color,
-                    "home_color": home_color,
-                    "away_rank": away_rank if away_rank != 99 else 99,
-                    "home_rank": home_rank if home_rank != 99 else 99,
-                    "away_full": at.get("displayName", ""),
-                    "home_full": ht.get("displayName", ""),
-                    "status": status_detail,
-                    "state": state,
-                    "period": period,
-                    "clock": clock,
-                    "minutes_elapsed": minutes_elapsed,
-                    "total_score": home_score + away_score,
-                    "game_id": event.get("id", ""),
-                    "vegas_odds": vegas,
-                    "home_ml": home_ml_val,
-                    "conference": conference,
-                    "venue": venue_name,
-                    "broadcast": broadcast,
-                    "shortName": event.get("shortName", ""),
-                    "game_time": game_time,
-                    "game_datetime": game_datetime
-                }
-                games.append(g)
-            except:
-                continue
-        return games
+        return games_store.get_games("ncaam", today)
     except:
         return []
 
 # ── ESPN: fetch_game_summary ──
-@st.cache_data(ttl=300)
 def fetch_game_summary(game_id):
-    try:
-        url = f"https://site.api.espn.com/apis/site/v2/sports/basketball/mens-college-basketball/summary?event={game_id}"
-        resp = requests.get(url, timeout=10)
-        return resp.json()
-    except:
-        return None
+    return espn_summary.get_summary("ncaam", game_id)
 
 # ── ESPN: fetch_espn_win_prob ──
-@st.cache_data(ttl=20)
 def fetch_espn_win_prob(game_id):
-    try:
-        url = f"https://site.api.espn.com/apis/site/v2/sports/basketball/mens-college-basketball/summary?event={game_id}"
-        resp = requests.get(url, timeout=10)
-        data = resp.json()
-        wp = data.get("winprobability", [])
-        if wp:
-            return wp[-1].get("homeWinPercentage", 0.5) * 100
-        pred = data.get("predictor", {})
-        if pred:
-            return float(pred.get("homeTeam", {}).get("gameProjection", 50))
-        return None
-    except:
-        return None
+    return espn_summary.get_win_prob("ncaam", game_id)
 
 # ── ESPN: parse_predictor ──
 def parse_predictor(summary):
@@ -398,7 +251,7 @@ def fetch_injuries():
     injury_dict = {}
     try:
         url = "https://site.api.espn.com/apis/site/v2/sports/basketball/mens-college-basketball/injuries"
-        resp = requests.get(url, timeout=10)
+        resp = http_client.get(url, timeout=10)
         data = resp.json()
         for team_entry in data.get("items", []):
             team_info = team_entry.get("team", {})
@@ -425,9 +278,7 @@ def fetch_yesterday_teams():
     b2b = set()
     try:
         yest = (datetime.now(eastern) - timedelta(days=1)).strftime("%Y%m%d")
-        url = f"https://site.api.espn.com/apis/site/v2/sports/basketball/mens-college-basketball/scoreboard?dates={yest}&limit=200&groups=50"
-        resp = requests.get(url, timeout=10)
-        data = resp.json()
+        data = snapshot_store.get_json(feeds.scoreboard_url("ncaam", yest), feeds.RESULTS_MAX_AGE)
         for event in data.get("events", []):
             for comp in event.get("competitions", []):
                 for c in comp.get("competitors", []):
@@ -439,40 +290,8 @@ def fetch_yesterday_teams():
     return b2b
 
 # ── ESPN: fetch_plays ──
-@st.cache_data(ttl=30)
 def fetch_plays(game_id):
-    try:
-        url = f"https://site.api.espn.com/apis/site/v2/sports/basketball/mens-college-basketball/summary?event={game_id}"
-        resp = requests.get(url, timeout=10)
-        data = resp.json()
-        plays_raw = []
-        for drive in data.get("plays", []):
-            if isinstance(drive, dict):
-                plays_raw.append(drive)
-            elif isinstance(drive, list):
-                plays_raw.extend(drive)
-        last_15 = plays_raw[-15:] if len(plays_raw) >= 15 else plays_raw
-        result = []
-        for p in last_15[-10:]:
-            text = p.get("text", "")
-            period = p.get("period", {}).get("number", 0) if isinstance(p.get("period"), dict) else p.get("period", 0)
-            clock = p.get("clock", {}).get("displayValue", "") if isinstance(p.get("clock"), dict) else p.get("clock", "")
-            sv = p.get("scoreValue", 0)
-            pt = p.get("type", {}).get("text", "") if isinstance(p.get("type"), dict) else str(p.get("type", ""))
-            tid = ""
-            if p.get("team"):
-                tid = str(p["team"].get("id", "")) if isinstance(p["team"], dict) else str(p["team"])
-            result.append({
-                "text": text,
-                "period": period,
-                "clock": clock,
-                "score_value": sv,
-                "play_type": pt,
-                "team_id": tid
-            })
-        return result
-    except:
-        return []
+    return espn_summary.get_recent_plays("ncaam", game_id, 10)
 
 # === END PART A1 ===
 # ── Kalshi: fetch_kalshi_ml ──
@@ -480,10 +299,7 @@ def fetch_plays(game_id):
 def fetch_kalshi_ml():
     ml = {}
     try:
-        url = "https://api.elections.kalshi.com/trade-api/v2/markets?series_ticker=KXNCAAGAME&limit=200&status=open"
-        resp = requests.get(url, timeout=10)
-        data = resp.json()
-        for m in data.get("markets", []):
+        for m in kalshi_catalog.get_markets("KXNCAAGAME"):
             ticker = m.get("ticker", "")
             yes_price = m.get("yes_bid", 0) or 0
             no_price = 100 - yes_price if yes_price else 0
@@ -504,10 +320,7 @@ def fetch_kalshi_spreads_raw():
     spreads = {}
     spread_list = []
     try:
-        url = "https://api.elections.kalshi.com/trade-api/v2/markets?series_ticker=KXNCAASPREAD&limit=200&status=open"
-        resp = requests.get(url, timeout=10)
-        data = resp.json()
-        for m in data.get("markets", []):
+        for m in kalshi_catalog.get_markets("KXNCAASPREAD"):
             ticker = m.get("ticker", "")
             title = m.get("title", "").lower()
             subtitle = m.get("subtitle", "").lower()
@@ -573,6 +386,17 @@ def find_ml_price_for_team(home_abbr, away_abbr, fav_side, kalshi_ml_dict):
                 return info.get("no_price"), ticker
     return None, None
 
+# ── Kalshi: live prices for in-progress games ──
+def apply_live_ml(kalshi_ml_dict, games_live):
+    """Swap REST prices for websocket top-of-book on the ML markets of in-progress games"""
+    tickers = []
+    for g in games_live:
+        ha, aa = g.get("home_abbr", "").upper(), g.get("away_abbr", "").upper()
+        tickers += [t for t in kalshi_ml_dict if ha and aa and ha in t.upper() and aa in t.upper()]
+    for ticker, yes_price in kalshi_stream.live_price(tickers, KALSHI_API_KEY, KALSHI_PRIVATE_KEY).items():
+        kalshi_ml_dict[ticker] = dict(kalshi_ml_dict[ticker], yes_price=yes_price, no_price=100 - yes_price, live=True)
+    return kalshi_ml_dict
+
 # ── 9-Factor Edge Model ──
 def calc_advanced_edge(game, b2b_teams, summary=None, injuries=None):
     edges = []
@@ -688,7 +512,7 @@ def calc_advanced_edge(game, b2b_teams, summary=None, injuries=None):
     else:
         strength = "⚪ TOSS-UP"
     side = "home" if total_score >= 0 else "away"
-    pick = game.get("home_team") if side == "home" else game.get("away_team")
+    pick = game.get("home_full") if side == "home" else game.get("away_full")
     return {
         "edges": edges,
         "score": round(total_score, 1),
@@ -704,28 +528,14 @@ def infer_possession(plays, home_abbr, away_abbr, home_name, away_name, home_id=
         return None, None
     last_team = None
     last_side = None
+    matcher = team_matcher.game_matcher(str(home_id) if home_id and away_id else "", str(away_id) if home_id and away_id else "", (home_abbr, home_name), (away_abbr, away_name), use_words=False)
     for play in reversed(plays[-12:]):
         text = play.get("text", "").lower()
         pt = play.get("play_type", "").lower()
-        tid = str(play.get("team_id", ""))
-        acting_side = None
-        acting_name = None
-        if tid and home_id and away_id:
-            if tid == home_id:
-                acting_side = "home"
-                acting_name = home_name
-            elif tid == away_id:
-                acting_side = "away"
-                acting_name = away_name
-        if not acting_side:
-            if home_abbr.lower() in text or home_name.lower() in text:
-                acting_side = "home"
-                acting_name = home_name
-            elif away_abbr.lower() in text or away_name.lower() in text:
-                acting_side = "away"
-                acting_name = away_name
+        acting_side = matcher.attribute(str(play.get("team_id", "")), text)
         if not acting_side:
             continue
+        acting_name = home_name if acting_side == "home" else away_name
         other_side = "away" if acting_side == "home" else "home"
         other_name = away_name if acting_side == "home" else home_name
         if "steal" in pt or "steal" in text:
@@ -761,12 +571,12 @@ def check_spread_sniper(game, spread_list, kalshi_ml_dict):
     if diff < threshold:
         return None
     leading_side = "home" if home_score > away_score else "away"
-    leading_team = game.get(f"{leading_side}_team", "")
+    leading_team = game.get(f"{leading_side}_full", "")
     trailing_side = "away" if leading_side == "home" else "home"
-    trailing_team = game.get(f"{trailing_side}_team", "")
+    trailing_team = game.get(f"{trailing_side}_full", "")
     spread_markets = find_spread_markets_for_game(
         game.get("home_abbr", ""), game.get("away_abbr", ""),
-        game.get("home_team", ""), game.get("away_team", ""),
+        game.get("home_full", ""), game.get("away_full", ""),
         spread_list
     )
     best = None
@@ -776,6 +586,8 @@ def check_spread_sniper(game, spread_list, kalshi_ml_dict):
                 best = sm
     if not best:
         return None
+    # Depth only for the bracket that passed the price filters
+    fill = kalshi_depth.estimate_fills([best.get("ticker", "")], "no", SNIPER_CONTRACTS).get(best.get("ticker", ""))
     st.session_state.ncaa_alerted_games.add(game_id)
     period_label = f"H{period}" if period <= 2 else f"OT{period-2}"
     alert = {
@@ -789,6 +601,7 @@ def check_spread_sniper(game, spread_list, kalshi_ml_dict):
         "spread_val": best["spread_val"],
         "no_price": best["no_price"],
         "ticker": best["ticker"],
+        "fill": fill,
         "type": "sniper"
     }
     st.session_state.ncaa_sniper_alerts.insert(0, alert)
@@ -807,7 +620,7 @@ def check_comeback(game, kalshi_ml_dict):
             leading_side = "home" if home_score > away_score else "away"
             st.session_state.ncaa_comeback_tracking[game_id] = {
                 "leading_side": leading_side,
-                "leading_team": game.get(f"{leading_side}_team", ""),
+                "leading_team": game.get(f"{leading_side}_full", ""),
                 "max_deficit": diff,
                 "trailing_side": "away" if leading_side == "home" else "home"
             }
@@ -821,7 +634,7 @@ def check_comeback(game, kalshi_ml_dict):
         if diff <= 2 and tracked["max_deficit"] >= 10:
             st.session_state.ncaa_comeback_alerted.add(game_id)
             trailing_side = tracked["trailing_side"]
-            trailing_team = game.get(f"{trailing_side}_team", "")
+            trailing_team = game.get(f"{trailing_side}_full", "")
             alert = {
                 "game_id": game_id,
                 "time": datetime.now(eastern).strftime("%I:%M %p"),
@@ -994,111 +807,6 @@ def render_college_court(game, last_play):
     svg += '</svg></div>'
     components.html(svg, height=310)
 
-# ── Tiebreaker: fetch_all_plays ──
-@st.cache_data(ttl=30)
-def fetch_all_plays(game_id):
-    try:
-        url = "https://site.api.espn.com/apis/site/v2/sports/basketball/mens-college-basketball/summary?event=" + str(game_id)
-        data = requests.get(url, timeout=10).json()
-        plays_raw = []
-        for drive in data.get("plays", []):
-            if isinstance(drive, dict):
-                plays_raw.append(drive)
-            elif isinstance(drive, list):
-                plays_raw.extend(drive)
-        return plays_raw
-    except:
-        return []
-
-# ── Tiebreaker: calc_tiebreaker_stats ──
-def calc_tiebreaker_stats(plays, home_team, away_team, home_id, away_id):
-    home = {"name": home_team, "turnovers": 0, "steals": 0, "rebounds": 0, "assists": 0, "made_fg": 0, "by_quarter": {}}
-    away = {"name": away_team, "turnovers": 0, "steals": 0, "rebounds": 0, "assists": 0, "made_fg": 0, "by_quarter": {}}
-    home_words = set()
-    away_words = set()
-    for w in home_team.lower().split():
-        if len(w) > 3:
-            home_words.add(w)
-    for w in away_team.lower().split():
-        if len(w) > 3:
-            away_words.add(w)
-    def ensure_q(q_label):
-        if q_label not in home["by_quarter"]:
-            home["by_quarter"][q_label] = {"turnovers": 0, "steals": 0, "rebounds": 0, "assists": 0, "made_fg": 0}
-        if q_label not in away["by_quarter"]:
-            away["by_quarter"][q_label] = {"turnovers": 0, "steals": 0, "rebounds": 0, "assists": 0, "made_fg": 0}
-    for p in plays:
-        text_lower = p.get("text", "").lower()
-        period_raw = p.get("period", {})
-        if isinstance(period_raw, dict):
-            period_num = period_raw.get("number", 1)
-        else:
-            period_num = int(period_raw) if period_raw else 1
-        if period_num == 1:
-            q_label = "H1"
-        elif period_num == 2:
-            q_label = "H2"
-        else:
-            q_label = "OT" + str(period_num - 2)
-        ensure_q(q_label)
-        acting = None
-        tid = ""
-        team_obj = p.get("team", {})
-        if isinstance(team_obj, dict):
-            tid = str(team_obj.get("id", ""))
-        elif team_obj:
-            tid = str(team_obj)
-        if tid and home_id and away_id:
-            if tid == str(home_id):
-                acting = "home"
-            elif tid == str(away_id):
-                acting = "away"
-        if not acting:
-            ha_field = p.get("homeAway", "")
-            if ha_field == "home":
-                acting = "home"
-            elif ha_field == "away":
-                acting = "away"
-        if not acting:
-            for w in home_words:
-                if w in text_lower:
-                    acting = "home"
-                    break
-        if not acting:
-            for w in away_words:
-                if w in text_lower:
-                    acting = "away"
-                    break
-        if not acting:
-            if home_team.lower() in text_lower:
-                acting = "home"
-            elif away_team.lower() in text_lower:
-                acting = "away"
-        if not acting:
-            continue
-        act_dict = home if acting == "home" else away
-        other_dict = away if acting == "home" else home
-        act_q = act_dict["by_quarter"][q_label]
-        other_q = other_dict["by_quarter"][q_label]
-        if "turnover" in text_lower:
-            act_dict["turnovers"] += 1
-            act_q["turnovers"] += 1
-            other_dict["steals"] += 1
-            other_q["steals"] += 1
-        if "steal" in text_lower and "turnover" not in text_lower:
-            other_dict["steals"] += 1
-            other_q["steals"] += 1
-        if "rebound" in text_lower:
-            act_dict["rebounds"] += 1
-            act_q["rebounds"] += 1
-        if "assist" in text_lower:
-            act_dict["assists"] += 1
-            act_q["assists"] += 1
-        if "made" in text_lower:
-            act_dict["made_fg"] += 1
-            act_q["made_fg"] += 1
-    return {"home": home, "away": away}
-
 # ── Tiebreaker: render_tiebreaker_panel ──
 def render_tiebreaker_panel(stats, home_team, away_team, home_abbr, away_abbr):
     h = stats.get("home", {})
@@ -1218,6 +926,8 @@ b2b_teams = fetch_yesterday_teams()
 live_games = [g for g in games if g.get('state') == 'in']
 scheduled_games = [g for g in games if g.get('state') == 'pre']
 final_games = [g for g in games if g.get('state') == 'post']
+summary_prefetch = espn_summary.prefetch_summaries("ncaam", [g.get('game_id', '') for g in games if g.get('state') != 'post'])
+kalshi_ml_data = apply_live_ml(kalshi_ml_data, live_games)
 for g in live_games:
     check_spread_sniper(g, kalshi_spread_list, kalshi_ml_data)
     check_comeback(g, kalshi_ml_data)
@@ -1288,6 +998,7 @@ with tab_edge:
 *Only STRONG and MODERATE edges shown.*
 """)
     st.caption("ESPN BPI + Vegas + Rankings + Situational | Only showing STRONG + MODERATE edges")
+    st.caption(espn_summary.format_prefetch_stats(summary_prefetch))
     edge_results = []
     for g in scheduled_games:
         summary = fetch_game_summary(g.get('game_id', ''))
@@ -1506,7 +1217,13 @@ with tab_spread:
             html += f'<span style="color:#94a3b8;font-size:clamp(10px,2vw,12px)">{alert.get("time","")}</span></div>'
             html += f'<div style="color:#fff;font-size:clamp(14px,3.5vw,18px);font-weight:700;margin:6px 0">{alert.get("leading_team","")} leading by {alert.get("diff",0)}</div>'
             html += f'<div style="color:#94a3b8;font-size:clamp(11px,2.5vw,13px)">Score: {alert.get("score","")} | {alert.get("period","")} | Spread: {alert.get("spread_val",0)}+ pts</div>'
-            html += f'<div style="color:#22c55e;font-size:clamp(13px,3vw,16px);font-weight:700;margin-top:6px">BUY NO @ {np_val}¢ on {alert.get("trailing_team","")} spread</div></div>'
+            html += f'<div style="color:#22c55e;font-size:clamp(13px,3vw,16px);font-weight:700;margin-top:6px">BUY NO @ {np_val}¢ on {alert.get("trailing_team","")} spread</div>'
+            fill = alert.get("fill")
+            if fill and fill.get("avg_price") is not None:
+                html += f'<div style="color:#94a3b8;font-size:clamp(11px,2.5vw,13px)">Fill {fill["filled"]}/{fill["requested"]} @ {fill["avg_price"]}¢ avg across {fill["levels"]} level(s) | {fill["depth"]} NO available</div>'
+            elif fill:
+                html += '<div style="color:#f97316;font-size:clamp(11px,2.5vw,13px)">No NO depth on the book</div>'
+            html += '</div>'
             st.markdown(html, unsafe_allow_html=True)
             st.link_button("🔗 Trade Spreads on Kalshi", KALSHI_SPREAD_LINK, use_container_width=True); st.divider()
     else: st.info("No spread sniper alerts yet. Monitoring live games for big leads...")
@@ -1546,7 +1263,7 @@ with tab_live:
             lc1, lc2 = st.columns([3, 2])
             with lc1:
                 render_college_court(g, last_play)
-                poss_team, poss_side = infer_possession(plays, g.get('home_abbr',''), g.get('away_abbr',''), g.get('home_team',''), g.get('away_team',''), g.get('home_id',''), g.get('away_id',''))
+                poss_team, poss_side = infer_possession(plays, g.get('home_abbr',''), g.get('away_abbr',''), g.get('home_full',''), g.get('away_full',''), g.get('home_id',''), g.get('away_id',''))
                 if poss_team:
                     poss_color = get_team_color(g, poss_side) if poss_side else "#94a3b8"
                     st.markdown(f"<div style='text-align:center;color:{poss_color};font-weight:700;font-size:clamp(12px,3vw,16px)'>🏀 {poss_team} ball</div>", unsafe_allow_html=True)
@@ -1606,9 +1323,8 @@ with tab_live:
             # Tiebreaker Panel — full width (close games ≤5 pts)
             lead_tb = abs(g.get('home_score', 0) - g.get('away_score', 0))
             if lead_tb <= 5 and g.get('minutes_elapsed', 0) >= 4:
-                all_plays = fetch_all_plays(g.get('game_id', ''))
-                tb_stats = calc_tiebreaker_stats(all_plays, g.get('home_team', ''), g.get('away_team', ''), g.get('home_id', ''), g.get('away_id', ''))
-                tb_html = render_tiebreaker_panel(tb_stats, g.get('home_team', ''), g.get('away_team', ''), g.get('home_abbr', ''), g.get('away_abbr', ''))
+                tb_stats = play_store.tiebreaker_stats("ncaam", g.get('game_id', ''), g.get('home_id', ''), g.get('away_id', ''), [g.get('home_full', '')], [g.get('away_full', '')])
+                tb_html = render_tiebreaker_panel(tb_stats, g.get('home_full', ''), g.get('away_full', ''), g.get('home_abbr', ''), g.get('away_abbr', ''))
                 st.markdown(tb_html, unsafe_allow_html=True)
 
             st.divider()
@@ -1794,7 +1510,7 @@ Close games (1-6 point leads) = chaos. Skip them. A 7+ lead with under 5 minutes
             with st.expander(exp_label, expanded=False):
                 render_scoreboard(g)
                 plays = fetch_plays(g.get('game_id', ''))
-                poss_name, poss_side = infer_possession(plays, g.get('home_abbr',''), g.get('away_abbr',''), g.get('home_team',''), g.get('away_team',''), g.get('home_id',''), g.get('away_id',''))
+                poss_name, poss_side = infer_possession(plays, g.get('home_abbr',''), g.get('away_abbr',''), g.get('home_full',''), g.get('away_full',''), g.get('home_id',''), g.get('away_id',''))
                 shark_lc, shark_rc = st.columns(2)
                 with shark_lc:
                     render_college_court(g, plays[-1] if plays else None)
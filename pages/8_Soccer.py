@@ -1,8 +1,8 @@
 import streamlit as st
 from streamlit_autorefresh import st_autorefresh
-import requests
 from datetime import datetime, timedelta
 import pytz
+import scoreboard_engine
 
 st.set_page_config(page_title="Soccer Edge Finder", page_icon="⚽", layout="wide")
 
@@ -36,75 +36,12 @@ LEAGUES = {
 # ============================================================
 # FETCH FUNCTIONS
 # ============================================================
-@st.cache_data(ttl=30)
-def fetch_soccer_games(league_code):
-    """Fetch games from ESPN API"""
+def fetch_all_soccer_games():
+    """Fetch every competition's ESPN board concurrently"""
     try:
-        url = f"https://site.api.espn.com/apis/site/v2/sports/soccer/{league_code}/scoreboard"
-        resp = requests.get(url, timeout=10)
-        if resp.status_code == 200:
-            return resp.json()
-        return None
+        return scoreboard_engine.fetch_all_games(leagues=[], soccer=True)["games"]
     except:
-        return None
-
-def parse_games(data, league_key):
-    """Parse ESPN data into game objects"""
-    games = []
-    if not data or 'events' not in data:
-        return games
-    
-    for event in data.get('events', []):
-        try:
-            comp = event.get('competitions', [{}])[0]
-            competitors = comp.get('competitors', [])
-            
-            if len(competitors) < 2:
-                continue
-            
-            home = None
-            away = None
-            for c in competitors:
-                if c.get('homeAway') == 'home':
-                    home = c
-                else:
-                    away = c
-            
-            if not home or not away:
-                home, away = competitors[0], competitors[1]
-            
-            home_team = home.get('team', {}).get('displayName', 'Unknown')
-            away_team = away.get('team', {}).get('displayName', 'Unknown')
-            home_score = int(home.get('score', 0) or 0)
-            away_score = int(away.get('score', 0) or 0)
-            
-            status = event.get('status', {}).get('type', {}).get('name', 'STATUS_SCHEDULED')
-            clock = event.get('status', {}).get('displayClock', '')
-            period = event.get('status', {}).get('period', 0)
-            
-            game_date_str = event.get('date', '')
-            game_time = None
-            if game_date_str:
-                try:
-                    game_time = datetime.fromisoformat(game_date_str.replace('Z', '+00:00')).astimezone(eastern)
-                except:
-                    pass
-            
-            games.append({
-                'away': away_team,
-                'home': home_team,
-                'away_score': away_score,
-                'home_score': home_score,
-                'status': status,
-                'clock': clock,
-                'period': period,
-                'game_time': game_time,
-                'league': league_key
-            })
-        except:
-            continue
-    
-    return games
+        return {}
 
 # ============================================================
 # KALSHI LINKS
@@ -137,10 +74,13 @@ st.divider()
 # ============================================================
 # LEAGUE SELECTOR
 # ============================================================
+all_games = fetch_all_soccer_games()
+live_counts = {k: sum(1 for g in all_games.get(v["code"], []) if g.state == "in") for k, v in LEAGUES.items()}
+
 selected_league = st.selectbox(
     "Select League",
     options=list(LEAGUES.keys()),
-    format_func=lambda x: LEAGUES[x]["name"],
+    format_func=lambda x: LEAGUES[x]["name"] + (f" • {live_counts[x]} live" if live_counts.get(x) else ""),
     key="league_selector"
 )
 
@@ -152,8 +92,7 @@ st.markdown(f"### {league_info['name']}")
 # ============================================================
 # FETCH & DISPLAY GAMES
 # ============================================================
-data = fetch_soccer_games(league_code)
-games = parse_games(data, selected_league)
+games = all_games.get(league_code, [])
 
 if not games:
     st.info(f"No {league_info['name']} games scheduled right now.")
@@ -176,7 +115,7 @@ else:
             st.markdown(f"""
             <div style="background:#1e1e2e;padding:14px;border-radius:8px;margin-bottom:8px;border-left:3px solid #22c55e">
                 <div style="display:flex;justify-content:space-between;margin-bottom:6px">
-                    <span style="color:#fff;font-weight:600">{g['away']} @ {g['home']}</span>
+                    <span style="color:#fff;font-weight:600">{g.away_full} @ {g.home_full}</span>
                     <span style="color:#22c55e">⚽ {g['clock']} • {g['period']}'</span>
                 </div>
                 <div style="color:#fff;font-size:1.2em;font-weight:700">{g['away_score']} - {g['home_score']}</div>
@@ -191,10 +130,10 @@ else:
     if scheduled_games:
         st.subheader("📅 UPCOMING MATCHES")
         for g in scheduled_games:
-            time_str = g['game_time'].strftime('%I:%M %p ET') if g['game_time'] else 'TBD'
+            time_str = g.start.strftime('%I:%M %p ET') if g.start else 'TBD'
             st.markdown(f"""
             <div style="background:#1e1e2e;padding:12px;border-radius:8px;margin-bottom:6px">
-                <div style="color:#fff;font-weight:600">{g['away']} @ {g['home']}</div>
+                <div style="color:#fff;font-weight:600">{g.away_full} @ {g.home_full}</div>
                 <div style="color:#888;font-size:0.9em">{time_str}</div>
             </div>
             """, unsafe_allow_html=True)
@@ -211,7 +150,7 @@ else:
             with cols[i % 3]:
                 st.markdown(f"""
                 <div style="background:#1a1a2e;padding:10px;border-radius:6px;margin-bottom:6px">
-                    <div style="color:#aaa;font-size:0.85em">{g['away']} @ {g['home']}</div>
+                    <div style="color:#aaa;font-size:0.85em">{g.away_full} @ {g.home_full}</div>
                     <div style="color:#fff;font-weight:600">{g['away_score']} - {g['home_score']}</div>
                 </div>
                 """, unsafe_allow_html=True)
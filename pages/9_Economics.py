@@ -37,8 +37,10 @@ from fred_data import (
     get_fed_rate, get_unemployment, get_gdp_growth, 
     get_cpi_yoy, get_treasury_spread, get_indicator_color,
     generate_edge_signals, get_jobless_claims_trend, get_cpi_momentum,
-    THRESHOLDS
+    polling_releases, THRESHOLDS, POLL_INTERVAL
 )
+from econ_calendar import FOMC_MEETINGS_2026, CPI_RELEASES_2026
+from streamlit_autorefresh import st_autorefresh
 
 # ============================================================
 # STYLES
@@ -58,32 +60,6 @@ st.markdown('<style>@media (max-width: 768px) { .stColumns > div { flex: 1 1 100
 # ============================================================
 eastern = pytz.timezone('US/Eastern')
 
-FOMC_MEETINGS_2026 = [
-    {"dates": "January 27-28", "decision_date": datetime(2026, 1, 28, 14, 0), "has_projections": False},
-    {"dates": "March 17-18", "decision_date": datetime(2026, 3, 18, 14, 0), "has_projections": True},
-    {"dates": "May 5-6", "decision_date": datetime(2026, 5, 6, 14, 0), "has_projections": False},
-    {"dates": "June 16-17", "decision_date": datetime(2026, 6, 17, 14, 0), "has_projections": True},
-    {"dates": "July 28-29", "decision_date": datetime(2026, 7, 29, 14, 0), "has_projections": False},
-    {"dates": "September 15-16", "decision_date": datetime(2026, 9, 16, 14, 0), "has_projections": True},
-    {"dates": "October 27-28", "decision_date": datetime(2026, 10, 28, 14, 0), "has_projections": False},
-    {"dates": "December 8-9", "decision_date": datetime(2026, 12, 9, 14, 0), "has_projections": True},
-]
-
-CPI_RELEASES_2026 = [
-    {"month": "January", "release_date": datetime(2026, 1, 14, 8, 30), "for_month": "December 2025"},
-    {"month": "February", "release_date": datetime(2026, 2, 12, 8, 30), "for_month": "January 2026"},
-    {"month": "March", "release_date": datetime(2026, 3, 11, 8, 30), "for_month": "February 2026"},
-    {"month": "April", "release_date": datetime(2026, 4, 10, 8, 30), "for_month": "March 2026"},
-    {"month": "May", "release_date": datetime(2026, 5, 13, 8, 30), "for_month": "April 2026"},
-    {"month": "June", "release_date": datetime(2026, 6, 10, 8, 30), "for_month": "May 2026"},
-    {"month": "July", "release_date": datetime(2026, 7, 14, 8, 30), "for_month": "June 2026"},
-    {"month": "August", "release_date": datetime(2026, 8, 12, 8, 30), "for_month": "July 2026"},
-    {"month": "September", "release_date": datetime(2026, 9, 11, 8, 30), "for_month": "August 2026"},
-    {"month": "October", "release_date": datetime(2026, 10, 13, 8, 30), "for_month": "September 2026"},
-    {"month": "November", "release_date": datetime(2026, 11, 12, 8, 30), "for_month": "October 2026"},
-    {"month": "December", "release_date": datetime(2026, 12, 10, 8, 30), "for_month": "November 2026"},
-]
-
 KALSHI_MARKETS = {
     "fed_rate": "https://kalshi.com/markets/kxfed/fed-funds-rate",
     "fed_decision": "https://kalshi.com/markets/kxfeddecision/fed-meeting",
@@ -131,6 +107,11 @@ def get_next_cpi():
 # ============================================================
 # FETCH LIVE DATA
 # ============================================================
+# Right after a scheduled CPI/claims/jobs print, rerun on the fast poll until FRED has it
+watching = polling_releases()
+if watching:
+    st_autorefresh(interval=POLL_INTERVAL * 1000, key="econ_release_poll")
+
 fed_rate = get_fed_rate()
 unemployment = get_unemployment()
 gdp = get_gdp_growth()
@@ -145,6 +126,8 @@ st.markdown("*Data-driven signals for Kalshi economics markets*")
 
 now = datetime.now(eastern)
 st.markdown(f"**Last Updated:** {now.strftime('%B %d, %Y at %I:%M %p ET')} <span class='live-badge'>LIVE</span>", unsafe_allow_html=True)
+if watching:
+    st.caption(f"⏱️ Watching for the {', '.join(watching)} release — refreshing every {POLL_INTERVAL}s")
 
 # ============================================================
 # 🔥 EDGE SIGNALS SECTION (NEW)
@@ -0,0 +1,156 @@
+# FILE: play_store.py
+# Incremental play-by-play aggregates for the basketball pages
+# Remembers the last processed play per game and folds only new plays into
+# running tiebreaker totals, so a refresh costs O(new plays) instead of O(all plays)
+
+import copy
+import threading
+import time
+import espn_summary
+import team_matcher
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+# Regulation periods before overtime; college men play halves
+REGULATION_PERIODS = {
+    "nba": 4,
+    "wnba": 4,
+    "ncaam": 2,
+    "ncaaw": 4,
+}
+
+STAT_KEYS = ["turnovers", "steals", "rebounds", "assists", "made_fg"]
+
+# Counting rules per league. The NBA-style default credits the other side a steal on every
+# turnover and gives text naming both teams to the first match; NCAAW keeps its page's own
+# rules: a steal only when the play says so, two-team text skipped, periods under "by_half".
+DEFAULT_RULES = {"turnover_steal": True, "strict_text": False, "period_key": "by_quarter"}
+LEAGUE_RULES = {
+    "ncaaw": {"turnover_steal": False, "strict_text": True, "period_key": "by_half"},
+}
+
+# Game state not asked for in this long is dropped (finished or off the slate); it rebuilds from the summary if needed
+IDLE_EVICT = 3 * 3600
+PRUNE_INTERVAL = 300
+
+_games = {}
+_games_lock = threading.Lock()
+_last_prune = [0.0]
+
+# ============================================================
+# AGGREGATES
+# ============================================================
+def period_label(league, period_num):
+    regulation = REGULATION_PERIODS.get(league, 4)
+    if period_num > regulation:
+        return "OT" + str(period_num - regulation)
+    return ("H" if regulation == 2 else "Q") + str(period_num)
+
+def _rules(league):
+    return LEAGUE_RULES.get(league, DEFAULT_RULES)
+
+def _empty_side(name, period_key):
+    side = {"name": name, period_key: {}}
+    for k in STAT_KEYS:
+        side[k] = 0
+    return side
+
+def _bump(side, q_label, key, period_key):
+    side[key] += 1
+    side[period_key][q_label][key] += 1
+
+def _attribute(p, text_lower, matcher, strict_text=False):
+    team_obj = p.get("team", {})
+    tid = str(team_obj.get("id", "")) if isinstance(team_obj, dict) else str(team_obj or "")
+    side = matcher.by_team_id(tid)
+    if side: return side
+    ha_field = p.get("homeAway", "")
+    if ha_field in ("home", "away"): return ha_field
+    return matcher.match_unique(text_lower) if strict_text else matcher.match_text(text_lower)
+
+def _apply(state, league, p):
+    text_lower = (p.get("text", "") or "").lower()
+    period_raw = p.get("period", {})
+    period_num = period_raw.get("number", 1) if isinstance(period_raw, dict) else (int(period_raw) if period_raw else 1)
+    q_label = period_label(league, max(1, period_num))
+    rules = state["rules"]
+    pk = rules["period_key"]
+    side = _attribute(p, text_lower, state["matcher"], rules["strict_text"])
+    if not side:
+        return
+    stats = state["stats"]
+    acting, other = stats[side], stats["away" if side == "home" else "home"]
+    for s in (acting, other):
+        if q_label not in s[pk]:
+            s[pk][q_label] = {k: 0 for k in STAT_KEYS}
+    if rules["turnover_steal"]:
+        if "turnover" in text_lower:
+            _bump(acting, q_label, "turnovers", pk)
+            _bump(other, q_label, "steals", pk)
+        elif "steal" in text_lower:
+            _bump(other, q_label, "steals", pk)
+    else:
+        if "turnover" in text_lower: _bump(acting, q_label, "turnovers", pk)
+        if "steal" in text_lower: _bump(other, q_label, "steals", pk)
+    if "rebound" in text_lower: _bump(acting, q_label, "rebounds", pk)
+    if "assist" in text_lower: _bump(acting, q_label, "assists", pk)
+    if "made" in text_lower: _bump(acting, q_label, "made_fg", pk)
+
+def _reset(state):
+    home_names, away_names = state["names"]
+    state["cursor"] = None
+    state["processed"] = 0
+    pk = state["rules"]["period_key"]
+    state["stats"] = {"home": _empty_side(home_names[0] if home_names else "", pk), "away": _empty_side(away_names[0] if away_names else "", pk)}
+
+def _new_state(league, home_id, away_id, home_names, away_names):
+    state = {
+        "lock": threading.Lock(),
+        "rules": _rules(league),
+        "used_at": time.time(),
+        "names": (home_names, away_names),
+        "matcher": team_matcher.game_matcher(str(home_id or ""), str(away_id or ""), tuple(home_names), tuple(away_names)),
+    }
+    _reset(state)
+    return state
+
+def tiebreaker_stats(league, event_id, home_id="", away_id="", home_names=(), away_names=()):
+    """Running turnovers/steals/rebounds/assists per side and period.
+
+    home_names/away_names: the page's display name first, then any codes or
+    full names used to attribute plays that carry no team id.
+    """
+    key = (league, str(event_id))
+    home_names, away_names = list(home_names), list(away_names)
+    now = time.time()
+    with _games_lock:
+        state = _games.get(key)
+        if state is None or state["names"] != (home_names, away_names):
+            state = _new_state(league, home_id, away_id, home_names, away_names)
+            _games[key] = state
+            if now - _last_prune[0] >= PRUNE_INTERVAL:
+                _last_prune[0] = now
+                for k, st in list(_games.items()):
+                    if now - st["used_at"] > IDLE_EVICT:
+                        del _games[k]
+        state["used_at"] = now
+    with state["lock"]:
+        if state["processed"] and not state["cursor"]:
+            # Last batch ended on a play without an id, so there is no cursor to resume from
+            _reset(state)
+        new_plays, found = espn_summary.get_plays_after(league, event_id, state["cursor"])
+        if not found:
+            # ESPN rewrote the play list (corrections); rebuild from tip-off
+            _reset(state)
+        for p in new_plays:
+            if isinstance(p, dict):
+                _apply(state, league, p)
+        if new_plays:
+            state["cursor"] = espn_summary.play_key(new_plays[-1])
+            state["processed"] += len(new_plays)
+        return copy.deepcopy(state["stats"])
+
+def clear_game(league, event_id):
+    with _games_lock:
+        _games.pop((league, str(event_id)), None)
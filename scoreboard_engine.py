@@ -0,0 +1,94 @@
+# FILE: scoreboard_engine.py
+# Concurrent multi-league scoreboard engine for BigSnapshot
+# Fetches every league board and all soccer competitions at once with asyncio,
+# so an overview costs roughly the slowest single request instead of the sum
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import feeds
+import games as games_store
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+SPORTS_LEAGUES = ["nfl", "nba", "nhl", "ncaam", "ncaaw", "wnba"]
+
+LEAGUE_NAMES = {
+    "nfl": "NFL",
+    "nba": "NBA",
+    "nhl": "NHL",
+    "ncaam": "NCAA",
+    "ncaaw": "NCAAW",
+    "wnba": "WNBA",
+    "eng.1": "Premier League",
+    "esp.1": "La Liga",
+    "ger.1": "Bundesliga",
+    "ita.1": "Serie A",
+    "fra.1": "Ligue 1",
+    "usa.1": "MLS",
+    "uefa.champions": "Champions League",
+}
+
+# ============================================================
+# FETCH
+# ============================================================
+def board_urls(leagues=None, soccer=True, dates=None):
+    leagues = SPORTS_LEAGUES if leagues is None else leagues
+    urls = {lg: feeds.scoreboard_url(lg, dates or feeds.date_str()) for lg in leagues}
+    if soccer:
+        for code in feeds.SOCCER_CODES:
+            urls[code] = feeds.soccer_scoreboard_url(code)
+    return urls
+
+async def _fetch_board(league, url, max_age, pool):
+    start = time.time()
+    try:
+        # The game store (snapshot_store/http_client) is blocking; each board runs on its own worker thread
+        games = await asyncio.get_running_loop().run_in_executor(pool, lambda: games_store.get_games(league, max_age=max_age, url=url))
+        return league, games, time.time() - start, ""
+    except Exception as e:
+        return league, [], time.time() - start, str(e)
+
+async def fetch_all_games_async(leagues=None, soccer=True, dates=None, max_age=feeds.SCOREBOARD_MAX_AGE):
+    urls = board_urls(leagues, soccer, dates)
+    start = time.time()
+    # One thread per board (the default executor is capped by CPU count), so every board is in flight at once
+    with ThreadPoolExecutor(max_workers=max(1, len(urls))) as pool:
+        results = await asyncio.gather(*[_fetch_board(lg, url, max_age, pool) for lg, url in urls.items()])
+    games, errors, serial = {}, {}, 0.0
+    for league, league_games, latency, err in results:
+        serial += latency
+        if err:
+            errors[league] = err
+        else:
+            games[league] = league_games
+    return {"games": games, "errors": errors, "wall": round(time.time() - start, 2), "serial": round(serial, 2)}
+
+def _run(coro):
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    # Already inside an event loop: run ours on a helper thread
+    out = {}
+    t = threading.Thread(target=lambda: out.setdefault("r", asyncio.run(coro)))
+    t.start()
+    t.join()
+    return out["r"]
+
+def fetch_all_games(leagues=None, soccer=True, dates=None, max_age=feeds.SCOREBOARD_MAX_AGE):
+    return _run(fetch_all_games_async(leagues, soccer, dates, max_age))
+
+def summarize(games_by_league):
+    rows = []
+    for league, games in games_by_league.items():
+        rows.append({
+            "league": league,
+            "name": LEAGUE_NAMES.get(league, league),
+            "live": sum(1 for g in games if g.state == "in"),
+            "upcoming": sum(1 for g in games if g.state == "pre"),
+            "final": sum(1 for g in games if g.state == "post"),
+        })
+    return rows
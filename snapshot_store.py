@@ -0,0 +1,65 @@
+# FILE: snapshot_store.py
+# Local on-disk snapshot store written by collector.py and read by the pages
+# Pages only go upstream when no collector has refreshed a snapshot recently
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+import http_client
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+SNAPSHOT_DIR = os.environ.get("BIGSNAPSHOT_SNAPSHOT_DIR", "snapshots")
+
+# ============================================================
+# STORE
+# ============================================================
+def snapshot_path(url):
+    return os.path.join(SNAPSHOT_DIR, hashlib.sha1(url.encode("utf-8")).hexdigest()[:20] + ".json")
+
+def write_snapshot(url, data):
+    tmp = None
+    try:
+        os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+        path = snapshot_path(url)
+        # Unique per writer: sessions and prefetch threads may write the same key at once
+        fd, tmp = tempfile.mkstemp(dir=SNAPSHOT_DIR, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump({"url": url, "saved_at": time.time(), "data": data}, f)
+        # Atomic swap so a page never reads a half-written file
+        os.replace(tmp, path)
+    except:
+        if tmp and os.path.exists(tmp):
+            try:
+                os.remove(tmp)
+            except:
+                pass
+
+def read_snapshot(url):
+    try:
+        with open(snapshot_path(url), "r") as f:
+            snap = json.load(f)
+        return snap["data"], snap["saved_at"]
+    except:
+        return None, 0
+
+def snapshot_age(url):
+    _, saved_at = read_snapshot(url)
+    return time.time() - saved_at if saved_at else None
+
+def fetch_and_store(url, timeout=10):
+    resp = http_client.get(url, timeout=timeout)
+    resp.raise_for_status()
+    data = resp.json()
+    write_snapshot(url, data)
+    return data
+
+def get_json(url, max_age=30, timeout=10):
+    data, saved_at = read_snapshot(url)
+    if data is not None and time.time() - saved_at < max_age:
+        return data
+    # No fresh snapshot (collector not running or behind): fetch directly and share the result
+    return fetch_and_store(url, timeout=timeout)
@@ -0,0 +1,71 @@
+# FILE: team_matcher.py
+# Precompiled play -> team attribution for the basketball pages
+# One id -> side dict plus one compiled regex over every team name, code and
+# keyword, so attributing a play is a dict lookup or a single regex pass
+
+import re
+from functools import lru_cache
+
+# ============================================================
+# MATCHER
+# ============================================================
+class TeamMatcher:
+    """Attributes plays to one of several labelled teams.
+
+    sides: sequence of (label, team_id, names). Names are tried before the
+    long (>3 char) words inside them, and earlier sides win ties, which keeps
+    the precedence of the old per-play substring scans.
+    """
+
+    def __init__(self, sides, use_words=True):
+        self.by_id = {}
+        self._terms = {}
+        self._side_regex = {}
+        for order, (label, team_id, names) in enumerate(sides):
+            if team_id:
+                self.by_id[str(team_id)] = label
+            full = [n.lower() for n in names if n]
+            tiers = [(0, full)]
+            if use_words:
+                tiers.append((1, [w for n in full for w in n.split() if len(w) > 3]))
+            side_terms = sorted({t for _, terms in tiers for t in terms}, key=len, reverse=True)
+            if side_terms:
+                self._side_regex[label] = re.compile("|".join(re.escape(t) for t in side_terms))
+            for tier, terms in tiers:
+                for t in terms:
+                    rank = (tier, order, label)
+                    if t not in self._terms or rank < self._terms[t]:
+                        self._terms[t] = rank
+        # Longest first so "boston celtics" wins over "boston" at the same position
+        pattern = "|".join(re.escape(t) for t in sorted(self._terms, key=len, reverse=True))
+        self._regex = re.compile(pattern) if pattern else None
+
+    def by_team_id(self, team_id):
+        return self.by_id.get(str(team_id)) if team_id else None
+
+    def match_text(self, text_lower):
+        if not self._regex or not text_lower:
+            return None
+        best = None
+        for m in self._regex.finditer(text_lower):
+            rank = self._terms[m.group(0)]
+            if best is None or rank < best:
+                best = rank
+                if rank[:2] == (0, 0):
+                    break
+        return best[2] if best else None
+
+    def match_unique(self, text_lower):
+        """Label only when exactly one side's names appear in the text (None if both or neither)"""
+        if not text_lower:
+            return None
+        hits = [label for label, rx in self._side_regex.items() if rx.search(text_lower)]
+        return hits[0] if len(hits) == 1 else None
+
+    def attribute(self, team_id, text_lower):
+        return self.by_team_id(team_id) or self.match_text(text_lower)
+
+@lru_cache(maxsize=512)
+def game_matcher(home_id, away_id, home_names, away_names, use_words=True):
+    """Cached home/away matcher for one game; names must be tuples"""
+    return TeamMatcher([("home", home_id, home_names), ("away", away_id, away_names)], use_words)